@@ -5,18 +5,19 @@ from datetime import datetime
 
 # Import functions from the modified fetch and process modules
 from utils.fetch_github_data_for_static import (
-    fetch_contribution_data,
-    fetch_user_data,
-    fetch_repo_data,
+    fetch_dashboard_data,
     fetch_data_for_duration,
+    iter_repositories,
+    sync_contribution_history,
 )
 from utils.process_github_data import (
+    aggregate_repositories,
     process_contribution_data,
-    process_language_data,
     process_user_data,
     analyze_contributions,
 )
 from utils.util import format_date_ddmmyyyy # This utility is needed for analyze_contributions
+from utils.http_client import client
 
 def generate_data(username: str, token: str):
     """
@@ -24,28 +25,35 @@ def generate_data(username: str, token: str):
     """
     all_data = {}
 
-    # Fetch and process user data
-    user_data = fetch_user_data(username, token)
+    # Fetch profile, contributions and repositories in one request
+    cont_data, user_data, repo_data = fetch_dashboard_data(username, token)
+
+    # Process user data
     if "errors" in user_data:
         print(f"Error fetching user data: {user_data['errors']}")
         return
     processed_user_data = process_user_data(user_data)
     all_data["user_stats"] = processed_user_data
 
-    # Fetch and process contribution data
-    cont_data = fetch_contribution_data(username, token)
+    # Process contribution data over the full history since the account was created
     if "errors" in cont_data:
         print(f"Error fetching contribution data: {cont_data['errors']}")
         return
-    processed_cont_data = process_contribution_data(cont_data)
+    history_data = sync_contribution_history(username, token, processed_user_data.get("created_at"))
+    if "errors" in history_data:
+        print(f"Error fetching contribution history: {history_data['errors']}")
+        return
+    processed_cont_data = process_contribution_data(history_data)
+    # The static site reads `days` as a list of day dicts
+    processed_cont_data["days"] = processed_cont_data["days"].to_days()
     all_data["contribution_stats"] = processed_cont_data
 
-    # Fetch and process repo data
-    repo_data = fetch_repo_data(username, token)
+    # Process repo data
     if "errors" in repo_data:
         print(f"Error fetching repository data: {repo_data['errors']}")
         return
-    processed_language_data = process_language_data(repo_data)
+    repo_pages = iter_repositories(username, token, first_page=repo_data["data"]["user"]["repositories"])
+    processed_language_data = aggregate_repositories(repo_pages)["languages"]
     all_data["language_data"] = processed_language_data
     
     # --- Yearly and Monthly Growth (Similar to app.py logic) ---
@@ -116,4 +124,5 @@ if __name__ == "__main__":
     parser.add_argument("--token", required=True, help="GitHub Personal Access Token (PAT)")
     
     args = parser.parse_args()
+    client.max_stale = 0  # Static data is written once, so never serve stale cache entries
     generate_data(args.username, args.token)
\ No newline at end of file
@@ -1,27 +1,48 @@
 import streamlit as st
 from streamlit import session_state as sst
 from datetime import datetime
+from functools import partial
 from utils.fetch_github_data import fetch_data_for_duration, fetch_user_data
-from utils.process_github_data import analyze_contributions, process_user_data
+from utils.contribution_series import ContributionSeries
+from utils.contribution_stats import find_milestones
+from utils.dates import parse_date
+from utils.process_github_data import process_user_data, range_stats, trim_contribution_data
+from utils.session_store import cached, contribution_history
 from utils.util import predict_days_to_milestone, get_milestone_dates, format_date_ddmmyyyy
 from utils.streamlit_ui import base_ui
 
+def load_user_stats(username: str, token: str) -> dict:
+    """Fetches and processes the user's profile, or returns the error response."""
+    user_data = fetch_user_data(username, token)
+    if "errors" in user_data:
+        return user_data
+    return process_user_data(user_data)
+
 def main():
     base_ui()
 
     if sst.username and sst.token and sst.button_pressed:                
-        # Fetch data
-        user_data = fetch_user_data(sst.username, sst.token)
-        user_stats = process_user_data(user_data)
-        created_at = datetime.strptime(user_stats.get("created_at"), "%Y-%m-%dT%H:%M:%SZ")
-        created_at = created_at.strftime("%Y-%m-%d")
-
         today = datetime.now().strftime("%Y-%m-%d")
         current_year = datetime.now().year
         current_jan1st = datetime(current_year, 1, 1).strftime("%Y-%m-%d")
         last_jan1st = datetime(current_year-1, 1, 1).strftime("%Y-%m-%d")
         last_dec31st = datetime(current_year-1, 12, 31).strftime("%Y-%m-%d")
 
+        # Profile and history come from the session store when the Overview page already loaded them
+        user_stats = cached("user_stats", load_user_stats, sst.username, sst.token)
+        if "errors" in user_stats:
+            st.error("Error fetching data. Check your username/token.")
+            st.stop()
+
+        created_at = parse_date(user_stats.get("created_at"))
+        created_at = created_at.isoformat()
+
+        # Yearly stats are read from prefix sums over the stored history; windows it does not cover are fetched
+        contribution_data = contribution_history(user_stats.get("created_at"))
+        history = contribution_data["stats"].get("days", ContributionSeries())
+        contribution_index = contribution_data["index"]
+        fetch_window = partial(fetch_data_for_duration, sst.username, sst.token)
+
         # ------------- Last Year Contributions
         last_year_data_present = True
         from_date= last_jan1st# Date comes before Jan 1st. We use Jan 1st as starting date
@@ -36,16 +57,8 @@ def main():
         
             
         # If last year data is present
-        if last_year_data_present:
-            year_data = fetch_data_for_duration(
-                sst.username, 
-                sst.token,
-                from_date= from_date,
-                to_date= to_date
-            )
-            # Analyze only when data present
-            whole_year_stats = analyze_contributions(year_data)
-
+        whole_year_stats = range_stats(contribution_index, from_date, to_date, fetch_window) if last_year_data_present else {}
+        if last_year_data_present and "errors" not in whole_year_stats:
             # --- Get required stats ---
             contribution_rate_ly = whole_year_stats.get('contribution_rate', 0)
             # active_days_ly = whole_year_stats.get('active_days', 0)
@@ -55,18 +68,15 @@ def main():
 
         # -------------- Current Year Data
         from_date= created_at
-        # Fetching current year data
+        # Trimming current year data to the join date
         if current_jan1st >= created_at: # If joined before Jan 1st
             from_date= current_jan1st
-        current_year_data = fetch_data_for_duration(
-            sst.username, 
-            sst.token,
-            from_date= from_date,
-            to_date= today
-            )
-        
+
         # Process current year data
-        current_year_stats = analyze_contributions(current_year_data)
+        current_year_stats = range_stats(contribution_index, from_date, today, fetch_window)
+        if "errors" in current_year_stats:
+            st.error("Error fetching data. Check your username/token.")
+            st.stop()
         
         # --- Current year stats ---
         total_contributions = current_year_stats.get('total_contributions', 0)
@@ -138,7 +148,11 @@ def main():
                     for milestone in milestones
                 }
 
-                contributions = current_year_data["data"]["user"]["contributionsCollection"]["contributionCalendar"]["weeks"]
+                if contribution_index.covers(from_date, today):
+                    contributions = history.between(from_date, today)
+                else:
+                    window_data = fetch_window(from_date, today)    # Served from the response cache after range_stats
+                    contributions = ContributionSeries.from_response(trim_contribution_data(window_data, from_date)) if "errors" not in window_data else ContributionSeries()
 
                 milestone_dates = get_milestone_dates(milestones, contributions, total_contributions, contribution_rate)
 
@@ -185,6 +199,18 @@ def main():
             else:
                 st.info("Create GitHub Access Token to view these stats")
 
+        # Every 100 commits over the whole history
+        with st.container(border=True):
+            st.markdown("#### :material/flag: Milestone Timeline")
+            reached = find_milestones(history, range(100, contribution_index.total() + 1, 100))
+            if reached:
+                st.line_chart(
+                    {"Date": list(reached.values()), "Commits": list(reached.keys())},
+                    x="Date", y="Commits", x_label="Date reached", y_label="Commits", color="#26a641"
+                )
+            else:
+                st.info("No milestones reached yet.")
+
 
 
     else:
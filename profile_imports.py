@@ -0,0 +1,110 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+# Libraries the pages should only load once a section draws with them
+HEAVY_MODULES = ("pandas", "plotly", "matplotlib")
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def child_env() -> dict:
+    """
+    Environment for the profiled interpreter. The pages read `st.secrets["token"]` at import,
+    so when no secrets file is configured a placeholder one is supplied through `HOME`.
+    """
+    env = dict(os.environ)
+    secrets = [os.path.join(ROOT, ".streamlit", "secrets.toml"), os.path.expanduser("~/.streamlit/secrets.toml")]
+    if not any(os.path.exists(path) for path in secrets):
+        home = tempfile.mkdtemp(prefix="profile-imports-")
+        os.makedirs(os.path.join(home, ".streamlit"))
+        with open(os.path.join(home, ".streamlit", "secrets.toml"), "w") as secrets_file:
+            secrets_file.write('token = ""\n')
+        env["HOME"] = home
+    return env
+
+
+def import_times(module: str, env: dict = None) -> list:
+    """
+    Imports `module` in a fresh interpreter under `-X importtime`.
+
+    Args:
+        module (str): Dotted module name, e.g. 'app' or 'pages.predictions'.
+
+    Returns:
+        list: `(self_us, cumulative_us, depth, name)` for every module imported, in the
+        order the interpreter reports them, children before their parent.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if result.returncode:
+        raise SystemExit(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return rows
+
+
+def profile(module: str, runs: int) -> dict:
+    """
+    Profiles the cold import of `module`, keeping the fastest of `runs` imports.
+
+    Returns:
+        dict: `total_ms`, `heavy` (heavy modules loaded), `direct` (the module's own imports)
+        and `slowest` (every module by self time), the last two as `(ms, name)` sorted
+        slowest first.
+    """
+    best = None
+    env = child_env()
+    for _ in range(runs):
+        rows = import_times(module, env)
+        total = next(cumulative for _, cumulative, depth, name in rows if depth == 0 and name == module)
+        if best is None or total < best[0]:
+            best = (total, rows)
+    total, rows = best
+
+    # Rows between the previous top-level import and the module's own row belong to it
+    end = next(i for i, (_, _, depth, name) in enumerate(rows) if depth == 0 and name == module)
+    start = max((i + 1 for i, (_, _, depth, _) in enumerate(rows[:end]) if depth == 0), default=0)
+    own = rows[start:end]
+    return {
+        "total_ms": total / 1000,
+        "heavy": sorted({name.split(".")[0] for _, _, _, name in own if name.split(".")[0] in HEAVY_MODULES}),
+        "direct": sorted(((cumulative / 1000, name) for _, cumulative, depth, name in own if depth == 1), reverse=True),
+        "slowest": sorted(((self_us / 1000, name) for self_us, _, _, name in own), reverse=True),
+    }
+
+
+def report(module: str, stats: dict, top: int):
+    print(f"{module}: {stats['total_ms']:.0f} ms cold import")
+    print(f"  heavy modules loaded: {', '.join(stats['heavy']) or 'none'}")
+    print("  slowest direct imports (cumulative):")
+    for ms, name in stats["direct"][:top]:
+        print(f"    {ms:8.1f} ms  {name}")
+    print("  slowest modules (self):")
+    for ms, name in stats["slowest"][:top]:
+        print(f"    {ms:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report where cold-start import time goes for the Streamlit pages.")
+    parser.add_argument("modules", nargs="*", default=["app", "pages.predictions"], help="Modules to import (default: both pages)")
+    parser.add_argument("--runs", type=int, default=3, help="Imports per module; the fastest is reported")
+    parser.add_argument("--top", type=int, default=10, help="Rows to show per table")
+    parser.add_argument("--budget", type=float, help="Exit with status 1 if any module takes longer than this many ms")
+    args = parser.parse_args()
+
+    over_budget = False
+    for module in args.modules:
+        stats = profile(module, args.runs)
+        report(module, stats, args.top)
+        over_budget |= args.budget is not None and stats["total_ms"] > args.budget
+    sys.exit(1 if over_budget else 0)
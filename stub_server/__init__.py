@@ -0,0 +1,2 @@
+from stub_server.server import StubConfig, make_server
+from stub_server.synthetic import SyntheticAccount, generate_account
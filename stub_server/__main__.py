@@ -0,0 +1,50 @@
+import argparse
+
+from stub_server.server import StubConfig, make_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the GitHub GraphQL API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random delay, in seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of requests answered with a 502")
+    parser.add_argument("--rate-limit", type=int, default=5000, help="points per token per hour")
+    parser.add_argument("--years", type=float, default=13, help="history length of generated accounts")
+    parser.add_argument("--repos", type=int, default=327)
+    parser.add_argument("--followers", type=int, default=8230)
+    parser.add_argument("--following", type=int, default=29278)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--record", metavar="DIR", help="proxy to --upstream and save responses to DIR")
+    parser.add_argument("--replay", metavar="DIR", help="answer only from responses saved in DIR")
+    parser.add_argument("--upstream", default="https://api.github.com/graphql")
+    args = parser.parse_args()
+
+    config = StubConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        failure_rate=args.failure_rate,
+        rate_limit=args.rate_limit,
+        years=args.years,
+        repos=args.repos,
+        followers=args.followers,
+        following=args.following,
+        seed=args.seed,
+        record_dir=args.record,
+        replay_dir=args.replay,
+        upstream=args.upstream,
+    )
+    server = make_server(config, args.host, args.port)
+    print(f"Serving GitHub stand-in on http://{args.host}:{server.server_port} "
+          f"(set GITHUB_API_URL=http://{args.host}:{server.server_port})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
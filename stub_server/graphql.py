@@ -0,0 +1,142 @@
+import re
+from dataclasses import dataclass, field
+
+_TOKEN = re.compile(r"""
+    (?P<skip>[\s,]+|\#[^\n]*)
+  | (?P<string>"(?:[^"\\]|\\.)*")
+  | (?P<number>-?\d+(?:\.\d+)?)
+  | (?P<variable>\$[_A-Za-z][_0-9A-Za-z]*)
+  | (?P<name>[_A-Za-z][_0-9A-Za-z]*)
+  | (?P<punct>[{}():!\[\]=@])
+""", re.VERBOSE)
+
+
+class GraphQLSyntaxError(ValueError):
+    pass
+
+
+@dataclass
+class Field:
+    """
+    One field of a selection set. `key` is the alias if given, otherwise the field name.
+    """
+    name: str
+    alias: str = None
+    args: dict = field(default_factory=dict)
+    selections: list = field(default_factory=list)
+
+    @property
+    def key(self) -> str:
+        return self.alias or self.name
+
+
+def _tokenize(source: str) -> list:
+    tokens = []
+    position = 0
+    while position < len(source):
+        match = _TOKEN.match(source, position)
+        if match is None:
+            raise GraphQLSyntaxError(f"Unexpected character {source[position]!r} at {position}")
+        position = match.end()
+        kind = match.lastgroup
+        if kind != "skip":
+            tokens.append((kind, match.group()))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, source: str, variables: dict):
+        self.tokens = _tokenize(source)
+        self.position = 0
+        self.variables = variables or {}
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def take(self, value: str = None):
+        kind, text = self.peek()
+        if kind is None or (value is not None and text != value):
+            raise GraphQLSyntaxError(f"Expected {value or 'token'}, got {text!r}")
+        self.position += 1
+        return kind, text
+
+    def document(self) -> list:
+        kind, text = self.peek()
+        if kind == "name" and text in ("query", "mutation"):
+            self.take()
+            if self.peek()[0] == "name":
+                self.take()
+            if self.peek()[1] == "(":
+                self.skip_variable_definitions()
+        return self.selection_set()
+
+    def skip_variable_definitions(self):
+        depth = 0
+        while True:
+            _, text = self.take()
+            depth += text == "("
+            depth -= text == ")"
+            if depth == 0:
+                return
+
+    def selection_set(self) -> list:
+        self.take("{")
+        selections = []
+        while self.peek()[1] != "}":
+            selections.append(self.field())
+        self.take("}")
+        return selections
+
+    def field(self) -> Field:
+        _, name = self.take()
+        alias = None
+        if self.peek()[1] == ":":
+            self.take(":")
+            alias, (_, name) = name, self.take()
+        args = self.arguments() if self.peek()[1] == "(" else {}
+        selections = self.selection_set() if self.peek()[1] == "{" else []
+        return Field(name=name, alias=alias, args=args, selections=selections)
+
+    def arguments(self) -> dict:
+        self.take("(")
+        args = {}
+        while self.peek()[1] != ")":
+            _, name = self.take()
+            self.take(":")
+            args[name] = self.value()
+        self.take(")")
+        return args
+
+    def value(self):
+        kind, text = self.take()
+        if kind == "string":
+            return text[1:-1].encode().decode("unicode_escape")
+        if kind == "number":
+            return float(text) if "." in text else int(text)
+        if kind == "variable":
+            return self.variables.get(text[1:])
+        if text == "[":
+            values = []
+            while self.peek()[1] != "]":
+                values.append(self.value())
+            self.take("]")
+            return values
+        return {"true": True, "false": False, "null": None}.get(text, text)
+
+
+def parse(source: str, variables: dict = None) -> list:
+    """
+    Parses the subset of GraphQL the fetchers use: anonymous or named queries, aliases,
+    arguments with literal or variable values, and nested selection sets.
+
+    Args:
+        source (str): GraphQL query document.
+        variables (dict, optional): Values for `$variable` arguments.
+
+    Returns:
+        list: Top-level `Field` selections.
+
+    Raises:
+        GraphQLSyntaxError: If the document is outside the supported subset.
+    """
+    return _Parser(source, variables).document()
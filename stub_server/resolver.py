@@ -0,0 +1,214 @@
+import base64
+from datetime import date, datetime, timedelta
+
+from stub_server.graphql import Field
+
+
+class ResolveError(Exception):
+    def __init__(self, message: str, path: list, error_type: str = None):
+        super().__init__(message)
+        self.path = path
+        self.error_type = error_type
+
+
+def _date(value: str, default: date) -> date:
+    return datetime.strptime(value[:10], "%Y-%m-%d").date() if value else default
+
+
+def _cursor(index: int) -> str:
+    return base64.b64encode(f"cursor:{index}".encode()).decode()
+
+
+def _cursor_index(cursor: str) -> int:
+    return int(base64.b64decode(cursor).decode().split(":")[1])
+
+
+class Resolver:
+    """
+    Answers parsed queries from synthetic accounts, mirroring the shape of GitHub's
+    GraphQL API for the fields the fetchers select.
+
+    Args:
+        get_account (callable): Returns the `SyntheticAccount` for a login, or None if the
+            login should not resolve.
+        rate_limit (callable): Returns the `rateLimit` object for the current request.
+        viewer (str, optional): Login of the token's owner, answered for `viewer`.
+    """
+
+    def __init__(self, get_account, rate_limit, viewer: str = None):
+        self.get_account = get_account
+        self.rate_limit = rate_limit
+        self.viewer = viewer
+
+    def execute(self, fields: list) -> dict:
+        """
+        Resolves top-level fields into a GraphQL response body.
+        """
+        data, errors = {}, []
+        for query_field in fields:
+            try:
+                data[query_field.key] = self.root(query_field)
+            except ResolveError as e:
+                data[query_field.key] = None
+                error = {"path": e.path, "message": str(e)}
+                if e.error_type:
+                    error["type"] = e.error_type
+                errors.append(error)
+        response = {"data": data}
+        if errors:
+            response["errors"] = errors
+        return response
+
+    def root(self, query_field: Field):
+        if query_field.name == "user":
+            login = query_field.args.get("login", "")
+            account = self.get_account(login)
+            if account is None:
+                raise ResolveError(
+                    f"Could not resolve to a User with the login of '{login}'.", [query_field.key], "NOT_FOUND"
+                )
+            return self.project(query_field, lambda name, sub: self.user(account, name, sub), "User", [query_field.key])
+        if query_field.name == "viewer":
+            values = {"login": self.viewer}
+            return self.project(query_field, lambda name, sub: values[name], "User", [query_field.key])
+        if query_field.name == "rateLimit":
+            values = self.rate_limit()
+            return self.project(query_field, lambda name, sub: values[name], "RateLimit", [query_field.key])
+        raise ResolveError(f"Field '{query_field.name}' doesn't exist on type 'Query'", [query_field.key])
+
+    def project(self, query_field: Field, resolve, type_name: str, path: list) -> dict:
+        result = {}
+        for selection in query_field.selections:
+            try:
+                result[selection.key] = resolve(selection.name, selection)
+            except KeyError:
+                raise ResolveError(f"Field '{selection.name}' doesn't exist on type '{type_name}'", path + [selection.key])
+        return result
+
+    def user(self, account, name: str, selection: Field):
+        path = [selection.key]
+        if name in ("followers", "following"):
+            count = account.followers if name == "followers" else account.following
+            return self.project(selection, lambda field_name, sub: {"totalCount": count}[field_name], "Connection", path)
+        if name == "repositories":
+            return self.repositories(account, selection)
+        if name == "contributionsCollection":
+            return self.contributions(account, selection)
+        values = {
+            "login": account.login,
+            "name": account.login.title(),
+            "bio": f"Synthetic account {account.login}",
+            "location": "Localhost",
+            "createdAt": account.created_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "avatarUrl": f"https://avatars.githubusercontent.com/{account.login}",
+            "url": f"https://github.com/{account.login}",
+        }
+        return values[name]
+
+    def repositories(self, account, selection: Field) -> dict:
+        first = selection.args.get("first")
+        after = selection.args.get("after")
+        start = _cursor_index(after) + 1 if after else 0
+        end = len(account.repositories) if first is None else min(len(account.repositories), start + first)
+        page = list(enumerate(account.repositories[start:end], start))
+        if first is not None and not 1 <= first <= 100:
+            raise ResolveError("Requesting more than 100 records on the `repositories` connection is not supported.", [selection.key])
+
+        def edge_resolver(index, repo):
+            def resolve(name, sub):
+                if name == "cursor":
+                    return _cursor(index)
+                if name == "node":
+                    return self.repository(repo, sub)
+                raise KeyError(name)
+            return resolve
+
+        def resolve(name, sub):
+            if name == "totalCount":
+                return len(account.repositories)
+            if name == "pageInfo":
+                info = {
+                    "hasNextPage": end < len(account.repositories),
+                    "endCursor": _cursor(end - 1) if page else None,
+                    "hasPreviousPage": start > 0,
+                    "startCursor": _cursor(start) if page else None,
+                }
+                return self.project(sub, lambda field_name, _: info[field_name], "PageInfo", [sub.key])
+            if name == "edges":
+                return [self.project(sub, edge_resolver(index, repo), "RepositoryEdge", [sub.key]) for index, repo in page]
+            if name == "nodes":
+                return [self.repository(repo, sub) for _, repo in page]
+            raise KeyError(name)
+
+        return self.project(selection, resolve, "RepositoryConnection", [selection.key])
+
+    def repository(self, repo: dict, selection: Field) -> dict:
+        def resolve(name, sub):
+            value = repo[name]
+            if sub.selections and value is not None:
+                return self.project(sub, lambda field_name, _: value[field_name], "Language", [sub.key])
+            return value
+
+        return self.project(selection, resolve, "Repository", [selection.key])
+
+    def contributions(self, account, selection: Field) -> dict:
+        today = date.today()
+        to_date = _date(selection.args.get("to"), today)
+        from_date = _date(selection.args.get("from"), to_date - timedelta(days=365))
+        if (to_date - from_date).days > 366:
+            raise ResolveError(
+                "The total time spanned by 'from' and 'to' must not exceed 1 year", [selection.key]
+            )
+
+        days = []
+        day = from_date
+        while day <= min(to_date, today):
+            days.append((day, account.count_on(day)))
+            day += timedelta(days=1)
+        total = sum(count for _, count in days)
+
+        def calendar(name, sub):
+            if name == "totalContributions":
+                return total
+            if name == "weeks":
+                return self.calendar_weeks(days, sub)
+            raise KeyError(name)
+
+        def resolve(name, sub):
+            if name == "contributionCalendar":
+                return self.project(sub, calendar, "ContributionCalendar", [sub.key])
+            return {
+                "restrictedContributionsCount": int(total * account.restricted_ratio),
+                "totalCommitContributions": int(total * 0.85),
+                "totalPullRequestContributions": int(total * 0.1),
+                "totalIssueContributions": int(total * 0.05),
+            }[name]
+
+        return self.project(selection, resolve, "ContributionsCollection", [selection.key])
+
+    def calendar_weeks(self, days: list, selection: Field) -> list:
+        weeks = []
+        for day, count in days:
+            if not weeks or day.weekday() == 6:    # Weeks start on Sunday
+                weeks.append([])
+            weeks[-1].append((day, count))
+
+        def week_resolver(week):
+            def resolve(name, sub):
+                if name != "contributionDays":
+                    raise KeyError(name)
+                return [
+                    self.project(sub, day_resolver(day, count), "ContributionCalendarDay", [sub.key])
+                    for day, count in week
+                ]
+            return resolve
+
+        def day_resolver(day, count):
+            values = {
+                "contributionCount": count,
+                "date": day.strftime("%Y-%m-%d"),
+                "weekday": (day.weekday() + 1) % 7,
+            }
+            return lambda name, _: values[name]
+
+        return [self.project(selection, week_resolver(week), "ContributionCalendarWeek", [selection.key]) for week in weeks]
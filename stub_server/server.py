@@ -0,0 +1,221 @@
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from stub_server.graphql import GraphQLSyntaxError, parse
+from stub_server.resolver import Resolver
+from stub_server.synthetic import generate_account
+from utils.response_cache import ResponseCache
+
+
+@dataclass
+class StubConfig:
+    """
+    Behaviour of the stand-in server.
+
+    Attributes:
+        latency (float): Seconds added to every response.
+        jitter (float): Extra random delay of up to this many seconds.
+        failure_rate (float): Fraction of requests answered with a 502.
+        rate_limit (int): Points per token per hour before requests are rejected.
+        years, repos, followers, following, seed: Parameters of generated accounts.
+        record_dir (str): Forward requests to `upstream` and save the responses here.
+        replay_dir (str): Answer only from responses saved by a recording run.
+        upstream (str): Real GraphQL endpoint used in record mode.
+    """
+    latency: float = 0.0
+    jitter: float = 0.0
+    failure_rate: float = 0.0
+    rate_limit: int = 5000
+    years: float = 13
+    repos: int = 327
+    followers: int = 8230
+    following: int = 29278
+    seed: int = 0
+    record_dir: str = None
+    replay_dir: str = None
+    upstream: str = "https://api.github.com/graphql"
+
+
+class StubState:
+    """
+    Shared state of a running stub: generated accounts and per-token rate-limit budgets.
+    Every login resolves to a generated account except those starting with "ghost", which
+    answer with GitHub's NOT_FOUND error.
+    """
+
+    def __init__(self, config: StubConfig):
+        self.config = config
+        self.random = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self._accounts = {}
+        self._budgets = {}
+
+    def account(self, login: str):
+        if login.lower().startswith("ghost"):
+            return None
+        with self._lock:
+            if login.lower() not in self._accounts:
+                self._accounts[login.lower()] = generate_account(
+                    login,
+                    years=self.config.years,
+                    repos=self.config.repos,
+                    followers=self.config.followers,
+                    following=self.config.following,
+                    seed=self.config.seed,
+                )
+            return self._accounts[login.lower()]
+
+    def spend(self, token: str, cost: int = 1) -> dict:
+        """
+        Charges `cost` points to `token` and returns its budget after the charge.
+        """
+        now = time.time()
+        with self._lock:
+            budget = self._budgets.get(token)
+            if budget is None or budget["reset"] <= now:
+                budget = self._budgets[token] = {"used": 0, "reset": int(now) + 3600}
+            budget["used"] += cost
+            return {
+                "limit": self.config.rate_limit,
+                "used": budget["used"],
+                "remaining": max(0, self.config.rate_limit - budget["used"]),
+                "reset": budget["reset"],
+                "cost": cost,
+            }
+
+    def delay(self):
+        with self._lock:
+            extra = self.random.uniform(0, self.config.jitter) if self.config.jitter else 0.0
+            fail = self.random.random() < self.config.failure_rate
+        time.sleep(self.config.latency + extra)
+        return fail
+
+
+def _recording_path(directory: str, body: dict) -> str:
+    key = ResponseCache.key(body.get("query", ""), body.get("variables"))
+    return os.path.join(directory, f"{key}.json")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server_version = "GitHubStub/1.0"
+    state: StubState = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status: int, body: dict, budget: dict = None, headers: dict = None):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        if budget:
+            self.send_header("X-RateLimit-Limit", str(budget["limit"]))
+            self.send_header("X-RateLimit-Remaining", str(budget["remaining"]))
+            self.send_header("X-RateLimit-Used", str(budget["used"]))
+            self.send_header("X-RateLimit-Reset", str(budget["reset"]))
+            self.send_header("X-RateLimit-Resource", "graphql")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        parts = self.path.strip("/").split("/")
+        if len(parts) == 3 and parts[0] == "repos":
+            self.send_json(200, {"full_name": f"{parts[1]}/{parts[2]}", "stargazers_count": 1234})
+        else:
+            self.send_json(404, {"message": "Not Found"})
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/graphql":
+            self.send_json(404, {"message": "Not Found"})
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self.send_json(400, {"message": "Problems parsing JSON"})
+            return
+
+        config = self.state.config
+        if config.replay_dir:
+            self.replay(body)
+            return
+        if config.record_dir:
+            self.record(body)
+            return
+
+        token = self.headers.get("Authorization", "")
+        budget = self.state.spend(token)
+        if self.state.delay():
+            self.send_json(502, {"message": "Server Error"}, budget)
+            return
+        if budget["used"] > config.rate_limit:
+            retry_after = str(max(1, budget["reset"] - int(time.time())))
+            self.send_json(403, {"message": "API rate limit exceeded"}, budget, {"Retry-After": retry_after})
+            return
+
+        try:
+            fields = parse(body.get("query", ""), body.get("variables"))
+        except GraphQLSyntaxError as e:
+            self.send_json(200, {"errors": [{"message": f"Parse error: {e}"}]}, budget)
+            return
+
+        rate_limit = {
+            "cost": budget["cost"],
+            "limit": budget["limit"],
+            "remaining": budget["remaining"],
+            "used": budget["used"],
+            "resetAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(budget["reset"])),
+        }
+        # A token stands for the account it names, so `viewer` is the token's text
+        viewer = token.split(" ", 1)[-1] or None
+        resolver = Resolver(self.state.account, lambda: rate_limit, viewer)
+        self.send_json(200, resolver.execute(fields), budget)
+
+    def record(self, body: dict):
+        config = self.state.config
+        response = requests.post(
+            config.upstream,
+            json=body,
+            headers={"Authorization": self.headers.get("Authorization", "")},
+            timeout=(5, 30),
+        )
+        recording = {"status": response.status_code, "body": response.json()}
+        os.makedirs(config.record_dir, exist_ok=True)
+        with open(_recording_path(config.record_dir, body), "w") as f:
+            json.dump(recording, f)
+        self.send_json(recording["status"], recording["body"])
+
+    def replay(self, body: dict):
+        path = _recording_path(self.state.config.replay_dir, body)
+        if not os.path.exists(path):
+            self.send_json(404, {"errors": [{"message": "No recording for this query"}]})
+            return
+        with open(path) as f:
+            recording = json.load(f)
+        self.send_json(recording["status"], recording["body"])
+
+
+def make_server(config: StubConfig, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """
+    Creates a stand-in GitHub API server. Point the app at it with
+    `GITHUB_API_URL=http://<host>:<port>`.
+
+    Args:
+        config (StubConfig): Behaviour of the server.
+        host (str, optional): Interface to bind.
+        port (int, optional): Port to bind. 0 picks a free port.
+
+    Returns:
+        ThreadingHTTPServer: Server ready for `serve_forever()`.
+    """
+    handler = type("BoundStubHandler", (StubHandler,), {"state": StubState(config)})
+    return ThreadingHTTPServer((host, port), handler)
@@ -0,0 +1,103 @@
+import hashlib
+import random
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+
+LANGUAGES = [
+    ("Python", "#3572A5"),
+    ("JavaScript", "#f1e05a"),
+    ("TypeScript", "#3178c6"),
+    ("Go", "#00ADD8"),
+    ("Rust", "#dea584"),
+    ("Java", "#b07219"),
+    ("C++", "#f34b7d"),
+    ("Jupyter Notebook", "#DA5B0B"),
+    ("Shell", "#89e051"),
+    ("HTML", "#e34c26"),
+]
+
+
+@dataclass
+class SyntheticAccount:
+    """
+    Deterministic fake GitHub account. The same login and seed always produce the same
+    profile, repositories and contribution history.
+    """
+    login: str
+    created_at: datetime
+    followers: int
+    following: int
+    repositories: list = field(default_factory=list)
+    counts: list = field(default_factory=list)    # contributions per day since created_at
+    restricted_ratio: float = 0.1
+
+    @property
+    def start(self) -> date:
+        return self.created_at.date()
+
+    def count_on(self, day: date) -> int:
+        offset = (day - self.start).days
+        if 0 <= offset < len(self.counts):
+            return self.counts[offset]
+        return 0
+
+
+def generate_account(login: str, years: float = 13, repos: int = 327, followers: int = 8230,
+                     following: int = 29278, seed: int = 0, today: date = None) -> SyntheticAccount:
+    """
+    Generates a synthetic account with `years` of history.
+
+    Activity comes in bursts with quiet weeks in between, so streaks, milestones and
+    weekday/weekend splits look like real accounts. Sizes default to the sample account in
+    `static/data/github_data.json`, and can be raised to thousands of repositories or tens
+    of thousands of follows for load tests.
+
+    Args:
+        login (str): GitHub username.
+        years (float, optional): Length of the contribution history.
+        repos (int, optional): Number of owned, non-fork repositories.
+        followers (int, optional): Follower count.
+        following (int, optional): Following count.
+        seed (int, optional): Extra seed, to get different accounts for the same login.
+        today (date, optional): Last day of history. Defaults to today.
+
+    Returns:
+        SyntheticAccount: The generated account.
+    """
+    digest = hashlib.sha256(f"{login.lower()}:{seed}".encode()).digest()
+    rng = random.Random(int.from_bytes(digest[:8], "big"))
+    today = today or date.today()
+    start = today - timedelta(days=int(years * 365.25))
+    created_at = datetime(start.year, start.month, start.day, rng.randrange(24), rng.randrange(60), rng.randrange(60))
+
+    counts = []
+    active = rng.random() < 0.5
+    for offset in range((today - start).days + 1):
+        day = start + timedelta(days=offset)
+        if rng.random() < 0.08:
+            active = not active
+        weekday_factor = 0.4 if day.weekday() >= 5 else 1.0
+        if active and rng.random() < 0.8 * weekday_factor:
+            counts.append(max(1, int(rng.expovariate(1 / 4))))
+        else:
+            counts.append(0)
+
+    repositories = []
+    for index in range(repos):
+        language = rng.choice(LANGUAGES) if rng.random() < 0.85 else None
+        repositories.append({
+            "name": f"{login}-repo-{index}",
+            "stargazerCount": int(rng.paretovariate(1.5)) - 1,
+            "forkCount": int(rng.paretovariate(2.0)) - 1,
+            "primaryLanguage": {"name": language[0], "color": language[1]} if language else None,
+        })
+
+    return SyntheticAccount(
+        login=login,
+        created_at=created_at,
+        followers=followers,
+        following=following,
+        repositories=repositories,
+        counts=counts,
+        restricted_ratio=round(rng.uniform(0.0, 0.2), 3),
+    )
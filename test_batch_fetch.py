@@ -0,0 +1,105 @@
+import re
+import unittest
+
+from utils.batch_fetch import fetch_users_in_batches
+from utils.queries import batch_user_query, split_batch_data
+
+
+def fake_user(login: str) -> dict:
+    return {
+        "login": login,
+        "contributionsCollection": {
+            "contributionCalendar": {
+                "totalContributions": 1,
+                "weeks": [{"contributionDays": [{"contributionCount": 1, "date": "2024-01-07"}]}],
+            }
+        },
+    }
+
+
+class FakeSender:
+    """
+    Answers `batch_user_query` documents, failing like GitHub does when asked to.
+    """
+
+    def __init__(self, max_users: int = None, error: dict = None, cost_per_user: float = 1):
+        self.max_users = max_users
+        self.error = error
+        self.cost_per_user = cost_per_user
+        self.batches = []
+
+    def __call__(self, query: str, token: str) -> dict:
+        logins = re.findall(r'user\(login: "([^"]+)"\)', query)
+        self.batches.append(logins)
+        if self.error is not None:
+            return self.error
+        if self.max_users is not None and len(logins) > self.max_users:
+            return {"errors": [{"type": "MAX_NODE_LIMIT_EXCEEDED", "message": "This query requests too many nodes."}]}
+        data = {f"u{index}": fake_user(login) for index, login in enumerate(logins)}
+        data["rateLimit"] = {"cost": max(1, int(len(logins) * self.cost_per_user))}
+        return {"data": data, "fetchedAt": 5.0}
+
+
+class TestSplitBatchData(unittest.TestCase):
+    def test_demultiplexes_aliases(self):
+        logins = ["alice", "bob", "ghost"]
+        data = {
+            "data": {"u0": fake_user("alice"), "u1": fake_user("bob"), "u2": None, "rateLimit": {"cost": 1}},
+            "errors": [{"path": ["u2"], "message": "Could not resolve to a User with the login of 'ghost'."}],
+            "fetchedAt": 5.0,
+        }
+        payloads = split_batch_data(data, logins)
+        self.assertEqual(list(payloads), logins)
+        self.assertEqual(payloads["alice"], {"data": {"user": fake_user("alice")}, "fetchedAt": 5.0})
+        self.assertEqual(payloads["bob"]["data"]["user"]["login"], "bob")
+        self.assertEqual(payloads["ghost"], {"errors": "Could not resolve to a User with the login of 'ghost'."})
+
+    def test_request_error(self):
+        payloads = split_batch_data({"errors": "Connection refused"}, ["alice", "bob"])
+        self.assertEqual(payloads, {"alice": {"errors": "Connection refused"}, "bob": {"errors": "Connection refused"}})
+
+    def test_query_aliases_match(self):
+        query = batch_user_query(["alice", "bob"])
+        self.assertIn('u0: user(login: "alice")', query)
+        self.assertIn('u1: user(login: "bob")', query)
+
+
+class TestFetchUsersInBatches(unittest.TestCase):
+    def setUp(self):
+        self.logins = [f"user{index}" for index in range(23)]
+
+    def test_fetches_every_user(self):
+        send = FakeSender()
+        payloads = fetch_users_in_batches(self.logins + ["user0"], "token", send)
+        self.assertEqual(list(payloads), self.logins)
+        self.assertTrue(all("data" in payload for payload in payloads.values()))
+        self.assertEqual(sorted(login for batch in send.batches for login in batch), sorted(self.logins))
+
+    def test_splits_batches_over_node_limit(self):
+        send = FakeSender(max_users=3)
+        payloads = fetch_users_in_batches(self.logins, "token", send)
+        self.assertTrue(all("data" in payload for payload in payloads.values()))
+        self.assertEqual(send.batches[0], self.logins[:10])
+        self.assertTrue(all(len(batch) <= 3 for batch in send.batches[3:]))
+
+    def test_shrinks_costly_batches(self):
+        send = FakeSender(cost_per_user=10)
+        fetch_users_in_batches(self.logins, "token", send)
+        self.assertEqual([len(batch) for batch in send.batches[:3]], [10, 5, 2])
+
+    def test_stops_on_request_errors(self):
+        # Test that auth, network and rate-limit errors are not retried in smaller batches
+        for error in (
+            {"errors": "401 Client Error: Unauthorized"},
+            {"errors": "GitHub API rate limit exhausted. It resets at 10:00:00."},
+            {"errors": [{"type": "RATE_LIMITED", "message": "API rate limit exceeded"}]},
+        ):
+            send = FakeSender(error=error)
+            payloads = fetch_users_in_batches(self.logins, "token", send)
+            self.assertEqual(len(send.batches), 1)
+            self.assertEqual(list(payloads), self.logins)
+            self.assertEqual({str(payload["errors"]) for payload in payloads.values()}, {str(error["errors"])})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import json
+import random
+import unittest
+from array import array
+from datetime import date, timedelta
+
+from utils.calendar_stream import CalendarDays, decode_response, dumps
+
+
+def make_weeks(start: date, counts: list) -> list:
+    # Calendar weeks as GitHub returns them, starting on Sunday
+    weeks = []
+    for offset, count in enumerate(counts):
+        day = start + timedelta(days=offset)
+        if not weeks or day.toordinal() % 7 == 0:
+            weeks.append({"contributionDays": []})
+        weeks[-1]["contributionDays"].append({"contributionCount": count, "date": day.isoformat()})
+    return weeks
+
+
+class TestCalendarDecoder(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(7)
+        self.weeks = make_weeks(date(2019, 3, 13), [rng.randrange(12) for _ in range(400)])
+        self.response = {
+            "data": {
+                "user": {
+                    "login": "octocat",
+                    "bio": 'Quotes "weeks": [ and brackets ] in text',
+                    "y2019": {"contributionCalendar": {"totalContributions": 5, "weeks": self.weeks[:30]}},
+                    "y2020": {"contributionCalendar": {"totalContributions": 7, "weeks": self.weeks[30:]}},
+                }
+            }
+        }
+        self.text = json.dumps(self.response, indent=1)
+
+    def assertDecoded(self, decoded):
+        user = decoded["data"]["user"]
+        self.assertEqual(user["bio"], self.response["data"]["user"]["bio"])
+        self.assertIsInstance(user["y2019"]["contributionCalendar"]["weeks"], CalendarDays)
+        self.assertEqual(user["y2019"]["contributionCalendar"]["weeks"], self.weeks[:30])
+        self.assertEqual(user["y2020"]["contributionCalendar"]["weeks"], self.weeks[30:])
+        self.assertEqual(user["y2020"]["contributionCalendar"]["totalContributions"], 7)
+
+    def test_decode_whole(self):
+        self.assertDecoded(decode_response([self.text]))
+
+    def test_decode_arbitrary_chunks(self):
+        # Test that every split point, including ones inside keys and numbers, decodes the same
+        data = self.text.encode("utf-8")
+        rng = random.Random(11)
+        for _ in range(50):
+            cuts = sorted(rng.sample(range(1, len(data)), rng.randint(1, 40)))
+            chunks = [data[start:end] for start, end in zip([0, *cuts], [*cuts, len(data)])]
+            self.assertDecoded(decode_response(chunks))
+
+    def test_decode_single_bytes(self):
+        # Test one byte at a time, which also splits multi-byte characters
+        response = {"data": {"user": {"name": "Zoë 🐙", "contributionCalendar": {"weeks": self.weeks[:3]}}}}
+        data = json.dumps(response, ensure_ascii=False).encode("utf-8")
+        decoded = decode_response([data[i:i + 1] for i in range(len(data))])
+        self.assertEqual(decoded["data"]["user"]["name"], "Zoë 🐙")
+        self.assertEqual(decoded["data"]["user"]["contributionCalendar"]["weeks"], self.weeks[:3])
+
+    def test_decode_truncated(self):
+        with self.assertRaises(ValueError):
+            decode_response([self.text[:len(self.text) // 2]])
+
+
+class TestCalendarDays(unittest.TestCase):
+    def test_weeks_indexing(self):
+        # Test every weekday as the first day, against the JSON weeks list
+        for first in range(7):
+            start = date(2024, 1, 7) + timedelta(days=first)
+            weeks = make_weeks(start, list(range(1, 30)))
+            days = CalendarDays.from_weeks(weeks)
+            self.assertEqual(len(days), len(weeks))
+            self.assertEqual([days[i] for i in range(len(days))], weeks)
+            self.assertEqual(days[-1], weeks[-1])
+            self.assertEqual(days[1:3], weeks[1:3])
+            with self.assertRaises(IndexError):
+                days[len(weeks)]
+
+    def test_weeks_with_gaps(self):
+        days = CalendarDays(array("i", [7, 8, 21, 23]), array("i", [1, 2, 3, 4]))
+        self.assertEqual(len(days), 2)
+        self.assertEqual(days[1], days.weeks()[1])
+
+    def test_dumps_round_trip(self):
+        days = CalendarDays.from_weeks(make_weeks(date(2021, 5, 5), [3, 0, 1, 9] * 50))
+        payload = {"data": {"weeks": days, "note": '{"__series__":0}'}}
+        text = dumps(payload)
+        self.assertEqual(json.loads(text), {"data": {"weeks": days.weeks(), "note": '{"__series__":0}'}})
+        self.assertEqual(decode_response([text])["data"]["weeks"], days)
+
+    def test_dumps_empty(self):
+        self.assertEqual(json.loads(dumps({"weeks": CalendarDays()})), {"weeks": []})
+
+
+if __name__ == '__main__':
+    unittest.main()
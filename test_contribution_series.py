@@ -0,0 +1,79 @@
+import pickle
+import unittest
+from datetime import date, timedelta
+
+from utils.calendar_stream import CalendarDays
+from utils.contribution_series import ContributionSeries
+
+
+def make_days(start: date, length: int) -> list:
+    return [
+        {"contributionCount": (offset * 7) % 5, "date": (start + timedelta(days=offset)).isoformat()}
+        for offset in range(length)
+    ]
+
+
+class TestContributionSeries(unittest.TestCase):
+    def setUp(self):
+        # 2023-11-15 to 2025-02-10, across a leap year
+        self.days = make_days(date(2023, 11, 15), 454)
+        self.series = ContributionSeries.from_days(self.days)
+
+    def expected(self, first: str, last: str) -> list:
+        return [day for day in self.days if first <= day["date"] <= last]
+
+    def test_round_trip(self):
+        self.assertEqual(self.series.start, date(2023, 11, 15))
+        self.assertEqual(self.series.end, date(2025, 2, 10))
+        self.assertEqual(self.series.to_days(), self.days)
+        self.assertEqual(self.series.total(), sum(day["contributionCount"] for day in self.days))
+
+    def test_missing_days_are_zero(self):
+        series = ContributionSeries.from_days([self.days[3], self.days[0]])
+        self.assertEqual(len(series), 4)
+        self.assertEqual([int(count) for count in series.counts], [self.days[0]["contributionCount"], 0, 0, self.days[3]["contributionCount"]])
+
+    def test_from_calendar_shares_counts(self):
+        calendar = CalendarDays.from_weeks([{"contributionDays": self.days[:10]}])
+        series = ContributionSeries.from_calendar(calendar)
+        self.assertEqual(series.to_days(), self.days[:10])
+        calendar.counts[0] = 99
+        self.assertEqual(series.count_on(self.days[0]["date"]), 99)
+
+    def test_year(self):
+        self.assertEqual(self.series.year(2024).to_days(), self.expected("2024-01-01", "2024-12-31"))
+        self.assertEqual(len(self.series.year(2024)), 366)
+        # Years the series only partly covers are clipped to it
+        self.assertEqual(self.series.year(2023).to_days(), self.expected("2023-01-01", "2023-12-31"))
+        self.assertEqual(self.series.year(2025).end, date(2025, 2, 10))
+        self.assertEqual(len(self.series.year(2022)), 0)
+
+    def test_month(self):
+        self.assertEqual(self.series.month(2024, 2).to_days(), self.expected("2024-02-01", "2024-02-29"))
+        self.assertEqual(self.series.month(2024, 12).to_days(), self.expected("2024-12-01", "2024-12-31"))
+        self.assertEqual(self.series.month(2023, 11).start, date(2023, 11, 15))
+        self.assertEqual(len(self.series.month(2025, 3)), 0)
+
+    def test_between(self):
+        self.assertEqual(self.series.between("2024-03-30", date(2024, 4, 2)).to_days(), self.expected("2024-03-30", "2024-04-02"))
+        self.assertEqual(self.series.between(to_date="2023-11-16").to_days(), self.days[:2])
+        self.assertEqual(self.series.between("2025-02-09").to_days(), self.days[-2:])
+        self.assertEqual(len(self.series.between("2024-05-02", "2024-05-01")), 0)
+        self.assertEqual(len(self.series.between("2020-01-01", "2020-12-31")), 0)
+
+    def test_views_share_counts(self):
+        view = self.series.month(2024, 6)
+        view.counts[0] = 42
+        self.assertEqual(self.series.count_on("2024-06-01"), 42)
+
+    def test_count_on_outside_the_series(self):
+        self.assertEqual(self.series.count_on("2023-11-14"), 0)
+        self.assertEqual(self.series.count_on(date(2025, 2, 11)), 0)
+
+    def test_pickles(self):
+        copy = pickle.loads(pickle.dumps(self.series.year(2024)))
+        self.assertEqual(copy.to_days(), self.series.year(2024).to_days())
+
+
+if __name__ == '__main__':
+    unittest.main()
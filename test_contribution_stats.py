@@ -0,0 +1,259 @@
+import random
+import unittest
+from datetime import date, timedelta
+from unittest import mock
+
+from utils import contribution_rollup, contribution_stats
+from utils.contribution_rollup import rollup_contributions
+from utils.contribution_series import ContributionSeries
+from utils.contribution_stats import (
+    ContributionIndex,
+    find_milestones,
+    find_milestones_batch,
+    find_streaks,
+    find_streaks_batch,
+    summarize_contributions,
+)
+from utils.process_github_data import analyze_contributions
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+
+def make_days(start: date, length: int, seed: int) -> list:
+    # Bursts of activity with quiet stretches, like real calendars
+    rng = random.Random(seed)
+    days, active = [], True
+    for offset in range(length):
+        if rng.random() < 0.1:
+            active = not active
+        count = rng.randrange(1, 15) if active and rng.random() < 0.8 else 0
+        days.append({"date": (start + timedelta(days=offset)).isoformat(), "contributionCount": count})
+    return days
+
+
+def reference_streaks(days: list, today: date) -> tuple:
+    # Day-by-day walk of the original `get_streaks`
+    current = longest = 0
+    last = None
+    for day in days:
+        if day["contributionCount"] > 0:
+            day_date = date.fromisoformat(day["date"])
+            if last and (day_date - last).days > 1:
+                current = 0
+            current += 1
+            longest = max(longest, current)
+            last = day_date
+    if last and (today - last).days > 1:
+        current = 0
+    return current, longest
+
+
+def reference_milestones(days: list, milestones: list) -> dict:
+    reached, total = {}, 0
+    for day in days:
+        total += day["contributionCount"]
+        for milestone in milestones:
+            if milestone not in reached and day["contributionCount"] > 0 and total >= milestone:
+                reached[milestone] = date.fromisoformat(day["date"])
+    return reached
+
+
+class TestSummarizeContributions(unittest.TestCase):
+    def setUp(self):
+        self.days = make_days(date(2020, 2, 27), 900, seed=3)
+        self.today = date.fromisoformat(self.days[-1]["date"])
+        self.windows = {"2021": ("2021-01-01", "2021-12-31"), "recent": ("2022-06-01", None)}
+
+    def check(self, days, today):
+        stats = summarize_contributions(days, self.windows, today)
+        counts = [day["contributionCount"] for day in days]
+        self.assertEqual(stats["total"], sum(counts))
+        self.assertEqual(stats["days"], len(days))
+        self.assertEqual(stats["active_days"], sum(1 for count in counts if count > 0))
+        highest = max(days, key=lambda day: day["contributionCount"])
+        self.assertEqual(stats["highest"], highest["contributionCount"])
+        self.assertEqual(stats["highest_date"], highest["date"])
+        self.assertEqual((stats["current_streak"], stats["longest_streak"]), reference_streaks(days, today))
+        self.assertEqual(stats["today"], sum(day["contributionCount"] for day in days if day["date"] == today.isoformat()))
+        for name, (from_date, to_date) in self.windows.items():
+            selected = [
+                day["contributionCount"] for day in days
+                if day["date"] >= from_date and (to_date is None or day["date"] <= to_date)
+            ]
+            self.assertEqual(stats["windows"][name]["total"], sum(selected))
+            self.assertEqual(stats["windows"][name]["days"], len(selected))
+            self.assertEqual(stats["windows"][name]["active_days"], sum(1 for count in selected if count > 0))
+
+    def test_matches_reference(self):
+        self.check(self.days, self.today)
+        self.check(self.days, self.today + timedelta(days=5))
+
+    def test_matches_reference_without_numpy(self):
+        with mock.patch.object(contribution_stats, "np", None):
+            self.check(self.days, self.today)
+
+    def test_empty(self):
+        stats = summarize_contributions([], self.windows, self.today)
+        self.assertEqual(stats["total"], 0)
+        self.assertIsNone(stats["highest_date"])
+        self.assertEqual(stats["windows"]["2021"], {"total": 0, "days": 0, "active_days": 0})
+
+
+def contribution_response(days: list) -> dict:
+    return {"data": {"user": {"contributionsCollection": {"contributionCalendar": {"weeks": [{"contributionDays": days}]}}}}}
+
+
+class TestContributionIndex(unittest.TestCase):
+    def setUp(self):
+        self.days = make_days(date(2021, 3, 10), 800, seed=6)
+        self.ranges = [
+            ("2021-03-10", "2023-05-18"),
+            ("2022-01-01", "2022-12-31"),
+            ("2022-02-01", "2022-02-28"),
+            ("2023-05-18", "2023-05-18"),
+            ("2020-06-01", "2021-04-01"),
+            ("2023-01-01", "2024-12-31"),
+        ]
+
+    def check(self, index):
+        for from_date, to_date in self.ranges:
+            selected = [day for day in self.days if from_date <= day["date"] <= to_date]
+            self.assertEqual(index.range_stats(from_date, to_date), analyze_contributions(contribution_response(selected)))
+        self.assertEqual(index.range_stats(), analyze_contributions(contribution_response(self.days)))
+        self.assertIn("errors", index.range_stats("2019-01-01", "2019-12-31"))
+        self.assertIn("errors", index.range_stats("2022-05-02", "2022-05-01"))
+
+    def test_matches_analyze_contributions(self):
+        self.check(ContributionIndex(self.days))
+
+    def test_matches_analyze_contributions_without_numpy(self):
+        with mock.patch.object(contribution_stats, "np", None):
+            self.check(ContributionIndex(self.days))
+
+    def test_covers(self):
+        index = ContributionIndex(self.days)
+        self.assertTrue(index.covers("2021-03-10", "2023-05-18"))
+        self.assertTrue(index.covers("2022-01-01"))
+        # Days after the last one have not happened yet
+        self.assertTrue(index.covers("2023-01-01", "2023-12-31"))
+        self.assertFalse(index.covers("2021-03-09", "2021-12-31"))
+        self.assertFalse(index.covers("2022-05-02", "2022-05-01"))
+        self.assertFalse(ContributionIndex([]).covers("2022-01-01", "2022-12-31"))
+
+
+class TestStreaks(unittest.TestCase):
+    def setUp(self):
+        self.users = [
+            make_days(date(2019, 1, 1), 700, seed=1),
+            make_days(date(2020, 6, 15), 300, seed=2),
+            [],
+            make_days(date(2018, 12, 30), 20, seed=4),
+        ]
+        self.series = [ContributionSeries.from_days(days) for days in self.users]
+        self.today = date(2020, 12, 1)
+
+    def test_find_streaks(self):
+        for days in self.users:
+            streaks = find_streaks(days, self.today)
+            self.assertEqual((streaks["current"], streaks["longest"]), reference_streaks(days, self.today))
+            self.assertEqual(sum(streak.total for streak in streaks["streaks"]), sum(day["contributionCount"] for day in days))
+
+    def check_streaks_batch(self):
+        batch = find_streaks_batch(self.series, self.today)
+        runs = batch["runs"]
+        for user, series in enumerate(self.series):
+            single = find_streaks(series, self.today)
+            self.assertEqual(batch["current"][user], single["current"])
+            self.assertEqual(batch["longest"][user], single["longest"])
+            rows = [i for i, row in enumerate(runs["user"]) if row == user]
+            self.assertEqual(
+                [(batch["start"] + timedelta(days=runs["start"][i]), runs["length"][i], runs["total"][i]) for i in rows],
+                [(streak.start, streak.length, streak.total) for streak in single["streaks"]],
+            )
+
+    def test_find_streaks_batch(self):
+        self.check_streaks_batch()
+
+    def test_find_streaks_batch_without_numpy(self):
+        with mock.patch.object(contribution_stats, "np", None):
+            self.check_streaks_batch()
+
+
+class TestMilestones(unittest.TestCase):
+    def setUp(self):
+        self.users = [
+            make_days(date(2019, 1, 1), 700, seed=1),
+            make_days(date(2020, 6, 15), 300, seed=2),
+            [],
+            make_days(date(2018, 12, 30), 20, seed=4),
+        ]
+        self.series = [ContributionSeries.from_days(days) for days in self.users]
+        self.milestones = [0, 1, 50, 500, 2500, 10 ** 6]
+
+    def test_find_milestones(self):
+        for days in self.users:
+            self.assertEqual(find_milestones(days, self.milestones), reference_milestones(days, self.milestones))
+
+    def check_milestones_batch(self):
+        batch = find_milestones_batch(self.series, self.milestones)
+        for user, days in enumerate(self.users):
+            expected = reference_milestones(days, self.milestones)
+            self.assertEqual(
+                batch["offsets"][user],
+                [(expected[m] - batch["start"]).days if m in expected else -1 for m in self.milestones],
+            )
+
+    def test_find_milestones_batch(self):
+        self.check_milestones_batch()
+
+    def test_find_milestones_batch_without_numpy(self):
+        with mock.patch.object(contribution_stats, "np", None):
+            self.check_milestones_batch()
+
+
+@unittest.skipIf(pd is None, "pandas is not installed")
+class TestRollupContributions(unittest.TestCase):
+    def setUp(self):
+        self.days = make_days(date(2017, 12, 29), 1200, seed=5)
+        self.series = ContributionSeries.from_days(self.days)
+        frame = pd.DataFrame(self.days)
+        frame["date"] = pd.to_datetime(frame["date"])
+        self.frame = frame
+
+    def check(self, rollup):
+        frame = self.frame
+        yearly = frame.groupby(frame["date"].dt.year)["contributionCount"].sum()
+        self.assertEqual(rollup["yearly"], {int(year): int(total) for year, total in yearly.items()})
+        monthly = frame.groupby(frame["date"].dt.to_period("M"))["contributionCount"].sum()
+        self.assertEqual(rollup["monthly"], {period.start_time.date(): int(total) for period, total in monthly.items()})
+        iso = frame["date"].dt.isocalendar()
+        weeks = iso["year"].astype(str) + "-W" + iso["week"].astype(str).str.zfill(2)
+        weekly = frame.groupby(weeks)["contributionCount"].sum()
+        self.assertEqual(rollup["weekly"], {week: int(total) for week, total in weekly.items()})
+        self.assertEqual(list(rollup["weekly"]), sorted(rollup["weekly"]))
+        weekday = frame.groupby(frame["date"].dt.day_name())["contributionCount"].sum()
+        self.assertEqual(rollup["weekday"], {day: int(weekday.get(day, 0)) for day in contribution_rollup.WEEKDAYS})
+        weekend = frame[frame["date"].dt.dayofweek >= 5]["contributionCount"].sum()
+        self.assertEqual(rollup["weekend"], {"Weekdays": int(frame["contributionCount"].sum() - weekend), "Weekends": int(weekend)})
+
+    def test_matches_groupby(self):
+        contribution_rollup._rollups.clear()
+        self.check(rollup_contributions(self.series))
+
+    def test_matches_groupby_without_numpy(self):
+        contribution_rollup._rollups.clear()
+        with mock.patch.object(contribution_rollup, "np", None):
+            self.check(rollup_contributions(self.series))
+
+    def test_memoized_by_content(self):
+        contribution_rollup._rollups.clear()
+        first = rollup_contributions(self.series)
+        # A separately built series with the same contents reuses the rollup
+        self.assertIs(rollup_contributions(ContributionSeries.from_days(self.days)), first)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import os
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+from utils.contribution_store import FINALIZED_LAG_DAYS, PUBLIC_SCOPE, ContributionStore, sync_contributions
+from utils.response_cache import token_fingerprint
+
+
+class FakeGitHub:
+    """
+    Answers `fetch_contribution_history` and `fetch_restricted_contributions` calls for
+    "octocat", whose own token also sees private days.
+    """
+
+    def __init__(self, created_at: date):
+        self.created_at = created_at
+        self.public = {}
+        self.private = {}
+        self.restricted = 3
+        self.calls = []
+
+    def counts(self, token: str) -> dict:
+        if token != "octocat":
+            return self.public
+        return {day: self.public.get(day, 0) + self.private.get(day, 0) for day in {*self.public, *self.private}}
+
+    def fetch_history(self, username, token, created_at, since=None):
+        self.calls.append(("history", token, since))
+        counts = self.counts(token)
+        day, days = date.fromisoformat((since or created_at)[:10]), []
+        while day <= date.today():
+            days.append({"date": day.isoformat(), "contributionCount": counts.get(day.isoformat(), 0)})
+            day += timedelta(days=1)
+        return {
+            "fetchedAt": 1.0,
+            "data": {
+                "user": {
+                    "createdAt": created_at,
+                    "contributionsCollection": {
+                        "restrictedContributionsCount": self.restricted,
+                        "contributionCalendar": {"weeks": [{"contributionDays": days}]},
+                    },
+                }
+            },
+        }
+
+    def fetch_restricted(self, username, token, created_at):
+        self.calls.append(("restricted", token))
+        return {
+            "fetchedAt": 2.0,
+            "data": {
+                "user": {"y2024": {"restrictedContributionsCount": self.restricted}},
+                "viewer": {"login": token},
+            },
+        }
+
+
+class TestSyncContributions(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = ContributionStore(os.path.join(self.directory.name, "store.sqlite3"))
+        created = date.today() - timedelta(days=60)
+        self.created_at = created.isoformat() + "T08:00:00Z"
+        self.github = FakeGitHub(created)
+        self.github.public = {(created + timedelta(days=offset)).isoformat(): offset % 4 for offset in range(61)}
+        self.github.private = {(created + timedelta(days=10)).isoformat(): 100}
+
+    def tearDown(self):
+        self.store._conn.close()
+        self.directory.cleanup()
+
+    def sync(self, token: str) -> dict:
+        self.github.calls = []
+        return sync_contributions(
+            self.store, self.github.fetch_history, self.github.fetch_restricted, "octocat", token, self.created_at
+        )
+
+    def collection(self, data: dict) -> dict:
+        return data["data"]["user"]["contributionsCollection"]
+
+    def test_first_sync_fetches_full_history(self):
+        data = self.sync("visitor")
+        self.assertEqual(self.github.calls, [("restricted", "visitor"), ("history", "visitor", None)])
+        self.assertEqual(self.collection(data)["contributionCalendar"]["totalContributions"], sum(self.github.public.values()))
+        self.assertEqual(self.collection(data)["restrictedContributionsCount"], 3)
+
+    def test_later_sync_is_incremental_and_refreshes_restricted_count(self):
+        self.sync("visitor")
+        self.github.restricted = 9
+        today = date.today().isoformat()
+        self.github.public[today] += 5
+        data = self.sync("visitor")
+        since = (date.today() - timedelta(days=2)).isoformat()
+        self.assertEqual(self.github.calls, [("history", "visitor", since)])
+        self.assertEqual(self.collection(data)["restrictedContributionsCount"], 9)
+        self.assertEqual(self.collection(data)["contributionCalendar"]["totalContributions"], sum(self.github.public.values()))
+
+    def test_new_token_syncs_the_stored_series(self):
+        self.sync("visitor")
+        self.github.restricted = 4
+        data = self.sync("another")
+        since = (date.today() - timedelta(days=FINALIZED_LAG_DAYS)).isoformat()
+        self.assertEqual(self.github.calls, [("restricted", "another"), ("history", "another", since)])
+        self.assertEqual(self.collection(data)["restrictedContributionsCount"], 4)
+        self.assertEqual(data["fetchedAt"], 1.0)
+
+    def test_new_token_catches_up_an_old_series(self):
+        self.sync("visitor")
+        # The shared series was last synced five days ago
+        stale = (date.today() - timedelta(days=5)).isoformat()
+        self.store._conn.execute("DELETE FROM days WHERE date > ?", (stale,))
+        self.store._conn.commit()
+        today = date.today().isoformat()
+        self.github.public[today] += 5
+
+        data = self.sync("another")
+        since = (date.today() - timedelta(days=5 + FINALIZED_LAG_DAYS)).isoformat()
+        self.assertEqual(self.github.calls, [("restricted", "another"), ("history", "another", since)])
+        days = self.collection(data)["contributionCalendar"]["weeks"].day_list()
+        self.assertEqual(days[-1], {"contributionCount": self.github.public[today], "date": today})
+        self.assertEqual(self.collection(data)["contributionCalendar"]["totalContributions"], sum(self.github.public.values()))
+
+    def test_own_token_days_are_not_shared(self):
+        self.sync("visitor")
+        own = self.sync("octocat")
+        self.assertEqual(self.github.calls, [("restricted", "octocat"), ("history", "octocat", None)])
+        self.assertEqual(self.store.scope("octocat", token_fingerprint("octocat")), token_fingerprint("octocat"))
+        public_total = sum(self.github.public.values())
+        self.assertEqual(self.collection(own)["contributionCalendar"]["totalContributions"], public_total + 100)
+
+        # Other tokens keep seeing only the public series
+        self.assertEqual(self.store.scope("octocat", token_fingerprint("visitor")), PUBLIC_SCOPE)
+        other = self.sync("another")
+        self.assertEqual(self.collection(other)["contributionCalendar"]["totalContributions"], public_total)
+
+    def test_errors_are_returned(self):
+        self.github.fetch_restricted = lambda *args: {"errors": "401 Unauthorized"}
+        self.assertEqual(self.sync("visitor"), {"errors": "401 Unauthorized"})
+        self.assertIsNone(self.store.last_date("octocat"))
+
+
+if __name__ == '__main__':
+    unittest.main()
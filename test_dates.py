@@ -0,0 +1,52 @@
+import random
+import unittest
+from datetime import date, datetime, timedelta
+
+from utils.dates import date_ordinal, parse_date, parse_datetime
+
+
+class TestDates(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(11)
+        self.moments = [
+            datetime(2008, 1, 1) + timedelta(seconds=rng.randrange(20 * 365 * 86400))
+            for _ in range(500)
+        ] + [datetime(2024, 2, 29, 23, 59, 59), datetime(1999, 12, 31)]
+
+    def test_parse_date_matches_strptime(self):
+        for moment in self.moments:
+            day = moment.strftime("%Y-%m-%d")
+            timestamp = moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+            self.assertEqual(parse_date(day), datetime.strptime(day, "%Y-%m-%d").date())
+            self.assertEqual(parse_date(timestamp), datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%SZ").date())
+
+    def test_parse_datetime_matches_strptime(self):
+        for moment in self.moments:
+            timestamp = moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+            self.assertEqual(parse_datetime(timestamp), datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%SZ"))
+
+    def test_date_ordinal(self):
+        for moment in self.moments:
+            day = moment.strftime("%Y-%m-%d")
+            self.assertEqual(date_ordinal(day), moment.date().toordinal())
+        self.assertEqual(date_ordinal("2024-03-01") - date_ordinal("2024-02-28"), 2)
+
+    def test_invalid_values_raise_like_strptime(self):
+        for value in ("2024-02-30", "2024-13-01", "yesterday", ""):
+            with self.assertRaises(ValueError):
+                datetime.strptime(value, "%Y-%m-%d")
+            with self.assertRaises(ValueError):
+                parse_date(value)
+        for value in ("2024-01-05", "2024-01-05T10:00:00", "2024-01-05T10:00:00+00:00", "2024-01-05 10:00:00Z", "2024-01-05T25:00:00Z"):
+            with self.assertRaises(ValueError):
+                datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ")
+            with self.assertRaises(ValueError):
+                parse_datetime(value)
+
+    def test_results_are_memoized(self):
+        self.assertIs(parse_date("2024-01-05"), parse_date("2024-01-05"))
+        self.assertEqual(parse_date("2024-01-05"), date(2024, 1, 5))
+
+
+if __name__ == '__main__':
+    unittest.main()
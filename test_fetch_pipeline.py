@@ -0,0 +1,122 @@
+import threading
+import time
+import unittest
+
+from utils.fetch_pipeline import MAX_WORKERS, fetch_concurrently, iter_pages
+from utils.process_github_data import aggregate_repositories
+
+
+def fail(message: str):
+    raise RuntimeError(message)
+
+
+class TestFetchConcurrently(unittest.TestCase):
+    def test_reports_results_and_errors_per_request(self):
+        results = fetch_concurrently({
+            "ok": (lambda value: {"data": value}, 1),
+            "error_response": (lambda: {"errors": "401 Unauthorized"},),
+            "raised": (fail, "Connection refused"),
+        })
+        self.assertTrue(results["ok"].ok)
+        self.assertEqual(results["ok"].response, {"data": 1})
+        self.assertEqual(results["error_response"].error, "401 Unauthorized")
+        self.assertEqual(results["error_response"].response, {"errors": "401 Unauthorized"})
+        self.assertIsNone(results["raised"].data)
+        self.assertEqual(results["raised"].response, {"errors": "Connection refused"})
+
+    def test_requests_run_at_the_same_time(self):
+        started = time.monotonic()
+        results = fetch_concurrently({name: (time.sleep, 0.2) for name in range(4)})
+        self.assertLess(time.monotonic() - started, 0.6)
+        self.assertTrue(all(result.elapsed >= 0.2 for result in results.values()))
+
+    def test_timeout(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        results = fetch_concurrently({"fast": (lambda: "done",), "slow": (release.wait, 5)}, timeout=0.2)
+        self.assertEqual(results["fast"].data, "done")
+        self.assertEqual(results["slow"].error, "Request timed out")
+        self.assertEqual(results["slow"].response, {"errors": "Request timed out"})
+
+    def test_nested_stages_do_not_deadlock(self):
+        # Every pool worker runs a stage of its own, which must not wait for pool workers
+        def inner(value):
+            return fetch_concurrently({"inner": (lambda: value,)})["inner"].data
+
+        results = fetch_concurrently({i: (inner, i) for i in range(MAX_WORKERS * 2)}, timeout=5)
+        self.assertEqual([results[i].data for i in range(MAX_WORKERS * 2)], list(range(MAX_WORKERS * 2)))
+
+
+class FakeRepositoryPages:
+    """
+    Serves `pages` pages of two repositories each, cursor by cursor, like `iter_repositories`.
+    """
+
+    def __init__(self, pages: int, delay: float = 0.0, fail_at: int = None):
+        self.pages = pages
+        self.delay = delay
+        self.fail_at = fail_at
+        self.cursors = []
+
+    def __call__(self, after):
+        self.cursors.append(after)
+        time.sleep(self.delay)
+        index = 0 if after is None else int(after) + 1
+        if index == self.fail_at:
+            return {"errors": "502 Server Error"}
+        language = {"name": "Python", "color": "#3572A5"} if index % 2 == 0 else {"name": "Go", "color": "#00ADD8"}
+        return {
+            "pageInfo": {"hasNextPage": index + 1 < self.pages, "endCursor": str(index)},
+            "edges": [
+                {"node": {"name": f"repo-{index}-{n}", "stargazerCount": index, "forkCount": 1, "primaryLanguage": language if n == 0 else None}}
+                for n in range(2)
+            ],
+        }
+
+
+class TestIterPages(unittest.TestCase):
+    def test_follows_cursors(self):
+        fetch_page = FakeRepositoryPages(3)
+        pages = list(iter_pages(fetch_page))
+        self.assertEqual([page["pageInfo"]["endCursor"] for page in pages], ["0", "1", "2"])
+        self.assertEqual(fetch_page.cursors, [None, "0", "1"])
+
+    def test_continues_from_first_page(self):
+        fetch_page = FakeRepositoryPages(3)
+        pages = list(iter_pages(fetch_page, first_page=fetch_page(None)))
+        self.assertEqual(len(pages), 3)
+        self.assertEqual(fetch_page.cursors, [None, "0", "1"])
+
+    def test_prefetches_the_next_page(self):
+        fetch_page = FakeRepositoryPages(4, delay=0.1)
+        started = time.monotonic()
+        for _ in iter_pages(fetch_page):
+            time.sleep(0.1)    # the caller's work on a page overlaps the next request
+        self.assertLess(time.monotonic() - started, 0.7)
+
+    def test_error_page_is_last(self):
+        fetch_page = FakeRepositoryPages(5, fail_at=2)
+        pages = list(iter_pages(fetch_page))
+        self.assertEqual(pages[-1], {"errors": "502 Server Error"})
+        self.assertEqual(len(pages), 3)
+
+
+class TestAggregateRepositories(unittest.TestCase):
+    def test_totals(self):
+        summary = aggregate_repositories(iter_pages(FakeRepositoryPages(3)))
+        self.assertEqual(summary, {
+            "languages": {"Python": {"count": 2, "color": "#3572A5"}, "Go": {"count": 1, "color": "#00ADD8"}},
+            "repositories": 6,
+            "total_stars": 2 * (0 + 1 + 2),
+            "total_forks": 6,
+            "complete": True,
+        })
+
+    def test_failed_page_marks_summary_incomplete(self):
+        summary = aggregate_repositories(iter_pages(FakeRepositoryPages(5, fail_at=2)))
+        self.assertFalse(summary["complete"])
+        self.assertEqual(summary["repositories"], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,310 @@
+import os
+import random
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from stub_server.server import StubConfig, make_server
+from utils import http_client
+from utils.http_client import GitHubClient
+from utils.queries import contribution_history_query, dashboard_query, restricted_contributions_query
+from utils.rate_limit import RateLimitScheduler, Throttled
+from utils.response_cache import ResponseCache, token_fingerprint
+from utils.singleflight import SingleFlight
+
+PUBLIC_QUERY = '{ user(login: "octocat") { createdAt } }'
+
+
+def failing_then_passing_seed(failure_rate: float) -> int:
+    # Seed whose first stub request fails and whose second one succeeds
+    for seed in range(1000):
+        rng = random.Random(seed)
+        if rng.random() < failure_rate <= rng.random():
+            return seed
+    raise AssertionError("No seed found")
+
+
+class StubServerTestCase(unittest.TestCase):
+    config = StubConfig()
+
+    def setUp(self):
+        self.server = make_server(self.config, port=0)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.client = GitHubClient(base_url=f"http://127.0.0.1:{self.server.server_port}/graphql")
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def spent(self, token: str) -> int:
+        # Requests the stub has answered for `token`
+        return self.server.RequestHandlerClass.state.spend(f"Bearer {token}", cost=0)["used"]
+
+    def use_cache(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.client.cache = ResponseCache(os.path.join(directory.name, "responses.sqlite3"))
+        self.addCleanup(self.client.cache._conn.close)
+
+
+class TestCacheScopes(StubServerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.use_cache()
+
+    def test_calendars_are_shared_across_visitors(self):
+        first = self.client.graphql(dashboard_query("octocat"), "alice")
+        self.assertEqual(self.client.graphql(dashboard_query("octocat"), "bob")["data"], first["data"])
+        self.assertEqual((self.spent("alice"), self.spent("bob")), (1, 0))
+
+    def test_users_own_token_is_not_shared(self):
+        self.client.graphql(dashboard_query("octocat"), "alice")
+        self.client.graphql(dashboard_query("octocat"), "octocat", own=True)
+        self.client.graphql(dashboard_query("octocat"), "octocat", own=True)
+        self.client.graphql(dashboard_query("octocat"), "bob")
+        self.assertEqual((self.spent("alice"), self.spent("octocat"), self.spent("bob")), (1, 1, 0))
+
+
+class TestCoalescing(StubServerTestCase):
+    config = StubConfig(latency=0.3)
+
+    def test_flights_are_shared_per_token(self):
+        threads = [
+            threading.Thread(target=self.client.graphql, args=(PUBLIC_QUERY, token))
+            for token in ("alice", "alice", "bob")
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.client.flights.stats()["executed"], 2)
+        self.assertEqual(self.client.flights.stats()["coalesced"], 1)
+        self.assertEqual((self.spent("alice"), self.spent("bob")), (1, 1))
+
+
+class TestStaleWhileRevalidate(StubServerTestCase):
+    config = StubConfig(latency=0.2)
+
+    def setUp(self):
+        super().setUp()
+        self.use_cache()
+        self.first = self.client.graphql(PUBLIC_QUERY, "token", ttl=0.2)
+        time.sleep(0.3)
+
+    def wait_for_requests(self, count: int):
+        deadline = time.monotonic() + 5
+        while self.spent("token") < count or self.client._refreshing:
+            self.assertLess(time.monotonic(), deadline, "background refresh did not finish")
+            time.sleep(0.02)
+
+    def test_stale_entries_are_served_while_refreshing(self):
+        stale = [self.client.graphql(PUBLIC_QUERY, "token", ttl=0.2) for _ in range(3)]
+        self.assertTrue(all(data["fetchedAt"] == self.first["fetchedAt"] for data in stale))
+        self.assertEqual(self.client.cache.stats()["stale_hits"], 3)
+
+        # One refresh runs for all stale hits, and later calls get its response
+        self.wait_for_requests(2)
+        self.assertEqual(self.spent("token"), 2)
+        self.assertGreater(self.client.graphql(PUBLIC_QUERY, "token", ttl=0.2)["fetchedAt"], self.first["fetchedAt"])
+
+    def test_refresh_blocks_without_staleness(self):
+        self.client.max_stale = 0
+        data = self.client.graphql(PUBLIC_QUERY, "token", ttl=0.2)
+        self.assertGreater(data["fetchedAt"], self.first["fetchedAt"])
+        self.assertEqual(self.spent("token"), 2)
+
+
+class TestRetry(StubServerTestCase):
+    config = StubConfig(failure_rate=0.5, seed=failing_then_passing_seed(0.5))
+
+    def test_retries_server_errors(self):
+        data = self.client.graphql(PUBLIC_QUERY, "token")
+        self.assertIn("data", data)
+        self.assertEqual(self.client.retries, 1)
+
+
+class TestRetryGivesUp(StubServerTestCase):
+    config = StubConfig(failure_rate=1.0)
+
+    def test_stops_after_max_attempts(self):
+        data = self.client.graphql(PUBLIC_QUERY, "token")
+        self.assertIn("502", data["errors"])
+        self.assertEqual(self.client.retries, 2)
+
+    def test_mutations_are_not_retried(self):
+        data = self.client.graphql('mutation { addStar(input: {starrableId: "1"}) { clientMutationId } }', "token")
+        self.assertIn("errors", data)
+        self.assertEqual(self.client.retries, 0)
+
+    def test_concurrent_retries_are_all_counted(self):
+        self.client.extra_load.withdraw = lambda: True
+        threads = [threading.Thread(target=self.client.graphql, args=(PUBLIC_QUERY, f"token-{n}")) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.client.retries, 16)
+
+
+class TestHedging(StubServerTestCase):
+    config = StubConfig(latency=0.3)
+
+    def setUp(self):
+        super().setUp()
+        for _ in range(20):
+            self.client.latency.record(0.01)
+
+    def test_slow_requests_are_hedged(self):
+        data = self.client.graphql(PUBLIC_QUERY, "token")
+        self.assertIn("data", data)
+        self.assertEqual(self.client.hedges, 1)
+
+    def test_hedging_can_be_disabled(self):
+        self.client.hedging = False
+        self.client.graphql(PUBLIC_QUERY, "token")
+        self.assertEqual(self.client.hedges, 0)
+
+    def test_deadline(self):
+        self.client.deadline = 0.1
+        started = time.monotonic()
+        data = self.client.graphql(PUBLIC_QUERY, "token")
+        self.assertIn("errors", data)
+        self.assertLess(time.monotonic() - started, 1.0)
+
+
+class TestHedgeDelay(StubServerTestCase):
+    config = StubConfig(latency=0.05)
+
+    def test_delay_starts_when_the_request_is_sent(self):
+        for _ in range(20):
+            self.client.latency.record(0.4)
+        # A busy pool holds the request back for longer than the hedge delay
+        executor = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        executor.submit(time.sleep, 0.6)
+        with mock.patch.object(http_client, "_hedge_executor", executor):
+            data = self.client.graphql(PUBLIC_QUERY, "token")
+        self.assertIn("data", data)
+        self.assertEqual(self.client.hedges, 0)
+
+
+class TestRateLimits(StubServerTestCase):
+    config = StubConfig(rate_limit=3)
+
+    def test_exhausted_budget_is_not_sent(self):
+        for _ in range(3):
+            self.assertIn("data", self.client.graphql(PUBLIC_QUERY, "token"))
+        # The last response reported no budget left, so the next request stays local
+        data = self.client.graphql(PUBLIC_QUERY, "token")
+        self.assertIn("rate limit exhausted", data["errors"])
+        self.assertEqual(self.client.scheduler.metrics()["rejected"], 1)
+        self.assertEqual(self.spent("token"), 3)
+
+    def test_local_throttling_is_reported_separately(self):
+        budget = self.client.scheduler._budget("token")
+        budget.bucket = -100
+        self.client.deadline = 0.5
+        data = self.client.graphql(PUBLIC_QUERY, "token")
+        self.assertIn("queued", data["errors"])
+        self.assertEqual(self.client.scheduler.metrics()["deferred"], 1)
+
+    def test_pool_tokens(self):
+        self.client.scheduler.set_pool(["alice", "bob"])
+        self.client.scheduler.update("alice", data={"data": {"rateLimit": {"remaining": 10}}})
+
+        # Public queries move to the pool token with the most budget left
+        self.assertIn("data", self.client.graphql(PUBLIC_QUERY, "alice"))
+        tokens = self.client.scheduler.metrics()["tokens"]
+        self.assertEqual(tokens[token_fingerprint("bob")]["remaining"], 2)
+
+        # Token-sensitive queries always go out with the token they were asked with
+        data = self.client.graphql(restricted_contributions_query("octocat"), "alice")
+        self.assertEqual(data["data"]["viewer"]["login"], "alice")
+
+    def test_requests_are_charged_their_last_cost(self):
+        query = contribution_history_query("octocat", [("2024-01-01", "2024-12-31")])
+        self.client.scheduler.update("token", data={"data": {"rateLimit": {"cost": 5, "remaining": 4000}}}, query=query)
+        self.client.graphql(contribution_history_query("hubot", [("2023-01-01", "2023-12-31")]), "token")
+        self.assertLess(self.client.scheduler.metrics()["tokens"][token_fingerprint("token")]["bucket"], 46)
+
+
+class TestRateLimitScheduler(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = RateLimitScheduler()
+        budget = self.scheduler._budget("token")
+        budget.reset_at = time.time() + 10
+        budget.remaining = 200    # refills 20 points a second
+
+    def test_concurrent_requests_wait_in_line(self):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.scheduler.acquire("token"))) for _ in range(60)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, ["token"] * 60)
+        metrics = self.scheduler.metrics()
+        self.assertEqual(metrics["rejected"], 0)
+        self.assertEqual(metrics["throttled"], 10)
+
+    def test_wait_past_deadline_raises(self):
+        self.scheduler._budget("token").bucket = 0
+        with self.assertRaises(Throttled):
+            self.scheduler.acquire("token", max_wait=0)
+        self.assertEqual(self.scheduler.metrics()["deferred"], 1)
+
+    def test_spent_budget_is_rejected(self):
+        self.scheduler.update("token", headers={"Retry-After": "60"})
+        self.assertIsNone(self.scheduler.acquire("token"))
+
+    def test_unparseable_retry_after_is_ignored(self):
+        self.scheduler.update("token", headers={"Retry-After": "Wed, 21 Oct 2026 07:28:00 GMT", "X-RateLimit-Remaining": "soon"})
+        self.assertEqual(self.scheduler.acquire("token"), "token")
+        self.assertEqual(self.scheduler.metrics()["tokens"][token_fingerprint("token")]["remaining"], 199)
+
+    def test_costs_are_learned_per_query_shape(self):
+        history = contribution_history_query("octocat", [("2020-01-01", "2020-12-31"), ("2021-01-01", "2021-12-31")])
+        self.scheduler.update("token", data={"data": {"rateLimit": {"cost": 7, "remaining": 150}}}, query=history)
+        same_shape = contribution_history_query("hubot", [("2022-01-01", "2022-12-31"), ("2023-01-01", "2023-06-30")])
+        self.assertEqual(self.scheduler.cost(same_shape), 7)
+        self.assertEqual(self.scheduler.cost(dashboard_query("octocat")), 1)
+
+        bucket = self.scheduler._budget("token").bucket
+        self.scheduler.acquire("token", self.scheduler.cost(same_shape))
+        self.assertAlmostEqual(self.scheduler._budget("token").bucket, bucket - 7, places=1)
+
+    def test_unshared_requests_keep_their_token(self):
+        self.scheduler.set_pool(["token", "spare"])
+        self.assertEqual(self.scheduler.acquire("token", shared=False), "token")
+        self.assertEqual(self.scheduler.acquire("token"), "spare")
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_waiters_share_the_leaders_error(self):
+        flights, errors = SingleFlight(), []
+
+        def fail():
+            time.sleep(0.2)
+            raise RuntimeError("Connection refused")
+
+        def call():
+            try:
+                flights.do("key", fail)
+            except RuntimeError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(errors), 3)
+        self.assertEqual(len({id(error) for error in errors}), 1)
+        self.assertEqual(flights.stats(), {"executed": 1, "coalesced": 2, "in_flight": 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+import unittest
+from datetime import date, timedelta
+
+from utils.process_github_data import process_contribution_data, process_language_data, process_user_data
+from utils.queries import history_windows, merge_history_data, split_dashboard_data
+
+
+def dashboard_response(fetched_at: float = 10.0) -> dict:
+    return {
+        "data": {
+            "user": {
+                "name": "The Octocat",
+                "bio": "Hello",
+                "location": "San Francisco",
+                "createdAt": "2011-01-25T18:44:36Z",
+                "avatarUrl": "https://avatars.githubusercontent.com/u/583231",
+                "followers": {"totalCount": 10},
+                "following": {"totalCount": 2},
+                "repositoryPage": {
+                    "totalCount": 3,
+                    "pageInfo": {"hasNextPage": False, "endCursor": "Y3Vyc29yOjI="},
+                    "edges": [
+                        {"node": {"name": "a", "stargazerCount": 1, "forkCount": 0, "primaryLanguage": {"name": "Python", "color": "#3572A5"}}},
+                        {"node": {"name": "b", "stargazerCount": 0, "forkCount": 2, "primaryLanguage": {"name": "Python", "color": "#3572A5"}}},
+                        {"node": {"name": "c", "stargazerCount": 5, "forkCount": 1, "primaryLanguage": None}},
+                    ],
+                },
+                "contributions": {
+                    "totalCommitContributions": 7,
+                    "totalPullRequestContributions": 2,
+                    "totalIssueContributions": 1,
+                    "contributionCalendar": {
+                        "totalContributions": 10,
+                        "weeks": [{"contributionDays": [
+                            {"contributionCount": 4, "date": "2024-01-07"},
+                            {"contributionCount": 0, "date": "2024-01-08"},
+                            {"contributionCount": 6, "date": "2024-01-09"},
+                        ]}],
+                    },
+                },
+            },
+            "rateLimit": {"cost": 1, "remaining": 4999, "resetAt": "2024-01-09T12:00:00Z"},
+        },
+        "fetchedAt": fetched_at,
+    }
+
+
+def restricted_response(count: int = 5, fetched_at: float = 20.0) -> dict:
+    return {
+        "data": {"user": {"contributions": {"restrictedContributionsCount": count}}, "viewer": {"login": "visitor"}},
+        "fetchedAt": fetched_at,
+    }
+
+
+class TestSplitDashboardData(unittest.TestCase):
+    def test_splits_into_payload_shapes(self):
+        cont_data, user_data, repo_data = split_dashboard_data(dashboard_response(), restricted_response())
+
+        contributions = process_contribution_data(cont_data)
+        self.assertEqual(contributions["public_contributions"], 10)
+        self.assertEqual(contributions["private_contributions"], 5)
+        self.assertEqual(contributions["highest_contribution"], 6)
+
+        user = process_user_data(user_data)
+        self.assertNotIn("errors", user)
+        self.assertEqual((user["followers"], user["following"], user["repositories"]), (10, 2, 3))
+        self.assertEqual((user["total_commits"], user["total_pullrequests"], user["total_issues"]), (7, 2, 1))
+
+        self.assertEqual(process_language_data(repo_data), {"Python": {"count": 2, "color": "#3572A5"}})
+        self.assertEqual(repo_data["data"]["user"]["repositories"]["pageInfo"]["endCursor"], "Y3Vyc29yOjI=")
+
+    def test_oldest_half_sets_fetched_at(self):
+        payloads = split_dashboard_data(dashboard_response(fetched_at=30.0), restricted_response(fetched_at=20.0))
+        self.assertEqual({payload["fetchedAt"] for payload in payloads}, {20.0})
+
+    def test_errors_are_returned_in_every_position(self):
+        error = {"errors": "401 Client Error: Unauthorized"}
+        self.assertEqual(split_dashboard_data(error, restricted_response()), (error, error, error))
+        self.assertEqual(split_dashboard_data(dashboard_response(), error), (error, error, error))
+
+    def test_unexpected_shape(self):
+        cont_data, user_data, repo_data = split_dashboard_data({"data": {"user": None}}, restricted_response())
+        self.assertIn("Unexpected dashboard response", cont_data["errors"])
+        self.assertIs(cont_data, repo_data)
+
+
+def count_on(day: date) -> int:
+    return day.toordinal() % 5
+
+
+def collection(from_date: str, to_date: str, calendar_from: str = None) -> dict:
+    # GitHub pads the first week of a window, so a calendar may start before `from_date`
+    day, end, weeks = date.fromisoformat(calendar_from or from_date), date.fromisoformat(to_date), []
+    while day <= end:
+        if not weeks or day.weekday() == 6:
+            weeks.append({"contributionDays": []})
+        weeks[-1]["contributionDays"].append({"contributionCount": count_on(day), "date": day.isoformat()})
+        day += timedelta(days=1)
+    total = sum(count_on(date.fromisoformat(from_date) + timedelta(days=offset))
+                for offset in range((end - date.fromisoformat(from_date)).days + 1))
+    return {
+        "totalCommitContributions": 2,
+        "totalPullRequestContributions": 1,
+        "totalIssueContributions": 0,
+        "contributionCalendar": {"totalContributions": total, "weeks": weeks},
+    }
+
+
+class TestHistoryWindows(unittest.TestCase):
+    def test_splits_at_year_boundaries(self):
+        self.assertEqual(history_windows("2019-11-20T10:00:00Z", today="2021-03-05"), [
+            ("2019-11-20", "2019-12-31"),
+            ("2020-01-01", "2020-12-31"),
+            ("2021-01-01", "2021-03-05"),
+        ])
+
+    def test_single_year(self):
+        self.assertEqual(history_windows("2024-02-29", today="2024-12-31"), [("2024-02-29", "2024-12-31")])
+        self.assertEqual(history_windows("2023-12-31", today="2024-01-01"), [
+            ("2023-12-31", "2023-12-31"),
+            ("2024-01-01", "2024-01-01"),
+        ])
+
+
+class TestMergeHistoryData(unittest.TestCase):
+    def setUp(self):
+        # Two chunks, with aliases out of order inside the first one
+        self.responses = [
+            {"data": {"user": {
+                "createdAt": "2019-11-20T10:00:00Z",
+                "y2020_01_01": collection("2020-01-01", "2020-12-31", calendar_from="2019-12-29"),
+                "y2019_11_20": collection("2019-11-20", "2019-12-31"),
+            }}, "fetchedAt": 30.0},
+            {"data": {"user": {
+                "createdAt": "2019-11-20T10:00:00Z",
+                "y2021_01_01": collection("2021-01-01", "2021-03-05", calendar_from="2020-12-27"),
+            }}, "fetchedAt": 20.0},
+        ]
+        self.restricted = {"data": {"user": {
+            "y2019_11_20": {"restrictedContributionsCount": 1},
+            "y2020_01_01": {"restrictedContributionsCount": 2},
+            "y2021_01_01": {"restrictedContributionsCount": 3},
+        }}, "fetchedAt": 40.0}
+
+    def test_merges_windows_into_one_calendar(self):
+        data = merge_history_data(self.responses, self.restricted)
+        self.assertEqual(data["fetchedAt"], 20.0)
+        user = data["data"]["user"]
+        self.assertEqual(user["createdAt"], "2019-11-20T10:00:00Z")
+        merged = user["contributionsCollection"]
+        self.assertEqual(merged["restrictedContributionsCount"], 6)
+        self.assertEqual(merged["totalCommitContributions"], 6)
+
+        days = merged["contributionCalendar"]["weeks"].day_list()
+        expected = [date(2019, 11, 20) + timedelta(days=offset) for offset in range((date(2021, 3, 5) - date(2019, 11, 20)).days + 1)]
+        self.assertEqual([day["date"] for day in days], [day.isoformat() for day in expected])
+        self.assertEqual([day["contributionCount"] for day in days], [count_on(day) for day in expected])
+        self.assertEqual(merged["contributionCalendar"]["totalContributions"], sum(map(count_on, expected)))
+
+    def test_errors(self):
+        error = {"errors": "502 Server Error"}
+        self.assertIs(merge_history_data([self.responses[0], error], self.restricted), error)
+        self.assertIs(merge_history_data(self.responses, error), error)
+        data = merge_history_data([{"data": {"user": {"y2020_01_01": {}}}}], self.restricted)
+        self.assertIn("Unexpected contribution history response", data["errors"])
+
+
+if __name__ == '__main__':
+    unittest.main()
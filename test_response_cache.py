@@ -0,0 +1,112 @@
+import os
+import random
+import tempfile
+import time
+import unittest
+
+from utils.calendar_stream import CalendarDays
+from utils.queries import (
+    batch_user_query,
+    contribution_history_query,
+    dashboard_query,
+    repository_page_query,
+    restricted_contributions_query,
+    viewer_query,
+)
+from utils.response_cache import PUBLIC_SCOPE, ResponseCache, cache_scope, token_fingerprint
+
+
+def payload(seed: int) -> dict:
+    rng = random.Random(seed)
+    return {"data": {"blob": "".join(rng.choice("0123456789abcdef") for _ in range(2000))}}
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "cache", "responses.sqlite3")
+        self.cache = ResponseCache(self.path)
+
+    def tearDown(self):
+        self.cache._conn.close()
+        self.directory.cleanup()
+
+    def test_entries_expire_after_their_ttl(self):
+        self.cache.set("key", payload(1), ttl=0.2)
+        self.assertEqual(self.cache.get("key"), payload(1))
+        time.sleep(0.3)
+        self.assertIsNone(self.cache.get("key"))
+        # Expired entries can still be served as stale for `max_stale` seconds
+        self.assertEqual(self.cache.lookup("key"), (payload(1), False))
+        self.assertIsNone(self.cache.lookup("key", max_stale=0.05))
+
+    def test_counters(self):
+        self.cache.set("key", payload(1))
+        self.cache.get("key")
+        self.cache.get("key")
+        self.cache.get("missing")
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["stale_hits"], stats["misses"]), (2, 0, 1))
+        self.assertAlmostEqual(stats["hit_rate"], 2 / 3)
+        self.assertEqual(stats["entries"], 1)
+        self.assertGreater(stats["bytes"], 0)
+
+    def test_evicts_least_recently_used(self):
+        for key in ("a", "b", "c"):
+            self.cache.set(key, payload(ord(key)))
+        sizes = dict(self.cache._conn.execute("SELECT key, size FROM responses").fetchall())
+        self.cache.max_bytes = sum(sizes.values()) + sizes["b"] // 2
+        time.sleep(0.01)
+        self.cache.get("a")
+
+        self.cache.set("d", payload(ord("d")))
+        self.assertIsNone(self.cache.get("b"))
+        for key in ("a", "c", "d"):
+            self.assertIsNotNone(self.cache.get(key))
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    def test_entries_are_shared_through_the_file(self):
+        self.cache.set("key", payload(1))
+        other = ResponseCache(self.path)
+        self.addCleanup(other._conn.close)
+        self.assertEqual(other.get("key"), payload(1))
+
+    def test_calendars_come_back_compact(self):
+        weeks = [{"contributionDays": [{"contributionCount": 3, "date": "2024-01-07"}, {"contributionCount": 0, "date": "2024-01-08"}]}]
+        self.cache.set("key", {"data": {"user": {"contributionCalendar": {"weeks": weeks}}}})
+        cached = self.cache.get("key")["data"]["user"]["contributionCalendar"]["weeks"]
+        self.assertIsInstance(cached, CalendarDays)
+        self.assertEqual(cached, weeks)
+
+    def test_key(self):
+        query = '{ user(login: "octocat") { createdAt } }'
+        self.assertEqual(ResponseCache.key(query), ResponseCache.key("{\n  user(login: \"octocat\") {\n createdAt }\n}"))
+        self.assertNotEqual(ResponseCache.key(query), ResponseCache.key(query, {"first": 10}))
+
+
+class TestCacheScope(unittest.TestCase):
+    def test_public_data_is_shared(self):
+        for query in (repository_page_query("octocat"), repository_page_query("octocat", "Y3Vyc29yOjk5")):
+            self.assertEqual(cache_scope(query, "alice"), PUBLIC_SCOPE)
+            self.assertEqual(cache_scope(query, "alice", own=True), PUBLIC_SCOPE)
+
+    def test_calendars_are_shared_except_with_the_users_own_token(self):
+        for query in (dashboard_query("octocat"), contribution_history_query("octocat", [("2024-01-01", "2024-12-31")])):
+            self.assertEqual(cache_scope(query, "alice"), PUBLIC_SCOPE)
+            self.assertEqual(cache_scope(query, "alice", own=True), token_fingerprint("alice"))
+        self.assertEqual(
+            ResponseCache.key(dashboard_query("octocat"), token="alice"),
+            ResponseCache.key(dashboard_query("octocat"), token="bob"),
+        )
+
+    def test_token_sensitive_queries_are_kept_per_token(self):
+        for query in (restricted_contributions_query("octocat"), viewer_query(), batch_user_query(["octocat"])):
+            self.assertEqual(cache_scope(query, "alice"), token_fingerprint("alice"))
+        # Repository selections that may include private repositories
+        query = '{ user(login: "octocat") { repositories(first: 100) { totalCount } } }'
+        self.assertEqual(cache_scope(query, "alice"), token_fingerprint("alice"))
+        self.assertNotEqual(ResponseCache.key(query, token="alice"), ResponseCache.key(query, token="bob"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+from unittest import mock
+
+from streamlit import session_state as sst
+
+from utils import session_store
+from utils.contribution_stats import ContributionIndex
+
+
+def history_response(counts: list) -> dict:
+    days = [{"contributionCount": count, "date": f"2024-01-{day:02d}"} for day, count in enumerate(counts, start=1)]
+    return {"data": {"user": {"contributionsCollection": {
+        "restrictedContributionsCount": 0,
+        "contributionCalendar": {"totalContributions": sum(counts), "weeks": [{"contributionDays": days}]},
+    }}}, "fetchedAt": 10.0}
+
+
+class Counter:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    def __call__(self, *args):
+        self.calls += 1
+        return self.results.pop(0) if len(self.results) > 1 else self.results[0]
+
+
+class SessionTestCase(unittest.TestCase):
+    def setUp(self):
+        # Streamlit keeps one session state per process outside a running app
+        for key in list(sst.keys()):
+            del sst[key]
+        sst.username = "octocat"
+        sst.token = "token"
+
+
+class TestCached(SessionTestCase):
+    def test_computed_once_per_session(self):
+        compute = Counter({"data": 1})
+        self.assertEqual(session_store.cached("entry", compute, "octocat"), {"data": 1})
+        self.assertEqual(session_store.cached("entry", compute, "octocat"), {"data": 1})
+        self.assertEqual(compute.calls, 1)
+
+    def test_errors_are_not_stored(self):
+        error = {"errors": "502 Server Error"}
+        compute = Counter(error, {"data": 1})
+        self.assertIs(session_store.cached("entry", compute), error)
+        self.assertEqual(session_store.cached("entry", compute), {"data": 1})
+
+        compute = Counter(({"data": 1}, error), ({"data": 1}, {"data": 2}))
+        session_store.cached("pair", compute)
+        session_store.cached("pair", compute)
+        session_store.cached("pair", compute)
+        self.assertEqual(compute.calls, 2)
+
+    def test_new_username_or_token_empties_the_store(self):
+        compute = Counter({"data": 1})
+        session_store.cached("entry", compute)
+        sst.username = "hubot"
+        session_store.cached("entry", compute)
+        sst.token = "another"
+        session_store.cached("entry", compute)
+        self.assertEqual(compute.calls, 3)
+
+        # Reruns with the same username and token keep the store
+        sst.username = "hubot"
+        session_store.cached("entry", compute)
+        self.assertEqual(compute.calls, 3)
+        self.assertEqual(session_store.session_store()["owner"][0], "hubot")
+
+
+class TestContributionHistory(SessionTestCase):
+    def test_history_is_synced_once(self):
+        sync = Counter(history_response([1, 0, 3]))
+        with mock.patch.object(session_store, "sync_contribution_history", sync):
+            history = session_store.contribution_history("2024-01-01T00:00:00Z")
+            self.assertIs(session_store.contribution_history("2024-01-01T00:00:00Z"), history)
+        self.assertEqual(sync.calls, 1)
+        self.assertTrue(history["complete"])
+        self.assertIsInstance(history["index"], ContributionIndex)
+        self.assertEqual(history["index"].total(), 4)
+
+    def test_incomplete_history_falls_back_and_is_retried(self):
+        fallback = history_response([2, 3])
+        sync = Counter({"errors": "502 Server Error"}, history_response([1, 0, 3]))
+        with mock.patch.object(session_store, "sync_contribution_history", sync):
+            history = session_store.contribution_history("2024-01-01T00:00:00Z", fallback=fallback)
+            self.assertFalse(history["complete"])
+            self.assertIs(history["data"], fallback)
+            self.assertEqual(history["index"].total(), 5)
+
+            history = session_store.contribution_history("2024-01-01T00:00:00Z", fallback=fallback)
+        self.assertTrue(history["complete"])
+        self.assertEqual(sync.calls, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import tempfile
+import threading
+import unittest
+from datetime import date
+
+import requests
+
+from stub_server.server import StubConfig, make_server
+from stub_server.synthetic import generate_account
+from utils.queries import contribution_history_query, dashboard_query, history_windows, repository_page_query
+
+
+class StubServerTestCase(unittest.TestCase):
+    def start(self, config: StubConfig) -> str:
+        server = make_server(config, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return f"http://127.0.0.1:{server.server_port}/graphql"
+
+    def post(self, url: str, query: str, token: str = "token"):
+        return requests.post(url, json={"query": query}, headers={"Authorization": f"Bearer {token}"}, timeout=10)
+
+
+class TestStubServer(StubServerTestCase):
+    def setUp(self):
+        self.config = StubConfig(years=2, repos=250)
+        self.url = self.start(self.config)
+
+    def test_answers_dashboard_query(self):
+        response = self.post(self.url, dashboard_query("octocat"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["X-RateLimit-Remaining"], str(self.config.rate_limit - 1))
+        data = response.json()
+        self.assertNotIn("errors", data)
+        user = data["data"]["user"]
+        self.assertEqual(user["repositoryPage"]["totalCount"], 250)
+        self.assertEqual(len(user["repositoryPage"]["edges"]), 100)
+        weeks = user["contributions"]["contributionCalendar"]["weeks"]
+        self.assertEqual(weeks[-1]["contributionDays"][-1]["date"], date.today().isoformat())
+        self.assertEqual(data["data"]["rateLimit"]["cost"], 1)
+
+    def test_history_windows_cover_the_account(self):
+        account = generate_account("octocat", years=2, repos=250)
+        windows = history_windows(account.created_at.isoformat())
+        user = self.post(self.url, contribution_history_query("octocat", windows)).json()["data"]["user"]
+        totals = [value["contributionCalendar"]["totalContributions"] for key, value in user.items() if key.startswith("y")]
+        self.assertEqual(len(totals), len(windows))
+        self.assertEqual(sum(totals), sum(account.counts))
+
+    def test_repository_pages(self):
+        names, after = [], None
+        while True:
+            page = self.post(self.url, repository_page_query("octocat", after)).json()["data"]["user"]["repositories"]
+            names += [edge["node"]["name"] for edge in page["edges"]]
+            if not page["pageInfo"]["hasNextPage"]:
+                break
+            after = page["pageInfo"]["endCursor"]
+        self.assertEqual(names, [f"octocat-repo-{index}" for index in range(250)])
+
+    def test_unknown_login(self):
+        data = self.post(self.url, dashboard_query("ghost-user")).json()
+        self.assertIsNone(data["data"]["user"])
+        self.assertEqual(data["errors"][0]["type"], "NOT_FOUND")
+
+
+class TestSyntheticAccounts(unittest.TestCase):
+    def test_accounts_are_deterministic(self):
+        today = date(2024, 6, 30)
+        first = generate_account("octocat", years=3, seed=1, today=today)
+        self.assertEqual(first, generate_account("octocat", years=3, seed=1, today=today))
+        self.assertNotEqual(first.counts, generate_account("octocat", years=3, seed=2, today=today).counts)
+        self.assertEqual(len(first.counts), (today - first.start).days + 1)
+
+
+class TestFaultInjection(StubServerTestCase):
+    def test_failures(self):
+        url = self.start(StubConfig(failure_rate=1.0))
+        self.assertEqual(self.post(url, dashboard_query("octocat")).status_code, 502)
+
+    def test_rate_limit(self):
+        url = self.start(StubConfig(rate_limit=2))
+        for _ in range(2):
+            self.assertEqual(self.post(url, dashboard_query("octocat")).status_code, 200)
+        response = self.post(url, dashboard_query("octocat"))
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.headers["X-RateLimit-Remaining"], "0")
+        self.assertGreater(int(response.headers["Retry-After"]), 0)
+        # Budgets are per token
+        self.assertEqual(self.post(url, dashboard_query("octocat"), token="other").status_code, 200)
+
+
+class TestRecordReplay(StubServerTestCase):
+    def test_replays_recorded_responses(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        upstream = self.start(StubConfig(years=1))
+        recorder = self.start(StubConfig(record_dir=directory.name, upstream=upstream))
+        recorded = self.post(recorder, dashboard_query("octocat")).json()
+
+        replayer = self.start(StubConfig(replay_dir=directory.name))
+        self.assertEqual(self.post(replayer, dashboard_query("octocat")).json(), recorded)
+        response = self.post(replayer, dashboard_query("hubot"))
+        self.assertEqual(response.status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
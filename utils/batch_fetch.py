@@ -0,0 +1,75 @@
+from utils.queries import batch_user_query, split_batch_data
+
+INITIAL_BATCH_SIZE = 10
+MAX_BATCH_SIZE = 50
+TARGET_BATCH_COST = 25    # GraphQL points one batch query should stay under
+
+# GraphQL error types GitHub reports when a query is too large or too costly to run.
+# Only these depend on the batch, so only these are worth retrying with a smaller one.
+QUERY_LIMIT_ERRORS = ("MAX_NODE_LIMIT_EXCEEDED", "RESOURCE_LIMITS_EXCEEDED")
+QUERY_LIMIT_MESSAGES = ("complexity", "node limit", "timeout")
+
+
+def fetch_users_in_batches(logins: list, token: str, send, batch_size: int = INITIAL_BATCH_SIZE) -> dict:
+    """
+    Fetches many users with as few queries as possible, putting a batch of users into each
+    GraphQL document.
+
+    The batch size adapts to the cost GitHub reports: it grows while queries stay under
+    `TARGET_BATCH_COST` and is halved when a query costs more. A batch rejected for its
+    size or cost is retried at half the size, and the size never grows back past one that
+    failed. A batch of one that still fails is reported per user. Any other failure, such
+    as a network, authentication or rate-limit error, would fail every batch alike, so it
+    stops the run and is reported for every user not fetched yet.
+
+    Args:
+        logins (list): GitHub usernames.
+        token (str): GitHub personal access token.
+        send (callable): `graphql(query, token)` function of the calling fetch module.
+        batch_size (int, optional): Users in the first batch.
+
+    Returns:
+        dict: Mapping of username to a payload accepted by `process_user_data` and
+        `process_contribution_data`, or to `{"errors": message}`.
+    """
+    payloads = {}
+    pending = list(dict.fromkeys(logins))
+    ceiling = MAX_BATCH_SIZE
+    while pending:
+        batch = pending[:batch_size]
+        data = send(batch_user_query(batch), token)
+        failed = "data" not in data or data["data"] is None
+        if failed and not _is_query_limit_error(data):
+            error = {"errors": data.get("errors", "Unknown error")}
+            payloads.update((login, error) for login in pending)
+            break
+
+        if failed and len(batch) > 1:
+            # Never grow back to a size that has already failed
+            ceiling = max(1, len(batch) * 3 // 4)
+            batch_size = max(1, len(batch) // 2)
+            continue
+
+        payloads.update(split_batch_data(data, batch))
+        pending = pending[len(batch):]
+
+        cost = ((data.get("data") or {}).get("rateLimit") or {}).get("cost")
+        if cost is None or cost > TARGET_BATCH_COST:
+            batch_size = max(1, batch_size // 2)
+        elif cost <= TARGET_BATCH_COST / 2:
+            batch_size = min(ceiling, batch_size * 2)
+    return payloads
+
+
+def _is_query_limit_error(data: dict) -> bool:
+    """
+    Checks whether a failed response was rejected for the size or cost of its query.
+    """
+    errors = data.get("errors")
+    if not isinstance(errors, list):
+        return False
+    return any(
+        error.get("type") in QUERY_LIMIT_ERRORS
+        or any(message in error.get("message", "").lower() for message in QUERY_LIMIT_MESSAGES)
+        for error in errors
+    )
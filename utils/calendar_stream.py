@@ -0,0 +1,274 @@
+import bisect
+import codecs
+import json
+import re
+from array import array
+from datetime import date
+
+from utils.dates import date_ordinal
+
+CHUNK_SIZE = 64 * 1024    # bytes read from the network at a time
+
+_WEEKS_START = re.compile(r'([{,]\s*)"weeks"\s*:\s*\[')
+_BRACKET = re.compile(r"[\[\]]")
+_COUNT = re.compile(r'"contributionCount"\s*:\s*(\d+)')
+_DATE = re.compile(r'"date"\s*:\s*"(\d{4}-\d\d-\d\d)"')
+_SERIES_KEY = "__series__"
+_SERIES_PLACEHOLDER = re.compile(r'\{"__series__":(\d+)\}')
+_KEEP = 32    # chars held back outside a calendar, in case `"weeks":[` spans two chunks
+
+
+class CalendarDays:
+    """
+    Compact contribution calendar: one day ordinal and one count per day, in two int32
+    arrays, instead of a dict per day.
+
+    Stands in for the `weeks` list of a `contributionCalendar`. Iterating it yields
+    `{"contributionDays": [...]}` week dicts built on demand, so code written against the
+    JSON shape keeps working, while `dates`, `counts` and `day_list` give direct access.
+    """
+
+    __slots__ = ("ordinals", "counts")
+
+    def __init__(self, ordinals: array = None, counts: array = None):
+        self.ordinals = ordinals if ordinals is not None else array("i")
+        self.counts = counts if counts is not None else array("i")
+
+    @classmethod
+    def from_weeks(cls, weeks) -> "CalendarDays":
+        """
+        Builds a calendar from a JSON `weeks` list (or returns `weeks` if already compact).
+        """
+        if isinstance(weeks, cls):
+            return weeks
+        days = cls()
+        for week in weeks:
+            for day in week["contributionDays"]:
+                days.ordinals.append(date_ordinal(day["date"]))
+                days.counts.append(day["contributionCount"])
+        return days
+
+    def extend(self, dates: list, counts: array):
+        if len(dates) != len(counts):
+            raise ValueError("Every calendar day needs both a date and a contributionCount")
+        if not dates:
+            return
+        first = date_ordinal(dates[0])
+        if date_ordinal(dates[-1]) - first == len(dates) - 1:
+            self.ordinals.extend(range(first, first + len(dates)))    # Calendars are contiguous
+        else:
+            self.ordinals.extend(map(date_ordinal, dates))
+        self.counts.extend(counts)
+
+    def __len__(self) -> int:
+        """Number of weeks, as for the JSON `weeks` list."""
+        if not self.ordinals:
+            return 0
+        if not self._contiguous():
+            return sum(1 for ordinal in self.ordinals if ordinal % 7 == 0) + (self.ordinals[0] % 7 != 0)
+        # Sundays in the span, plus the partial week before the first one
+        first, last = self.ordinals[0], self.ordinals[-1]
+        return last // 7 - (first - 1) // 7 + (first % 7 != 0)
+
+    def __bool__(self) -> bool:
+        return len(self.counts) > 0
+
+    def __iter__(self):
+        return iter(self.weeks())
+
+    def __getitem__(self, index):
+        if not self._contiguous():
+            return self.weeks()[index]
+        if isinstance(index, slice):
+            return [self[week] for week in range(*index.indices(len(self)))]
+        weeks = len(self)
+        if index < 0:
+            index += weeks
+        if not 0 <= index < weeks:
+            raise IndexError("calendar week index out of range")
+        # The first week runs up to the first Sunday; every later one is seven days long
+        first_sunday = 7 - self.ordinals[0] % 7
+        start = 0 if index == 0 else first_sunday + 7 * (index - 1)
+        end = min(first_sunday + 7 * index, len(self.counts))
+        return {
+            "contributionDays": [
+                {"contributionCount": self.counts[i], "date": date.fromordinal(self.ordinals[i]).isoformat()}
+                for i in range(start, end)
+            ]
+        }
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CalendarDays):
+            return self.ordinals == other.ordinals and self.counts == other.counts
+        return self.weeks() == other
+
+    def __repr__(self) -> str:
+        return f"CalendarDays({len(self.counts)} days)"
+
+    def _contiguous(self) -> bool:
+        return not self.ordinals or self.ordinals[-1] - self.ordinals[0] == len(self.ordinals) - 1
+
+    @property
+    def dates(self) -> list:
+        """Day dates in 'YYYY-MM-DD' format."""
+        return [date.fromordinal(ordinal).isoformat() for ordinal in self.ordinals]
+
+    def day_list(self) -> list:
+        """Days as `{"contributionCount": int, "date": str}` dicts."""
+        return [
+            {"contributionCount": count, "date": day}
+            for day, count in zip(self.dates, self.counts)
+        ]
+
+    def weeks(self) -> list:
+        """Days grouped into Sunday-to-Saturday weeks, shaped like the JSON `weeks` list."""
+        weeks = []
+        for ordinal, day in zip(self.ordinals, self.day_list()):
+            if not weeks or ordinal % 7 == 0:    # date.toordinal() % 7 == 0 on Sundays
+                weeks.append({"contributionDays": []})
+            weeks[-1]["contributionDays"].append(day)
+        return weeks
+
+    def to_json(self) -> str:
+        """
+        JSON text of the `weeks` list, written straight from the arrays.
+        """
+        weeks = []
+        for ordinal, count in zip(self.ordinals, self.counts):
+            if not weeks or ordinal % 7 == 0:
+                weeks.append([])
+            weeks[-1].append(f'{{"contributionCount":{count},"date":"{date.fromordinal(ordinal).isoformat()}"}}')
+        return "[" + ",".join('{"contributionDays":[' + ",".join(week) + "]}" for week in weeks) + "]"
+
+    def since(self, from_date: str) -> "CalendarDays":
+        """Returns the days on or after `from_date` ('YYYY-MM-DD')."""
+        keep = bisect.bisect_left(self.ordinals, date_ordinal(from_date))
+        return CalendarDays(self.ordinals[keep:], self.counts[keep:])
+
+    def merge(self, other: "CalendarDays") -> "CalendarDays":
+        """Appends the days of `other` that come after the last day of this calendar."""
+        keep = bisect.bisect_right(other.ordinals, self.ordinals[-1]) if self.ordinals else 0
+        return CalendarDays(self.ordinals + other.ordinals[keep:], self.counts + other.counts[keep:])
+
+    def total(self) -> int:
+        return sum(self.counts)
+
+
+def dumps(value) -> str:
+    """
+    Compact `json.dumps` that writes every `CalendarDays` as JSON weeks, from its arrays
+    rather than through a dict per day.
+    """
+    series = []
+
+    def placeholder(item):
+        if isinstance(item, CalendarDays):
+            series.append(item)
+            return {_SERIES_KEY: len(series) - 1}
+        raise TypeError(f"Object of type {type(item).__name__} is not JSON serializable")
+
+    text = json.dumps(value, separators=(",", ":"), default=placeholder)
+    if not series:
+        return text
+    # Placeholders inside strings have their quotes escaped, so only real ones match
+    return _SERIES_PLACEHOLDER.sub(lambda match: series[int(match.group(1))].to_json(), text)
+
+
+class CalendarDecoder:
+    """
+    Incremental JSON decoder that turns every `"weeks": [...]` array into `CalendarDays`.
+
+    Text outside the calendars is collected and decoded with `json.loads` at the end; it
+    holds only the small parts of the response. Inside a calendar, complete day objects
+    are scanned with regular expressions as chunks arrive and their dates and counts are
+    appended straight to arrays, so no dict is ever built per day.
+    """
+
+    def __init__(self):
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._skeleton = []
+        self._series = []
+        self._depth = 0
+
+    def feed(self, chunk):
+        self._buffer += self._text.decode(chunk) if isinstance(chunk, bytes) else chunk
+        while self._scan():
+            pass
+
+    def _scan(self) -> bool:
+        if self._depth == 0:
+            match = _WEEKS_START.search(self._buffer)
+            if match is None:
+                cut = max(0, len(self._buffer) - _KEEP)
+                self._skeleton.append(self._buffer[:cut])
+                self._buffer = self._buffer[cut:]
+                return False
+            self._skeleton.append(self._buffer[:match.start()])
+            self._skeleton.append(f'{match.group(1)}"weeks":{{"{_SERIES_KEY}":{len(self._series)}}}')
+            self._series.append(CalendarDays())
+            self._buffer = self._buffer[match.end():]
+            self._depth = 1
+            return True
+
+        depth = self._depth
+        for bracket in _BRACKET.finditer(self._buffer):
+            depth += 1 if bracket.group() == "[" else -1
+            if depth == 0:
+                self._add_days(self._buffer[:bracket.start()])
+                self._buffer = self._buffer[bracket.end():]
+                self._depth = 0
+                return True
+
+        # Consume up to the last complete object and keep the rest for the next chunk
+        cut = self._buffer.rfind("}") + 1
+        self._add_days(self._buffer[:cut])
+        self._depth += self._buffer.count("[", 0, cut) - self._buffer.count("]", 0, cut)
+        self._buffer = self._buffer[cut:]
+        return False
+
+    def _add_days(self, text: str):
+        self._series[-1].extend(_DATE.findall(text), array("i", map(int, _COUNT.findall(text))))
+
+    def close(self) -> dict:
+        """
+        Finishes decoding and returns the response, with `CalendarDays` in place of `weeks`.
+
+        Raises:
+            ValueError: If the input was not complete, valid JSON.
+        """
+        self.feed(self._text.decode(b"", final=True))
+        if self._depth:
+            raise ValueError("Response ended inside a contribution calendar")
+        self._skeleton.append(self._buffer)
+        return _attach(json.loads("".join(self._skeleton)), self._series)
+
+
+def _attach(value, series: list):
+    if isinstance(value, dict):
+        if _SERIES_KEY in value and len(value) == 1:
+            return series[value[_SERIES_KEY]]
+        return {key: _attach(item, series) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_attach(item, series) for item in value]
+    return value
+
+
+def decode_response(chunks) -> dict:
+    """
+    Decodes a JSON response from an iterable of byte or text chunks, storing contribution
+    calendars as `CalendarDays`.
+
+    Args:
+        chunks (iterable): Pieces of the response body, e.g. `response.iter_content()`.
+
+    Returns:
+        dict: Decoded response.
+
+    Raises:
+        ValueError: If the body is not valid JSON.
+    """
+    decoder = CalendarDecoder()
+    for chunk in chunks:
+        decoder.feed(chunk)
+    return decoder.close()
@@ -0,0 +1,108 @@
+import hashlib
+from collections import OrderedDict
+from datetime import date, timedelta
+from threading import Lock
+
+from utils.contribution_series import ContributionSeries, np
+
+ROLLUP_CACHE_SIZE = 32
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+_rollups = OrderedDict()
+_rollups_lock = Lock()
+
+
+def content_hash(series: ContributionSeries) -> str:
+    """Digest of the start date and raw counts of a series, identifying its contents."""
+    hasher = hashlib.blake2b(series.start.isoformat().encode(), digest_size=16)
+    hasher.update(series.counts)
+    return hasher.hexdigest()
+
+
+def rollup_contributions(days) -> dict:
+    """
+    Aggregates daily contributions into every grouping the dashboard charts show.
+
+    The result is memoized by the content hash of the series, so reruns over the same
+    history, such as every widget interaction, reuse it instead of grouping again.
+
+    Args:
+        days (ContributionSeries | list): Contribution series, day dicts or calendar weeks.
+
+    Returns:
+        dict: Totals in date order, ready to chart:
+        - `yearly`: year (int) to total.
+        - `monthly`: first day of each month (`date`) to total.
+        - `weekly`: ISO week ('YYYY-Www') to total.
+        - `weekday`: weekday name, Monday first, to total.
+        - `weekend`: `Weekdays` and `Weekends` totals.
+    """
+    series = ContributionSeries.coerce(days)
+    key = content_hash(series)
+    with _rollups_lock:
+        if key in _rollups:
+            _rollups.move_to_end(key)
+            return _rollups[key]
+
+    rollup = _rollup_numpy(series) if np is not None else _rollup_python(series)
+
+    with _rollups_lock:
+        _rollups[key] = rollup
+        while len(_rollups) > ROLLUP_CACHE_SIZE:
+            _rollups.popitem(last=False)
+    return rollup
+
+
+def _rollup_numpy(series: ContributionSeries) -> dict:
+    if not series:
+        return _rollup_python(series)
+    counts = np.asarray(series.counts, dtype=np.int64)
+    dates = series.date_index()
+
+    def totals(bins):
+        first = int(bins[0])
+        return first, np.bincount(bins - first, weights=counts).astype(np.int64).tolist()
+
+    first_year, yearly = totals(dates.astype("datetime64[Y]").astype(np.int64))
+    first_month, monthly = totals(dates.astype("datetime64[M]").astype(np.int64))
+    # Weeks counted from the Monday of date.min (ordinal 1) keep ISO weeks in one bin
+    ordinals = np.arange(series.start.toordinal(), series.start.toordinal() + len(series))
+    first_week, weekly = totals((ordinals - 1) // 7)
+    weekday = np.bincount((ordinals - 1) % 7, weights=counts, minlength=7).astype(np.int64).tolist()
+
+    return {
+        "yearly": {1970 + first_year + offset: total for offset, total in enumerate(yearly)},
+        "monthly": {
+            date(1970 + (first_month + offset) // 12, (first_month + offset) % 12 + 1, 1): total
+            for offset, total in enumerate(monthly)
+        },
+        "weekly": {_iso_week(first_week + offset): total for offset, total in enumerate(weekly)},
+        "weekday": dict(zip(WEEKDAYS, weekday)),
+        "weekend": {"Weekdays": sum(weekday[:5]), "Weekends": sum(weekday[5:])},
+    }
+
+
+def _rollup_python(series: ContributionSeries) -> dict:
+    yearly, monthly, weekly = {}, {}, {}
+    weekday = [0] * 7
+    for day, count in series.items():
+        yearly[day.year] = yearly.get(day.year, 0) + count
+        month = day.replace(day=1)
+        monthly[month] = monthly.get(month, 0) + count
+        week = _iso_week((day.toordinal() - 1) // 7)
+        weekly[week] = weekly.get(week, 0) + count
+        weekday[day.weekday()] += count
+
+    return {
+        "yearly": yearly,
+        "monthly": monthly,
+        "weekly": weekly,
+        "weekday": dict(zip(WEEKDAYS, weekday)),
+        "weekend": {"Weekdays": sum(weekday[:5]), "Weekends": sum(weekday[5:])},
+    }
+
+
+def _iso_week(week: int) -> str:
+    """ISO 'YYYY-Www' label of the `week`-th Monday-to-Sunday week since date.min."""
+    year, number, _ = (date.fromordinal(week * 7 + 1) + timedelta(days=3)).isocalendar()
+    return f"{year}-W{number:02d}"
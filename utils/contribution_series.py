@@ -0,0 +1,196 @@
+from array import array
+from datetime import date, datetime, timedelta
+
+from utils.calendar_stream import CalendarDays
+from utils.dates import date_ordinal, parse_date
+
+try:  # NumPy ships with pandas; the stdlib array is only a fallback
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _counts(values=()):
+    if np is not None:
+        return np.asarray(values, dtype=np.int32)
+    return memoryview(array("i", values))
+
+
+def _zeros(length: int):
+    if np is not None:
+        return np.zeros(length, dtype=np.int32)
+    return memoryview(array("i", bytes(4 * length)))
+
+
+def _to_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return parse_date(value)
+
+
+class ContributionSeries:
+    """
+    Daily contribution counts as one contiguous int32 array starting at `start`.
+
+    The date of each count is implied by its offset, so a day costs 4 bytes instead of a
+    `{"date": str, "contributionCount": int}` dict. Counts are a NumPy array, or a
+    `memoryview` over an `array("i")` when NumPy is not installed; slices such as `year()`
+    and `month()` are views sharing the same memory.
+
+    Args:
+        start (date): Date of the first count.
+        counts: int32 counts, one per day.
+    """
+
+    __slots__ = ("start", "counts")
+
+    def __init__(self, start: date = None, counts=None):
+        self.start = _to_date(start) if start else date.today()
+        self.counts = _counts() if counts is None else counts
+
+    @classmethod
+    def from_days(cls, days: list) -> "ContributionSeries":
+        """
+        Builds a series from `{"date": str, "contributionCount": int}` dicts. Missing days
+        are filled with zeros.
+        """
+        if not days:
+            return cls()
+        ordinals = [date_ordinal(day["date"]) for day in days]
+        first = min(ordinals)
+        counts = _zeros(max(ordinals) - first + 1)
+        for ordinal, day in zip(ordinals, days):
+            counts[ordinal - first] = day.get("contributionCount", 0)
+        return cls(date.fromordinal(first), counts)
+
+    @classmethod
+    def from_calendar(cls, weeks) -> "ContributionSeries":
+        """
+        Builds a series from the `weeks` of a `contributionCalendar`, either the JSON list
+        or `CalendarDays`. Contiguous `CalendarDays` counts are shared, not copied.
+        """
+        calendar = CalendarDays.from_weeks(weeks)
+        ordinals = calendar.ordinals
+        if not ordinals:
+            return cls()
+        first = ordinals[0]
+        if ordinals[-1] - first != len(ordinals) - 1:
+            return cls.from_days(calendar.day_list())
+        if np is not None:
+            counts = np.frombuffer(calendar.counts, dtype=np.int32)
+        else:
+            counts = memoryview(calendar.counts)
+        return cls(date.fromordinal(first), counts)
+
+    @classmethod
+    def from_response(cls, data: dict) -> "ContributionSeries":
+        """
+        Builds a series from a contribution response, as returned by `fetch_data_for_duration`.
+
+        Raises:
+            KeyError, TypeError: If `data` is not a contribution response.
+        """
+        return cls.from_calendar(data["data"]["user"]["contributionsCollection"]["contributionCalendar"]["weeks"])
+
+    @classmethod
+    def coerce(cls, value) -> "ContributionSeries":
+        """
+        Accepts a series, a list of day dicts, or calendar weeks, and returns a series.
+        """
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, CalendarDays):
+            return cls.from_calendar(value)
+        value = list(value)
+        if value and "contributionDays" in value[0]:
+            return cls.from_calendar(value)
+        return cls.from_days(value)
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def __bool__(self) -> bool:
+        return len(self.counts) > 0
+
+    def __repr__(self) -> str:
+        return f"ContributionSeries({self.start.isoformat()}, {len(self)} days)"
+
+    def __getstate__(self):
+        return self.start, array("i", self.counts)
+
+    def __setstate__(self, state):
+        self.start, counts = state
+        self.counts = _counts(counts) if np is not None else memoryview(counts)
+
+    @property
+    def end(self) -> date:
+        """Date of the last count."""
+        return self.start + timedelta(days=len(self) - 1)
+
+    def date_at(self, index: int) -> date:
+        return self.start + timedelta(days=index)
+
+    def index(self, day) -> int:
+        """Offset of `day` (date or 'YYYY-MM-DD'), which may fall outside the series."""
+        return _to_date(day).toordinal() - self.start.toordinal()
+
+    def count_on(self, day) -> int:
+        """Contributions on `day`, or 0 if it falls outside the series."""
+        offset = self.index(day)
+        return int(self.counts[offset]) if 0 <= offset < len(self) else 0
+
+    def dates(self) -> list:
+        """Dates of every count, as `date` objects."""
+        return [self.start + timedelta(days=offset) for offset in range(len(self))]
+
+    def date_index(self):
+        """Dates of every count as a NumPy `datetime64[D]` array, or a list of `date`s without NumPy."""
+        if np is None:
+            return self.dates()
+        start = np.datetime64(self.start, "D")
+        return np.arange(start, start + np.timedelta64(len(self), "D"))
+
+    def bounds(self, from_date=None, to_date=None) -> tuple:
+        """
+        Returns the `(first, last)` offsets, end exclusive, of the days from `from_date` to
+        `to_date`, both inclusive and either may be omitted, clipped to the series.
+        """
+        first = 0 if from_date is None else min(max(0, self.index(from_date)), len(self))
+        last = len(self) if to_date is None else min(max(first, self.index(to_date) + 1), len(self))
+        return first, last
+
+    def between(self, from_date=None, to_date=None) -> "ContributionSeries":
+        """
+        Returns a view of the days from `from_date` to `to_date`, both inclusive and either
+        may be omitted. The counts are shared with this series.
+        """
+        first, last = self.bounds(from_date, to_date)
+        return ContributionSeries(self.date_at(first), self.counts[first:last])
+
+    def year(self, year: int) -> "ContributionSeries":
+        """Returns a view of the days in `year`."""
+        return self.between(date(year, 1, 1), date(year, 12, 31))
+
+    def month(self, year: int, month: int) -> "ContributionSeries":
+        """Returns a view of the days in `month` of `year`."""
+        next_month = date(year + month // 12, month % 12 + 1, 1)
+        return self.between(date(year, month, 1), next_month - timedelta(days=1))
+
+    def total(self) -> int:
+        return int(sum(self.counts)) if np is None else int(self.counts.sum(dtype=np.int64))
+
+    def active_days(self) -> int:
+        if np is None:
+            return sum(1 for count in self.counts if count > 0)
+        return int(np.count_nonzero(self.counts))
+
+    def items(self):
+        """Yields `(date, count)` pairs."""
+        for offset, count in enumerate(self.counts):
+            yield self.start + timedelta(days=offset), int(count)
+
+    def to_days(self) -> list:
+        """Returns the days as `{"contributionCount": int, "date": str}` dicts, as in the API response."""
+        return [{"contributionCount": count, "date": day.isoformat()} for day, count in self.items()]
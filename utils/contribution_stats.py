@@ -0,0 +1,431 @@
+from dataclasses import dataclass
+from bisect import bisect_left
+from datetime import date
+from itertools import accumulate
+
+from utils.contribution_series import ContributionSeries, np
+
+
+@dataclass
+class Streak:
+    """
+    A run of consecutive days with contributions. `end` is the last day of the run.
+    """
+    start: date
+    end: date
+    length: int
+    total: int
+
+
+def summarize_contributions(days, windows: dict = None, today: date = None) -> dict:
+    """
+    Computes every per-calendar statistic the pages show in one pass over the counts.
+
+    Replaces separate calls to `get_highest_contribution`, `get_streaks`, `get_active_days`
+    and `get_todays_commits`, and the sums in `analyze_contributions`, and returns the
+    same values. With NumPy the pass is a handful of vectorized operations sharing one
+    nonzero mask and one cumulative sum; without it, a single Python loop.
+
+    Args:
+        days (ContributionSeries | list): Contribution series, day dicts or calendar weeks.
+        windows (dict, optional): Name to `(from_date, to_date)` ranges, inclusive, to total
+            separately. Either end may be None.
+        today (date, optional): Date used for today's count and the current streak.
+
+    Returns:
+        dict: `total`, `days`, `active_days`, `highest`, `highest_date` ('YYYY-MM-DD' or
+        None), `current_streak`, `longest_streak`, `today`, and `windows` mapping each
+        window name to its `total`, `days` and `active_days`.
+    """
+    series = ContributionSeries.coerce(days)
+    today = today or date.today()
+    windows = windows or {}
+    bounds = {name: series.bounds(*window) for name, window in windows.items()}
+    kernel = _summarize_numpy if np is not None else _summarize_python
+    stats = kernel(series, bounds)
+
+    last_active = stats.pop("last_active")
+    if last_active is not None and (today - series.date_at(last_active)).days > 1:
+        stats["current_streak"] = 0
+    highest_offset = stats.pop("highest_offset")
+    stats["highest_date"] = series.date_at(highest_offset).isoformat() if highest_offset is not None else None
+    stats["today"] = series.count_on(today)
+    stats["days"] = len(series)
+    return stats
+
+
+def _summarize_numpy(series: ContributionSeries, bounds: dict) -> dict:
+    counts = np.asarray(series.counts)
+    if not len(counts):
+        return _empty(bounds)
+
+    active = counts > 0
+    totals = np.cumsum(counts, dtype=np.int64)
+    active_totals = np.cumsum(active, dtype=np.int64) if bounds else None
+    starts, ends = _runs_numpy(active)
+    lengths = ends - starts
+
+    highest_offset = int(counts.argmax())
+
+    def window_sum(cumulative, first, last):
+        if last <= first:
+            return 0
+        return int(cumulative[last - 1] - (cumulative[first - 1] if first else 0))
+
+    return {
+        "total": int(totals[-1]),
+        "active_days": int(lengths.sum()),
+        "highest": int(counts[highest_offset]),
+        "highest_offset": highest_offset,
+        "current_streak": int(lengths[-1]) if lengths.size else 0,
+        "longest_streak": int(lengths.max()) if lengths.size else 0,
+        "last_active": int(ends[-1] - 1) if ends.size else None,
+        "windows": {
+            name: {
+                "total": window_sum(totals, first, last),
+                "days": last - first,
+                "active_days": window_sum(active_totals, first, last),
+            }
+            for name, (first, last) in bounds.items()
+        },
+    }
+
+
+def _summarize_python(series: ContributionSeries, bounds: dict) -> dict:
+    if not len(series):
+        return _empty(bounds)
+
+    # Running (total, active days) are recorded at every window edge during the pass
+    marks = {}
+    for first, last in bounds.values():
+        marks[first] = marks[last] = None
+
+    total = active_days = 0
+    highest = -1
+    highest_offset = last_active = None
+    run = current_streak = longest_streak = 0
+    for offset, count in enumerate(series.counts):
+        if offset in marks:
+            marks[offset] = (total, active_days)
+        total += count
+        if count > highest:
+            highest, highest_offset = count, offset
+        if count > 0:
+            active_days += 1
+            run += 1
+            current_streak = run
+            longest_streak = max(longest_streak, run)
+            last_active = offset
+        else:
+            run = 0
+    if len(series) in marks:
+        marks[len(series)] = (total, active_days)
+
+    return {
+        "total": total,
+        "active_days": active_days,
+        "highest": highest,
+        "highest_offset": highest_offset,
+        "current_streak": current_streak,
+        "longest_streak": longest_streak,
+        "last_active": last_active,
+        "windows": {
+            name: {
+                "total": marks[last][0] - marks[first][0],
+                "days": last - first,
+                "active_days": marks[last][1] - marks[first][1],
+            }
+            for name, (first, last) in bounds.items()
+        },
+    }
+
+
+def _empty(bounds: dict) -> dict:
+    return {
+        "total": 0,
+        "active_days": 0,
+        "highest": 0,
+        "highest_offset": None,
+        "current_streak": 0,
+        "longest_streak": 0,
+        "last_active": None,
+        "windows": {name: {"total": 0, "days": 0, "active_days": 0} for name in bounds},
+    }
+
+
+class ContributionIndex:
+    """
+    Prefix sums of daily contributions and of active days over a `ContributionSeries`.
+
+    The total, active days and rate of any `[from_date, to_date]` range then take two
+    lookups each, so year-over-year, month-over-month and custom ranges are answered from
+    the history already held instead of fetching the window again.
+
+    Args:
+        days (ContributionSeries | list): Contribution series, day dicts or calendar weeks.
+    """
+
+    def __init__(self, days):
+        self.series = ContributionSeries.coerce(days)
+        if np is not None:
+            counts = np.asarray(self.series.counts)
+            self.totals = np.concatenate(([0], np.cumsum(counts, dtype=np.int64)))
+            self.active = np.concatenate(([0], np.cumsum(counts > 0, dtype=np.int64)))
+        else:
+            self.totals = list(accumulate(self.series.counts, initial=0))
+            self.active = list(accumulate((count > 0 for count in self.series.counts), initial=0))
+
+    def covers(self, from_date, to_date=None) -> bool:
+        """
+        Returns True if the series holds every day of the range that has happened. Days
+        after the end of the series are treated as not yet contributed, as in the API.
+        """
+        return bool(self.series) and self.series.index(from_date) >= 0 and (
+            to_date is None or self.series.index(to_date) >= self.series.index(from_date)
+        )
+
+    def total(self, from_date=None, to_date=None) -> int:
+        first, last = self.series.bounds(from_date, to_date)
+        return int(self.totals[last] - self.totals[first])
+
+    def active_days(self, from_date=None, to_date=None) -> int:
+        first, last = self.series.bounds(from_date, to_date)
+        return int(self.active[last] - self.active[first])
+
+    def range_stats(self, from_date=None, to_date=None) -> dict:
+        """
+        Returns the stats of `analyze_contributions` for the days from `from_date` to
+        `to_date`, both inclusive.
+
+        Returns:
+            dict: `total_contributions`, `total_days`, `active_days` and
+            `contribution_rate`, or `{"errors": message}` if the range holds no days.
+        """
+        first, last = self.series.bounds(from_date, to_date)
+        if last <= first:
+            return {"errors": "No contribution days in range"}
+        total_contributions = int(self.totals[last] - self.totals[first])
+        return {
+            "total_contributions": total_contributions,
+            "total_days": last - first,
+            "active_days": int(self.active[last] - self.active[first]),
+            "contribution_rate": round(total_contributions / (last - first), 2),
+        }
+
+
+def _runs_numpy(active):
+    """Start and end (exclusive) offsets of the runs of True in a 1-D mask."""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], active.view(np.int8), [0]))))
+    return edges[0::2], edges[1::2]
+
+
+def _runs_python(counts) -> list:
+    runs = []
+    start = None
+    for offset, count in enumerate(counts):
+        if count > 0 and start is None:
+            start = offset
+        elif count <= 0 and start is not None:
+            runs.append((start, offset))
+            start = None
+    if start is not None:
+        runs.append((start, len(counts)))
+    return runs
+
+
+def find_streaks(days, today: date = None) -> dict:
+    """
+    Finds every streak of consecutive active days by run-length encoding the nonzero mask
+    of the counts.
+
+    Args:
+        days (ContributionSeries | list): Contribution series, day dicts or calendar weeks.
+        today (date, optional): Date the current streak is measured against.
+
+    Returns:
+        dict: `current` and `longest` streak lengths, as returned by `get_streaks`, and
+        `streaks`, every `Streak` in date order.
+    """
+    series = ContributionSeries.coerce(days)
+    today = today or date.today()
+    if np is not None:
+        counts = np.asarray(series.counts)
+        starts, ends = _runs_numpy(counts > 0)
+        totals = np.concatenate(([0], np.cumsum(counts, dtype=np.int64)))
+        runs = zip(starts.tolist(), ends.tolist(), (totals[ends] - totals[starts]).tolist())
+    else:
+        runs = ((start, end, sum(series.counts[start:end])) for start, end in _runs_python(series.counts))
+
+    streaks = [
+        Streak(series.date_at(start), series.date_at(end - 1), end - start, int(total))
+        for start, end, total in runs
+    ]
+    current = 0
+    if streaks and (today - streaks[-1].end).days <= 1:
+        current = streaks[-1].length
+    return {
+        "current": current,
+        "longest": max((streak.length for streak in streaks), default=0),
+        "streaks": streaks,
+    }
+
+
+def find_streaks_batch(series_list: list, today: date = None) -> dict:
+    """
+    Finds the streaks of many users at once.
+
+    The series are aligned on a shared date axis into one users x days matrix, and runs
+    are found for every row with a single set of vectorized operations.
+
+    Args:
+        series_list (list): One `ContributionSeries` per user.
+        today (date, optional): Date the current streaks are measured against.
+
+    Returns:
+        dict: `start`, the date of column 0; `current` and `longest`, one length per user;
+        and `runs`, parallel lists `user`, `start`, `end` (exclusive column offsets),
+        `length` and `total` describing every streak, ordered by user then date.
+    """
+    today = today or date.today()
+    series_list = [ContributionSeries.coerce(series) for series in series_list]
+    non_empty = [series for series in series_list if series]
+    if np is None or not non_empty:
+        return _find_streaks_batch_python(series_list, today)
+
+    first = min(series.start for series in non_empty)
+    width = (max(series.end for series in non_empty) - first).days + 1
+    matrix = np.zeros((len(series_list), width), dtype=np.int32)
+    for row, series in enumerate(series_list):
+        offset = series.start.toordinal() - first.toordinal()
+        matrix[row, offset:offset + len(series)] = series.counts
+
+    padded = np.zeros((len(series_list), width + 2), dtype=np.int8)
+    padded[:, 1:-1] = matrix > 0
+    edges = np.diff(padded, axis=1)
+    users, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    lengths = ends - starts
+    totals = np.concatenate((np.zeros((len(series_list), 1), dtype=np.int64), np.cumsum(matrix, axis=1, dtype=np.int64)), axis=1)
+    run_totals = totals[users, ends] - totals[users, starts]
+
+    longest = np.zeros(len(series_list), dtype=np.int64)
+    np.maximum.at(longest, users, lengths)
+    current = np.zeros(len(series_list), dtype=np.int64)
+    if users.size:
+        last = np.flatnonzero(np.diff(np.append(users, -1)) != 0)    # Last run of each user
+        today_offset = today.toordinal() - first.toordinal()
+        recent = today_offset - (ends[last] - 1) <= 1
+        current[users[last]] = np.where(recent, lengths[last], 0)
+
+    return {
+        "start": first,
+        "current": current.tolist(),
+        "longest": longest.tolist(),
+        "runs": {
+            "user": users.tolist(),
+            "start": starts.tolist(),
+            "end": ends.tolist(),
+            "length": lengths.tolist(),
+            "total": run_totals.tolist(),
+        },
+    }
+
+
+def _find_streaks_batch_python(series_list: list, today: date) -> dict:
+    non_empty = [series for series in series_list if series]
+    first = min((series.start for series in non_empty), default=today)
+    result = {"start": first, "current": [], "longest": [], "runs": {key: [] for key in ("user", "start", "end", "length", "total")}}
+    for user, series in enumerate(series_list):
+        streaks = find_streaks(series, today)
+        result["current"].append(streaks["current"])
+        result["longest"].append(streaks["longest"])
+        for streak in streaks["streaks"]:
+            offset = streak.start.toordinal() - first.toordinal()
+            result["runs"]["user"].append(user)
+            result["runs"]["start"].append(offset)
+            result["runs"]["end"].append(offset + streak.length)
+            result["runs"]["length"].append(streak.length)
+            result["runs"]["total"].append(streak.total)
+    return result
+
+
+def find_milestones(days, milestones) -> dict:
+    """
+    Finds the day each cumulative contribution milestone was reached, with one cumulative
+    sum and a binary search per milestone, vectorized with NumPy.
+
+    Args:
+        days (ContributionSeries | list): Contribution series, day dicts or calendar weeks.
+        milestones (list): Cumulative contribution targets, in any order.
+
+    Returns:
+        dict: Milestone to the `date` it was reached, for every milestone reached within the
+        series.
+    """
+    series = ContributionSeries.coerce(days)
+    milestones = list(milestones)
+    if not series or not milestones:
+        return {}
+
+    if np is not None:
+        totals = np.cumsum(series.counts, dtype=np.int64)
+        # A milestone is reached on a day with contributions, so targets below 1 wait for the first one
+        offsets = np.searchsorted(totals, np.maximum(np.asarray(milestones, dtype=np.int64), 1)).tolist()
+    else:
+        totals = list(accumulate(series.counts))
+        offsets = [bisect_left(totals, max(milestone, 1)) for milestone in milestones]
+
+    return {
+        milestone: series.date_at(offset)
+        for milestone, offset in zip(milestones, offsets)
+        if offset < len(series)
+    }
+
+
+def find_milestones_batch(series_list: list, milestones) -> dict:
+    """
+    Finds the day each milestone was reached for many users at once.
+
+    The series are aligned on a shared date axis and cumulated into one users x days matrix.
+    Each row is shifted above the one before it, so one binary search over the flattened
+    matrix answers every user and milestone.
+
+    Args:
+        series_list (list): One `ContributionSeries` per user.
+        milestones (list): Cumulative contribution targets, in any order.
+
+    Returns:
+        dict: `start`, the date of column 0, and `offsets`, one list per user holding the
+        column offset each milestone was reached on, or -1 if it was not reached.
+    """
+    series_list = [ContributionSeries.coerce(series) for series in series_list]
+    milestones = list(milestones)
+    non_empty = [series for series in series_list if series]
+    if np is None or not non_empty:
+        first = min((series.start for series in non_empty), default=date.today())
+        return {
+            "start": first,
+            "offsets": [
+                [
+                    (reached[milestone] - first).days if milestone in reached else -1
+                    for milestone in milestones
+                ]
+                for reached in (find_milestones(series, milestones) for series in series_list)
+            ],
+        }
+
+    first = min(series.start for series in non_empty)
+    width = (max(series.end for series in non_empty) - first).days + 1
+    matrix = np.zeros((len(series_list), width), dtype=np.int32)
+    for row, series in enumerate(series_list):
+        offset = series.start.toordinal() - first.toordinal()
+        matrix[row, offset:offset + len(series)] = series.counts
+    totals = np.cumsum(matrix, axis=1, dtype=np.int64)
+
+    targets = np.maximum(np.asarray(milestones, dtype=np.int64), 1)
+    shift = max(int(totals[:, -1].max()), int(targets.max(initial=0))) + 1
+    rows = np.arange(len(series_list), dtype=np.int64)[:, None] * shift
+    found = np.searchsorted((totals + rows).ravel(), (targets[None, :] + rows).ravel())
+    offsets = found.reshape(len(series_list), len(milestones)) - np.arange(len(series_list))[:, None] * width
+    offsets[offsets >= width] = -1
+    return {"start": first, "offsets": offsets.tolist()}
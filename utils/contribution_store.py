@@ -0,0 +1,265 @@
+import os
+import sqlite3
+import threading
+from array import array
+from datetime import datetime, timedelta
+
+from utils.calendar_stream import CalendarDays
+from utils.dates import parse_date
+from utils.queries import restricted_total, viewer_login
+from utils.response_cache import token_fingerprint
+
+STORE_PATH = os.environ.get("GITHUB_ANALYTICS_STORE", ".cache/contributions.sqlite3")
+
+# Days this close to today can still change (late pushes, time zones), so they are
+# re-fetched on every sync. Older days are treated as final.
+FINALIZED_LAG_DAYS = 2
+
+# Scope of the day series every token sees. A user's own token also sees private days,
+# so its series is kept under the token fingerprint instead.
+PUBLIC_SCOPE = "public"
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+class ContributionStore:
+    """
+    Local SQLite copy of each user's daily contribution series.
+
+    Keeping the series lets a refresh fetch only the days since the last finalized date
+    instead of the whole calendar. The public day series is shared by every token, while
+    private contribution counts, and the series seen by the user's own token, are stored
+    per token fingerprint.
+    """
+
+    def __init__(self, path: str = STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Stores written before series were scoped mixed private days into the shared one
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(days)")}
+        if columns and "scope" not in columns:
+            self._conn.executescript("DROP TABLE days; DROP TABLE IF EXISTS restricted;")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS days (
+                login TEXT NOT NULL,
+                scope TEXT NOT NULL,
+                date TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (login, scope, date)
+            );
+            CREATE TABLE IF NOT EXISTS users (
+                login TEXT PRIMARY KEY,
+                created_at TEXT,
+                synced_at TEXT
+            );
+            CREATE TABLE IF NOT EXISTS restricted (
+                login TEXT NOT NULL,
+                token_id TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                own INTEGER NOT NULL,
+                PRIMARY KEY (login, token_id)
+            );
+        """)
+        self._conn.commit()
+
+    def last_date(self, login: str, scope: str = PUBLIC_SCOPE):
+        """
+        Returns the latest stored date for `login` in 'YYYY-MM-DD' format, or None.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MAX(date) FROM days WHERE login = ? AND scope = ?", (login.lower(), scope)
+            ).fetchone()
+        return row[0]
+
+    def upsert(self, login: str, days: list, scope: str = PUBLIC_SCOPE) -> int:
+        """
+        Merges fetched days into the stored series, writing only days whose count changed.
+
+        Args:
+            login (str): GitHub username.
+            days (list): `{"date": str, "contributionCount": int}` dicts.
+            scope (str, optional): `PUBLIC_SCOPE`, or the fingerprint of the user's own token.
+
+        Returns:
+            int: Number of days inserted or updated.
+        """
+        login = login.lower()
+        with self._lock:
+            stored = dict(self._conn.execute(
+                "SELECT date, count FROM days WHERE login = ? AND scope = ? AND date >= ?",
+                (login, scope, min((day["date"] for day in days), default="")),
+            ).fetchall())
+            changed = [
+                (login, scope, day["date"], day["contributionCount"])
+                for day in days
+                if stored.get(day["date"]) != day["contributionCount"]
+            ]
+            self._conn.executemany("INSERT OR REPLACE INTO days VALUES (?, ?, ?, ?)", changed)
+            self._conn.commit()
+        return len(changed)
+
+    def set_user(self, login: str, created_at: str):
+        """
+        Records when `login` was last synced.
+        """
+        now = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO users VALUES (?, ?, ?)", (login.lower(), created_at, now)
+            )
+            self._conn.commit()
+
+    def restricted_count(self, login: str, token_id: str):
+        """
+        Returns the private contribution count seen by the token `token_id`, or None.
+        """
+        row = self._restricted_row(login, token_id)
+        return row[0] if row else None
+
+    def scope(self, login: str, token_id: str):
+        """
+        Returns the scope of the day series the token `token_id` sees for `login`: the
+        fingerprint itself for the user's own token, else `PUBLIC_SCOPE`. None if the token
+        has not been seen yet.
+        """
+        row = self._restricted_row(login, token_id)
+        if row is None:
+            return None
+        return token_id if row[1] else PUBLIC_SCOPE
+
+    def set_restricted_count(self, login: str, token_id: str, count: int, own: bool = False):
+        """
+        Stores the lifetime private contribution count seen by the token `token_id`, and
+        whether the token belongs to `login`.
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO restricted VALUES (?, ?, ?, ?)", (login.lower(), token_id, count, int(own))
+            )
+            self._conn.commit()
+
+    def _restricted_row(self, login: str, token_id: str):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT count, own FROM restricted WHERE login = ? AND token_id = ?", (login.lower(), token_id)
+            ).fetchone()
+
+    def load(self, login: str, token_id: str) -> dict:
+        """
+        Builds a contribution response for the stored series, shaped like the output of
+        `fetch_data_for_duration`, so the `process_*` functions accept it.
+
+        Args:
+            login (str): GitHub username.
+            token_id (str): Fingerprint of the token whose private count is reported.
+
+        Returns:
+            dict: Contribution response, or an error response if nothing is stored.
+        """
+        login = login.lower()
+        restricted = self.restricted_count(login, token_id)
+        scope = self.scope(login, token_id) or PUBLIC_SCOPE
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT date, count FROM days WHERE login = ? AND scope = ? ORDER BY date", (login, scope)
+            ).fetchall()
+            user = self._conn.execute(
+                "SELECT created_at FROM users WHERE login = ?", (login,)
+            ).fetchone()
+        if not rows or user is None:
+            return {"errors": f"No stored contributions for {login}"}
+
+        weeks = CalendarDays()
+        weeks.extend([date for date, _ in rows], array("i", [count for _, count in rows]))
+        return {
+            "data": {
+                "user": {
+                    "createdAt": user[0],
+                    "contributionsCollection": {
+                        "restrictedContributionsCount": restricted or 0,
+                        "contributionCalendar": {
+                            "totalContributions": weeks.total(),
+                            "weeks": weeks,
+                        },
+                    },
+                }
+            }
+        }
+
+
+def sync_contributions(store: ContributionStore, fetch_history, fetch_restricted, username: str,
+                       token: str, created_at: str):
+    """
+    Brings the stored series for `username` up to date and returns it.
+
+    The first sync fetches the full history. Later syncs fetch only the window from the last
+    finalized date to today and merge it into the stored series, along with the lifetime
+    private contribution count. A token seen for the first time first sends the small
+    restricted query, whose viewer tells which series it sees, and then syncs that series.
+
+    Args:
+        store (ContributionStore): Store holding the day series.
+        fetch_history (callable): `fetch_contribution_history` of the calling fetch module.
+        fetch_restricted (callable): `fetch_restricted_contributions` of the calling fetch module.
+        username (str): GitHub username.
+        token (str): GitHub personal access token.
+        created_at (str): Account creation date, as returned in `createdAt`.
+
+    Returns:
+        dict: Contribution response for the whole stored series, or error message.
+    """
+    token_id = token_fingerprint(token)
+    scope = store.scope(username, token_id)
+    if scope is None:
+        restricted_data = fetch_restricted(username, token, created_at)
+        if "errors" in restricted_data:
+            return restricted_data
+        # The user's own token sees private days too, so its series is kept apart
+        own = (viewer_login(restricted_data) or "").lower() == username.lower()
+        store.set_restricted_count(username, token_id, restricted_total(restricted_data), own)
+        scope = token_id if own else PUBLIC_SCOPE
+
+    last_date = store.last_date(username, scope)
+    since = None
+    if last_date is not None:
+        finalized = parse_date(last_date) - timedelta(days=FINALIZED_LAG_DAYS)
+        since = max(created_at[:10], finalized.strftime("%Y-%m-%d"))
+
+    data = fetch_history(username, token, created_at, since)
+    if "errors" in data:
+        return data
+
+    collection = data["data"]["user"]["contributionsCollection"]
+    days = CalendarDays.from_weeks(collection["contributionCalendar"]["weeks"])
+    store.upsert(username, days.day_list(), scope)
+    store.set_user(username, created_at)
+    store.set_restricted_count(
+        username, token_id, collection.get("restrictedContributionsCount", 0), scope != PUBLIC_SCOPE
+    )
+
+    synced = store.load(username, token_id)
+    synced["fetchedAt"] = data.get("fetchedAt")
+    return synced
+
+
+def default_store():
+    """
+    Returns the process-wide store at `STORE_PATH`, or None if it cannot be opened.
+    """
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            try:
+                _default_store = ContributionStore()
+            except (sqlite3.Error, OSError) as e:
+                print(f"❗Contribution store disabled: {e}")
+                return None
+        return _default_store
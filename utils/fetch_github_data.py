@@ -1,9 +1,79 @@
-import requests
 import streamlit as st
+from utils.http_client import API_URL, client
+from utils.batch_fetch import fetch_users_in_batches
+from utils.contribution_store import default_store, sync_contributions
+from utils.fetch_pipeline import fetch_concurrently, iter_pages
+from utils.queries import (
+    HISTORY_TTL,
+    VIEWER_TTL,
+    YEARS_PER_QUERY,
+    contribution_history_query,
+    dashboard_query,
+    history_windows,
+    merge_history_data,
+    repository_page_query,
+    restricted_contributions_query,
+    split_dashboard_data,
+    viewer_login,
+    viewer_query,
+)
+from utils.response_cache import DEFAULT_TTL, PUBLIC_SCOPE, cache_scope
+
+
+class _FetchError(Exception):
+    """Raised inside cached queries so st.cache_data never stores an error response."""
+
+
+@st.cache_data(ttl=300)
+def _cached_public_query(query: str, ttl: float, _token: str):
+    data = client.graphql(query, _token, ttl=ttl)
+    if "errors" in data:
+        raise _FetchError(data)
+    return data
 
-BASE_URL = "https://api.github.com/graphql"
 
 @st.cache_data(ttl=300)
+def _cached_token_query(query: str, ttl: float, token_id: str, own: bool, _token: str):
+    data = client.graphql(query, _token, ttl=ttl, own=own)
+    if "errors" in data:
+        raise _FetchError(data)
+    return data
+
+
+def _graphql(query: str, token: str, ttl: float = DEFAULT_TTL, own: bool = False) -> dict:
+    """
+    Sends a query through the in-memory Streamlit cache.
+
+    Public queries are cached once for every token; the rest (see `cache_scope`) are keyed
+    on a fingerprint of the token, never on the raw secret. `own` tells whether the token
+    belongs to the user the query reads.
+    """
+    try:
+        scope = cache_scope(query, token, own)
+        if scope != PUBLIC_SCOPE:
+            return _cached_token_query(query, ttl, scope, own, _token=token)
+        return _cached_public_query(query, ttl, _token=token)
+    except _FetchError as e:
+        return e.args[0]
+
+
+def is_own_token(username: str, token: str) -> bool:
+    """
+    Checks whether `token` belongs to `username`. The user's own token also sees private
+    days in the contribution calendar, so calendars fetched with it are not shared.
+
+    Args:
+        username (str): GitHub username.
+        token (str): GitHub personal access token.
+
+    Returns:
+        bool: True if the token is the user's, or if its owner could not be looked up.
+    """
+    login = viewer_login(_graphql(viewer_query(), token, VIEWER_TTL))
+    # Unknown owners count as the user, so their calendars are kept per token
+    return login is None or login.lower() == username.lower()
+
+
 def fetch_data_for_duration(username: str, token: str, from_date: str, to_date: str):
     """
     Fetch user data from GitHub GraphQL API.
@@ -15,7 +85,6 @@ def fetch_data_for_duration(username: str, token: str, from_date: str, to_date:
     Returns:
         dict: JSON response from GitHub API containing user data or error message.
     """
-    headers = {"Authorization": f"Bearer {token}"}
     query = f"""
     {{ 
       user(login: "{username}") {{
@@ -38,14 +107,8 @@ def fetch_data_for_duration(username: str, token: str, from_date: str, to_date:
       }}
     }}
     """
-    try:
-        response = requests.post(BASE_URL, json={"query": query}, headers=headers)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        return {"errors": str(e)}
+    return _graphql(query, token)
 
-@st.cache_data(ttl=300)    
 def fetch_user_data(username: str, token: str):
     """
     Fetch user data from GitHub GraphQL API.
@@ -57,7 +120,6 @@ def fetch_user_data(username: str, token: str):
     Returns:
         dict: JSON response from GitHub API containing user data or error message.
     """
-    headers = {"Authorization": f"Bearer {token}"}
     query = f"""
     {{
         user(login: "{username}") {{
@@ -72,7 +134,7 @@ def fetch_user_data(username: str, token: str):
             following {{
                 totalCount
             }}
-            repositories(ownerAffiliations: OWNER, isFork: false){{
+            repositories(privacy: PUBLIC, ownerAffiliations: OWNER, isFork: false){{
                 totalCount
             }}
             contributionsCollection {{
@@ -83,14 +145,8 @@ def fetch_user_data(username: str, token: str):
         }}
     }}
     """
-    try:
-        response = requests.post(BASE_URL, json={"query": query}, headers=headers)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        return {"errors": str(e)}
+    return _graphql(query, token)
 
-@st.cache_data(ttl=300)
 def fetch_repo_data(username: str, token: str):
     """
     Fetch repository data from GitHub GraphQL API.
@@ -102,11 +158,10 @@ def fetch_repo_data(username: str, token: str):
     Returns:
         dict: JSON response from GitHub API containing repository data or error message.
     """
-    headers = {"Authorization": f"Bearer {token}"}
     query = f"""
     {{
         user(login: "{username}") {{
-            repositories(first: 100, ownerAffiliations: OWNER, isFork: false) {{
+            repositories(first: 100, privacy: PUBLIC, ownerAffiliations: OWNER, isFork: false) {{
                 totalCount
                 edges {{
                     node {{
@@ -121,14 +176,8 @@ def fetch_repo_data(username: str, token: str):
         }}
     }}
     """
-    try:
-        response = requests.post(BASE_URL, json={"query": query}, headers=headers)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        return {"errors": str(e)}
+    return _graphql(query, token)
 
-@st.cache_data(ttl=300)
 def fetch_contribution_data(username: str, token: str):
     """
     Fetch contribution data from GitHub GraphQL API.
@@ -140,7 +189,6 @@ def fetch_contribution_data(username: str, token: str):
     Returns:
         dict: JSON response from GitHub API containing contribution data or error message.
     """
-    headers = {"Authorization": f"Bearer {token}"}
     query = f"""
     {{
         user(login: "{username}") {{
@@ -161,12 +209,146 @@ def fetch_contribution_data(username: str, token: str):
         }}
     }}
     """
-    try:
-        response = requests.post(BASE_URL, json={"query": query}, headers=headers)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        return {"errors": str(e)}
+    return _graphql(query, token)
+
+
+def fetch_dashboard_data(username: str, token: str):
+    """
+    Fetch profile, contribution calendar and repository data in a single round trip.
+
+    The profile, calendar and public repository query is sent alongside the small query
+    for private contribution counts, which is cached per token. The larger response is
+    shared by every token except the user's own, which also sees private calendar days.
+
+    Args:
+        username (str): GitHub username.
+        token (str): GitHub personal access token.
+
+    Returns:
+        tuple: `(cont_data, user_data, repo_data)` shaped like the responses of
+        `fetch_contribution_data`, `fetch_user_data` and `fetch_repo_data`.
+    """
+    own = is_own_token(username, token)
+    results = fetch_concurrently({
+        "public": (_graphql, dashboard_query(username), token, DEFAULT_TTL, own),
+        "restricted": (_graphql, restricted_contributions_query(username), token),
+    })
+    return split_dashboard_data(results["public"].response, results["restricted"].response)
+
+
+def fetch_contribution_history(username: str, token: str, created_at: str, since: str = None):
+    """
+    Fetch the full contribution history since the account was created.
+
+    One query carries an aliased yearly `contributionsCollection` per year, up to
+    `YEARS_PER_QUERY` years per request. The chunks and the per-token private counts are
+    sent concurrently.
+
+    Args:
+        username (str): GitHub username.
+        token (str): GitHub personal access token.
+        created_at (str): Account creation date, as returned in `createdAt`.
+        since (str, optional): First day of the calendar to fetch, in 'YYYY-MM-DD' format.
+            The private count still covers every day since `created_at`.
+
+    Returns:
+        dict: JSON response shaped like `fetch_data_for_duration`, covering every day since
+        `since` or `created_at`, or error message.
+    """
+    windows = history_windows(created_at)
+    calendar_windows = history_windows(since) if since else windows
+    chunks = [calendar_windows[i:i + YEARS_PER_QUERY] for i in range(0, len(calendar_windows), YEARS_PER_QUERY)]
+    own = is_own_token(username, token)
+    jobs = {
+        i: (_graphql, contribution_history_query(username, chunk), token, HISTORY_TTL, own)
+        for i, chunk in enumerate(chunks)
+    }
+    jobs["restricted"] = (_graphql, restricted_contributions_query(username, windows), token)
+    results = fetch_concurrently(jobs)
+    return merge_history_data([results[i].response for i in range(len(chunks))], results["restricted"].response)
+
+
+def fetch_restricted_contributions(username: str, token: str, created_at: str):
+    """
+    Fetch the lifetime private contribution count seen by `token`, and the login of the
+    token's owner.
+
+    Args:
+        username (str): GitHub username.
+        token (str): GitHub personal access token.
+        created_at (str): Account creation date, as returned in `createdAt`.
+
+    Returns:
+        dict: JSON response for `restricted_contributions_query`, or error message.
+    """
+    return _graphql(restricted_contributions_query(username, history_windows(created_at)), token)
+
+
+def sync_contribution_history(username: str, token: str, created_at: str):
+    """
+    Fetch the full contribution history incrementally.
+
+    The day series is kept in the local contribution store, so after the first call only
+    the days since the last finalized date are requested and merged in, along with the
+    lifetime private contribution count.
+
+    Args:
+        username (str): GitHub username.
+        token (str): GitHub personal access token.
+        created_at (str): Account creation date, as returned in `createdAt`.
+
+    Returns:
+        dict: JSON response shaped like `fetch_data_for_duration`, covering every day since
+        `created_at`, or error message.
+    """
+    store = default_store()
+    if store is None:
+        return fetch_contribution_history(username, token, created_at)
+    return sync_contributions(
+        store, fetch_contribution_history, fetch_restricted_contributions, username, token, created_at
+    )
+
+
+def fetch_users_batch(logins: list, token: str):
+    """
+    Fetch profile and contribution data for many users, batching several users into each
+    GraphQL query.
+
+    Args:
+        logins (list): GitHub usernames.
+        token (str): GitHub personal access token.
+
+    Returns:
+        dict: Mapping of username to a JSON response accepted by both `process_user_data`
+        and `process_contribution_data`, or to an error message.
+    """
+    return fetch_users_in_batches(logins, token, _graphql)
+
+
+def iter_repositories(username: str, token: str, first_page: dict = None):
+    """
+    Iterate over every owned, non-fork repository page by page, following
+    `pageInfo.endCursor` and prefetching one page ahead.
+
+    Args:
+        username (str): GitHub username.
+        token (str): GitHub personal access token.
+        first_page (dict, optional): `repositories` connection already fetched, e.g. from
+            `fetch_dashboard_data`, so iteration continues from its cursor.
+
+    Yields:
+        dict: `repositories` connections with `edges` and `pageInfo`, or an error response.
+    """
+    def fetch_page(after):
+        data = _graphql(repository_page_query(username, after), token)
+        if "errors" in data:
+            return data
+        try:
+            return data["data"]["user"]["repositories"]
+        except (KeyError, TypeError) as e:
+            return {"errors": f"Unexpected repository response: {e}"}
+
+    return iter_pages(fetch_page, first_page)
 
 
 @st.cache_data(ttl=300)
@@ -174,10 +356,9 @@ def fetch_star_count():
     """
     Returns the number of stars for the GitHub-Analytics repository.
     """
-    url = "https://api.github.com/repos/ishandutta2007/GitHub-Analytics"
-    try:
-        response = requests.get(url).json()
-        return response.get('stargazers_count', 0)
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching stars: {e}")
-        return 0
\ No newline at end of file
+    url = f"{API_URL}/repos/ishandutta2007/GitHub-Analytics"
+    response = client.get_json(url)
+    if "errors" in response:
+        print(f"Error fetching stars: {response['errors']}")
+        return 0
+    return response.get('stargazers_count', 0)
\ No newline at end of file
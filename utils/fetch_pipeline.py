@@ -0,0 +1,130 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable
+
+try:  # Worker threads need the script context to use st.cache_data without warnings
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+except ImportError:
+    add_script_run_ctx = get_script_run_ctx = None
+
+MAX_WORKERS = 8
+THREAD_PREFIX = "github-fetch"
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix=THREAD_PREFIX)
+# Separate pool so a paginated fetch started from a pool worker cannot starve itself
+_prefetch_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="github-prefetch")
+
+
+@dataclass
+class FetchResult:
+    """
+    Outcome of one request in a concurrent fetch stage.
+
+    Attributes:
+        data: Value returned by the fetcher, or None if it raised or timed out.
+        error (str): Error message, taken from an `{"errors": ...}` response or an exception.
+        elapsed (float): Seconds the request took.
+    """
+    data: Any = None
+    error: str = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def response(self) -> dict:
+        """The fetcher's response, or `{"errors": error}` if it raised or timed out."""
+        return self.data if self.data is not None else {"errors": self.error}
+
+
+def _script_ctx():
+    # Fetches also run outside `streamlit run`, e.g. from generate_static_data.py
+    return get_script_run_ctx(suppress_warning=True) if get_script_run_ctx else None
+
+
+def _attach_ctx(ctx):
+    if ctx is not None:
+        add_script_run_ctx(threading.current_thread(), ctx)
+
+
+def _fetch_page(fetch_page: Callable, cursor, ctx):
+    _attach_ctx(ctx)
+    return fetch_page(cursor)
+
+
+def _run(fn: Callable, args: tuple, ctx) -> FetchResult:
+    _attach_ctx(ctx)
+    start = time.perf_counter()
+    try:
+        data = fn(*args)
+    except Exception as e:
+        return FetchResult(error=str(e), elapsed=time.perf_counter() - start)
+    elapsed = time.perf_counter() - start
+    if isinstance(data, dict) and "errors" in data:
+        return FetchResult(data=data, error=str(data["errors"]), elapsed=elapsed)
+    return FetchResult(data=data, elapsed=elapsed)
+
+
+def fetch_concurrently(jobs: dict, timeout: float = None) -> dict:
+    """
+    Runs every fetch a page needs at the same time on a bounded thread pool.
+
+    Args:
+        jobs (dict): Mapping of request name to `(fetch_function, *args)`.
+        timeout (float, optional): Seconds to wait for the whole stage. Requests still
+            running after this are reported as timed out.
+
+    Returns:
+        dict: Mapping of request name to `FetchResult`, so the page can render whatever
+        succeeded and show an error only for the requests that failed.
+    """
+    ctx = _script_ctx()
+    # A fetcher running on the shared pool gets its own pool, so nested stages cannot
+    # deadlock waiting for workers that are all busy waiting on them
+    nested = threading.current_thread().name.startswith(THREAD_PREFIX)
+    executor = ThreadPoolExecutor(max_workers=MAX_WORKERS) if nested else _executor
+    futures = {
+        name: executor.submit(_run, job[0], tuple(job[1:]), ctx)
+        for name, job in jobs.items()
+    }
+    wait(futures.values(), timeout=timeout)
+    if nested:
+        executor.shutdown(wait=False)
+
+    results = {}
+    for name, future in futures.items():
+        if future.done():
+            results[name] = future.result()
+        else:
+            results[name] = FetchResult(error="Request timed out", elapsed=timeout or 0.0)
+    return results
+
+
+def iter_pages(fetch_page: Callable, first_page: dict = None):
+    """
+    Follows a cursor-paginated GraphQL connection, requesting the next page while the
+    caller is still processing the current one.
+
+    Args:
+        fetch_page (callable): Takes an `endCursor` (None for the first page) and returns the
+            connection dict with `pageInfo`, or an `{"errors": ...}` response.
+        first_page (dict, optional): Already fetched first page, e.g. from the dashboard query.
+
+    Yields:
+        dict: One connection page at a time. An error response is yielded last.
+    """
+    ctx = _script_ctx()
+    page = first_page if first_page is not None else fetch_page(None)
+    while True:
+        page_info = page.get("pageInfo") or {}
+        next_page = None
+        if "errors" not in page and page_info.get("hasNextPage"):
+            next_page = _prefetch_executor.submit(_fetch_page, fetch_page, page_info.get("endCursor"), ctx)
+        yield page
+        if next_page is None:
+            return
+        page = next_page.result()
@@ -0,0 +1,337 @@
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import requests
+from requests.adapters import HTTPAdapter
+from utils.calendar_stream import CHUNK_SIZE, decode_response
+from utils.rate_limit import RateLimitScheduler, Throttled, pool_from_env
+from utils.response_cache import (
+    DEFAULT_TTL,
+    MAX_STALENESS,
+    PUBLIC_SCOPE,
+    ResponseCache,
+    cache_scope,
+    token_fingerprint,
+)
+from utils.retry import (
+    HEDGE_MIN_DELAY,
+    HEDGE_PERCENTILE,
+    MAX_ATTEMPTS,
+    REQUEST_DEADLINE,
+    RETRYABLE_STATUS,
+    LatencyTracker,
+    RetryBudget,
+    backoff_delay,
+    is_idempotent,
+    parse_retry_after,
+)
+from utils.singleflight import SingleFlight
+
+try:  # HTTP/2 is only used when httpx and h2 are installed
+    import httpx
+    import h2  # noqa: F401
+except ImportError:
+    httpx = None
+
+# Point these at a stand-in server (see `stub_server`) to run without GitHub
+API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+BASE_URL = os.environ.get("GITHUB_GRAPHQL_URL", f"{API_URL}/graphql")
+
+CONNECT_TIMEOUT = 5    # seconds to establish the TCP/TLS connection
+READ_TIMEOUT = 20      # seconds to wait for the response body
+POOL_SIZE = 20         # keep-alive connections kept per host
+
+# Runs requests that may be hedged, so a second copy can be sent while the first is waiting
+_hedge_executor = ThreadPoolExecutor(max_workers=POOL_SIZE * 2, thread_name_prefix="github-hedge")
+
+
+class _AttemptError(Exception):
+    def __init__(self, message: str, retryable: bool, retry_after: float = None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class GitHubClient:
+    """
+    Process-wide HTTP client for the GitHub API.
+
+    All fetchers share one connection pool, so TCP and TLS handshakes are paid once per
+    host instead of once per request. Responses are gzip-compressed on the wire, every
+    call has explicit connect/read timeouts, and HTTP/2 is used when `httpx[http2]` is
+    installed. Successful GraphQL responses are stored in the shared `ResponseCache`, and
+    concurrent identical queries sent with the same token are coalesced into one request.
+
+    Expired cache entries younger than `max_stale` seconds are served immediately while a
+    background thread refreshes them. Set `max_stale` to 0 to always block on a refresh.
+
+    Requests go through a `RateLimitScheduler`, which throttles them against each token's
+    remaining budget and spreads requests made with a shared token across `scheduler.pool`.
+    Queries cached per token are always sent with the token they were asked with.
+
+    Queries that fail with a network error, a 5xx or a 429 are retried with jittered
+    exponential backoff, waiting for `Retry-After` when GitHub sends it. A query still
+    unanswered at the p95 latency of recent requests gets a second, hedged copy, and the
+    first answer wins. Both stop at the `deadline` of the request, and `extra_load` caps
+    how many retries and hedges are sent relative to original requests.
+    """
+
+    def __init__(self, base_url: str = BASE_URL, cache: ResponseCache = None):
+        self.base_url = base_url
+        self.cache = cache
+        self.flights = SingleFlight()
+        self.scheduler = RateLimitScheduler(pool_from_env())
+        self.max_stale = MAX_STALENESS
+        self.deadline = REQUEST_DEADLINE
+        self.hedging = True
+        self.latency = LatencyTracker()
+        self.extra_load = RetryBudget()
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._counter_lock = threading.Lock()
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        self.timeout = (CONNECT_TIMEOUT, READ_TIMEOUT)
+        self.http2 = httpx is not None
+
+        if self.http2:
+            self._session = httpx.Client(
+                http2=True,
+                timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+                limits=httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE),
+                headers={"Accept-Encoding": "gzip"},
+            )
+        else:
+            self._session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            self._session.mount("https://", adapter)
+            self._session.mount("http://", adapter)
+            self._session.headers.update({"Accept-Encoding": "gzip", "Connection": "keep-alive"})
+
+    def _request(self, method: str, url: str, timeout: tuple = None, stream: bool = False, **kwargs):
+        connect, read = timeout or self.timeout
+        if self.http2:
+            request = self._session.build_request(method, url, timeout=httpx.Timeout(read, connect=connect), **kwargs)
+            return self._session.send(request, stream=stream)
+        return self._session.request(method, url, timeout=(connect, read), stream=stream, **kwargs)
+
+    def _read_json(self, response, stream: bool) -> dict:
+        """
+        Decodes a response body. Streamed bodies are decoded chunk by chunk, with contribution
+        calendars stored as compact `CalendarDays` instead of a dict per day.
+        """
+        if not stream:
+            return response.json()
+        chunks = response.iter_bytes(CHUNK_SIZE) if self.http2 else response.iter_content(CHUNK_SIZE)
+        return decode_response(chunks)
+
+    def graphql(self, query: str, token: str, variables: dict = None, ttl: float = DEFAULT_TTL,
+                own: bool = False) -> dict:
+        """
+        Send a GraphQL query to the GitHub API, answering from the response cache when possible.
+
+        Every response carries `fetchedAt`, the epoch time it was fetched from GitHub, so
+        pages can show the age of stale data.
+
+        Args:
+            query (str): GraphQL query document.
+            token (str): GitHub personal access token.
+            variables (dict, optional): GraphQL variables for the query.
+            ttl (float, optional): Seconds the response may be served from cache. 0 bypasses the cache.
+            own (bool, optional): Whether the token belongs to the user the query reads, whose
+                own token also sees private calendar days.
+
+        Returns:
+            dict: JSON response from GitHub API or `{"errors": message}` on failure.
+        """
+        key = ResponseCache.key(query, variables, token, own)
+        shared = cache_scope(query, token, own) == PUBLIC_SCOPE
+        if self.cache is None or not ttl:
+            return self.flights.do(_flight_key(key, token), self._post, query, token, variables, shared)
+
+        entry = self.cache.lookup(key, max_stale=self.max_stale)
+        if entry is not None:
+            data, is_fresh = entry
+            if not is_fresh:
+                self._refresh_in_background(key, query, token, variables, shared, ttl)
+            return data
+        return self.flights.do(_flight_key(key, token), self._post_and_store, key, query, token, variables, shared, ttl)
+
+    def _post_and_store(self, key: str, query: str, token: str, variables: dict, shared: bool, ttl: float) -> dict:
+        data = self._post(query, token, variables, shared)
+        if "errors" not in data:
+            self.cache.set(key, data, ttl)
+        return data
+
+    def _refresh_in_background(self, key: str, query: str, token: str, variables: dict, shared: bool, ttl: float):
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self.flights.do(_flight_key(key, token), self._post_and_store, key, query, token, variables, shared, ttl)
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name="github-refresh", daemon=True).start()
+
+    def _post(self, query: str, token: str, variables: dict = None, shared: bool = False) -> dict:
+        payload = {"query": query}
+        if variables:
+            payload["variables"] = variables
+        idempotent = is_idempotent(query)
+        deadline = time.monotonic() + self.deadline
+        self.extra_load.deposit()
+
+        attempt = 0
+        while True:
+            try:
+                data = self._send(token, payload, deadline, idempotent and self.hedging, shared)
+                break
+            except _AttemptError as e:
+                attempt += 1
+                delay = backoff_delay(attempt, e.retry_after)
+                if (
+                    not (idempotent and e.retryable)
+                    or attempt >= MAX_ATTEMPTS
+                    or time.monotonic() + delay >= deadline
+                    or not self.extra_load.withdraw()
+                ):
+                    return {"errors": str(e)}
+                self._count("retries")
+                time.sleep(delay)
+        data["fetchedAt"] = time.time()
+        return data
+
+    def _send(self, token: str, payload: dict, deadline: float, hedge: bool, shared: bool) -> dict:
+        """
+        Sends one try of a request. If `hedge` is set and the request is slower than the
+        p95 latency, a second copy is sent (with another pool token if one is free and
+        `shared` is set) and the first successful answer is returned.
+        """
+        cost = self.scheduler.cost(payload["query"])
+        send_token = self._acquire(token, deadline - time.monotonic(), shared, cost)
+        hedge_after = self.latency.percentile(HEDGE_PERCENTILE) if hedge else None
+        if hedge_after is None:
+            return self._attempt(send_token, payload, deadline)
+
+        # The hedge delay counts from when the request goes out, not from when it was queued
+        started = threading.Event()
+        primary = _hedge_executor.submit(self._attempt, send_token, payload, deadline, started)
+        started.wait(max(0.0, deadline - time.monotonic()))
+        done, _ = wait([primary], timeout=max(HEDGE_MIN_DELAY, hedge_after))
+        if done or time.monotonic() >= deadline or not self.extra_load.withdraw():
+            return primary.result()
+        try:
+            # A hedge is only worth sending if a token is free right away
+            hedge_token = self._acquire(token, 0, shared, cost)
+        except _AttemptError:
+            return primary.result()
+
+        self._count("hedges")
+        second = _hedge_executor.submit(self._attempt, hedge_token, payload, deadline)
+        pending, error = {primary, second}, None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    data = future.result()
+                except _AttemptError as e:
+                    error = e
+                    continue
+                if future is second:
+                    self._count("hedge_wins")
+                return data
+        raise error
+
+    def _acquire(self, token: str, max_wait: float, shared: bool, cost: float) -> str:
+        try:
+            send_token = self.scheduler.acquire(token, cost, max_wait=max(0.0, max_wait), shared=shared)
+        except Throttled as e:
+            raise _AttemptError(
+                f"Too many GitHub requests are queued for this token. Try again in {e.wait:.0f} seconds.",
+                retryable=False,
+            )
+        if send_token is None:
+            reset_at = time.strftime("%H:%M:%S", time.localtime(self.scheduler.reset_time(token, shared)))
+            raise _AttemptError(f"GitHub API rate limit exhausted. It resets at {reset_at}.", retryable=False)
+        return send_token
+
+    def _count(self, counter: str):
+        with self._counter_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _attempt(self, send_token: str, payload: dict, deadline: float, started: threading.Event = None) -> dict:
+        if started is not None:
+            started.set()
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise _AttemptError("GitHub API request deadline exceeded", retryable=False)
+        timeout = (min(CONNECT_TIMEOUT, remaining), min(READ_TIMEOUT, remaining))
+        headers = {"Authorization": f"Bearer {send_token}"}
+        # Calendar responses can hold years of days, so they are decoded as they arrive
+        stream = "contributionDays" in payload["query"]
+        started = time.monotonic()
+        try:
+            response = self._request("POST", self.base_url, timeout=timeout, stream=stream, json=payload, headers=headers)
+        except Exception as e:  # requests and httpx raise different exception types
+            raise _AttemptError(str(e), retryable=True)
+
+        self.scheduler.update(send_token, response.headers)
+        try:
+            response.raise_for_status()
+            data = self._read_json(response, stream)
+        except Exception as e:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            # A 403 with Retry-After is GitHub's secondary rate limit
+            retryable = response.status_code in RETRYABLE_STATUS or retry_after is not None
+            raise _AttemptError(str(e), retryable, retry_after)
+        finally:
+            response.close()
+        self.latency.record(time.monotonic() - started)
+        self.scheduler.update(send_token, data=data, query=payload["query"])
+        return data
+
+    def get_json(self, url: str) -> dict:
+        """
+        Send a GET request and decode the JSON body.
+
+        Args:
+            url (str): Absolute URL to fetch.
+
+        Returns:
+            dict: Decoded JSON response or `{"errors": message}` on failure.
+        """
+        try:
+            response = self._request("GET", url)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            return {"errors": str(e)}
+
+
+def _flight_key(key: str, token: str) -> str:
+    """
+    Coalescing key for a request. Public responses share one cache entry across tokens, but
+    a flight is only shared by callers with the same token, so one token's errors (401, 403,
+    exhausted quota) never reach callers using another.
+    """
+    return f"{key}:{token_fingerprint(token)}"
+
+
+def _open_cache():
+    try:
+        return ResponseCache()
+    except (sqlite3.Error, OSError) as e:
+        print(f"❗Response cache disabled: {e}")
+        return None
+
+
+# Shared client used by every fetcher in this process
+client = GitHubClient(cache=_open_cache())
@@ -1,5 +1,9 @@
 from datetime import datetime
-from utils.util import get_streaks, get_highest_contribution, get_active_days, get_todays_commits, format_duration, is_less_than_2_months_old, format_iso_date, format_date_ddmmyyyy
+from utils.calendar_stream import CalendarDays
+from utils.contribution_series import ContributionSeries
+from utils.contribution_stats import ContributionIndex, summarize_contributions
+from utils.dates import parse_datetime
+from utils.util import format_duration, is_less_than_2_months_old, format_iso_date, format_date_ddmmyyyy
 
 def process_contribution_data(data: dict):
     """
@@ -10,29 +14,25 @@ def process_contribution_data(data: dict):
 
     Returns:
         dict: Processed contribution data including total contributions, highest contribution, streaks, and active days.
+        `days` is a `ContributionSeries` of the daily counts.
     """
     try:
         contributions_collection = data['data']['user']['contributionsCollection']
         calendar = contributions_collection['contributionCalendar']
-        days = [day for week in calendar['weeks'] for day in week['contributionDays']]
-        weeks = calendar.get("weeks", [])
+        days = ContributionSeries.from_calendar(calendar['weeks'])
         
         # Safely get contribution counts with fallbacks to 0
         public_contributions = calendar.get('totalContributions', 0)
         private_contributions = contributions_collection.get('restrictedContributionsCount', 0)
         total_contributions = public_contributions + private_contributions
             
-        # Calculate highest contribution
-        highest_contribution, highest_contribution_date = get_highest_contribution(days)
-        
-        # Calculate streaks with validation
-        current_streak, longest_streak = get_streaks(days)
-
-        # Calculate Active Days
-        active_days = get_active_days(weeks)
-
-        # Find today's commits
-        today_commits = get_todays_commits(weeks)
+        # Highest day, streaks, active days and today's commits in one pass
+        stats = summarize_contributions(days)
+        highest_contribution = stats["highest"]
+        highest_contribution_date = format_date_ddmmyyyy(stats["highest_date"]) if stats["highest_date"] else None
+        current_streak, longest_streak = stats["current_streak"], stats["longest_streak"]
+        active_days = stats["active_days"]
+        today_commits = stats["today"]
 
         return {
             "total_contributions": total_contributions,
@@ -55,7 +55,7 @@ def process_contribution_data(data: dict):
             "highest_contribution": 0,
             "current_streak": 0,
             "longest_streak": 0,
-            "days": []
+            "days": ContributionSeries()
         }
 
 def process_language_data(data: dict):
@@ -91,6 +91,51 @@ def process_language_data(data: dict):
         print(f"Error processing language data: {str(e)}")
         return None
 
+def aggregate_repositories(pages):
+    """
+    Aggregates language usage, stars and forks over a stream of repository pages.
+
+    Only running totals are kept, so memory stays flat however many repositories the
+    account has.
+
+    Args:
+        pages (iterable): `repositories` connections, as yielded by `iter_repositories`.
+
+    Returns:
+        dict: `languages` (same shape as `process_language_data`), `repositories`,
+        `total_stars`, `total_forks`, and `complete`, which is False if a page failed.
+    """
+    language_data = {}
+    repositories = total_stars = total_forks = 0
+    complete = True
+
+    for page in pages:
+        if "errors" in page:
+            print(f"Error fetching repository page: {page['errors']}")
+            complete = False
+            break
+        for edge in page.get("edges", []):
+            repo = edge["node"]
+            repositories += 1
+            total_stars += repo.get("stargazerCount", 0)
+            total_forks += repo.get("forkCount", 0)
+            if repo.get("primaryLanguage"):
+                language = repo["primaryLanguage"]["name"]
+                color = repo["primaryLanguage"].get("color", '#808080')  # Default to grey if no color
+
+                if language not in language_data:
+                    language_data[language] = {'count': 0, 'color': color}
+
+                language_data[language]['count'] += 1
+
+    return {
+        "languages": language_data,
+        "repositories": repositories,
+        "total_stars": total_stars,
+        "total_forks": total_forks,
+        "complete": complete,
+    }
+
 def process_user_data(data: dict):
     """
     Process the user data from GitHub API response.
@@ -109,7 +154,7 @@ def process_user_data(data: dict):
         formatted_date = format_iso_date(created_at) 
 
         less_than_2_months_old = is_less_than_2_months_old(created_at)
-        github_days = (datetime.now() - datetime.strptime(created_at, "%Y-%m-%dT%H:%M:%SZ")).days
+        github_days = (datetime.now() - parse_datetime(created_at)).days
 
         joined_since = format_duration(created_at)
 
@@ -143,16 +188,14 @@ def analyze_contributions(data):
         return None
 
     try:
-        contributions = data["data"]["user"]["contributionsCollection"]["contributionCalendar"]["weeks"]
+        stats = summarize_contributions(ContributionSeries.from_response(data))
         
-        total_contributions = sum(
-            day["contributionCount"] for week in contributions for day in week["contributionDays"]
-        )
-        total_days = sum(1 for week in contributions for day in week["contributionDays"])
+        total_contributions = stats["total"]
+        total_days = stats["days"]
 
         contribution_rate = total_contributions / total_days  # Contributions per day
 
-        active_days = get_active_days(contributions)
+        active_days = stats["active_days"]
 
         return {
             "total_contributions": total_contributions,
@@ -162,4 +205,69 @@ def analyze_contributions(data):
         }
     except Exception as e:
         print(f"Error processing contribution data: {str(e)}")
-        return {"errors": str(e)}
\ No newline at end of file
+        return {"errors": str(e)}
+
+def trim_contribution_data(data: dict, from_date: str):
+    """
+    Drops calendar days before `from_date` from a contribution response.
+
+    Lets a page fetch whole-year windows up front, before the user's join date is known,
+    and cut them to the join date afterwards.
+
+    Args:
+        data (dict): JSON response from `fetch_data_for_duration`.
+        from_date (str): First day to keep, in 'YYYY-MM-DD' format.
+
+    Returns:
+        dict: Response with the same shape, containing only days on or after `from_date`.
+    """
+    try:
+        user = data["data"]["user"]
+        collection = user["contributionsCollection"]
+        calendar = collection["contributionCalendar"]
+    except (KeyError, TypeError):
+        return data
+
+    weeks = CalendarDays.from_weeks(calendar["weeks"]).since(from_date)
+
+    return {
+        **data,
+        "data": {
+            **data["data"],
+            "user": {
+                **user,
+                "contributionsCollection": {
+                    **collection,
+                    "contributionCalendar": {
+                        **calendar,
+                        "totalContributions": weeks.total(),
+                        "weeks": weeks,
+                    },
+                },
+            },
+        },
+    }
+
+def range_stats(index: ContributionIndex, from_date: str, to_date: str, fetch_window=None):
+    """
+    Stats of `analyze_contributions` for the days from `from_date` to `to_date`, read from
+    the prefix sums of the contribution history.
+
+    Args:
+        index (ContributionIndex): Index over the contribution history.
+        from_date (str): First day of the range, in 'YYYY-MM-DD' format.
+        to_date (str): Last day of the range, in 'YYYY-MM-DD' format.
+        fetch_window (callable, optional): `fetch_window(from_date, to_date)` returning a
+            contribution response, used only when the history does not cover the range.
+
+    Returns:
+        dict: `total_contributions`, `total_days`, `active_days` and `contribution_rate`,
+        or `{"errors": message}`.
+    """
+    if index.covers(from_date, to_date) or fetch_window is None:
+        return index.range_stats(from_date, to_date)
+
+    data = fetch_window(from_date, to_date)
+    if "errors" in data:
+        return data
+    return analyze_contributions(trim_contribution_data(data, from_date))
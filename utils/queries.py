@@ -0,0 +1,482 @@
+from datetime import datetime
+
+from utils.calendar_stream import CalendarDays
+
+
+# Repository fields needed by `aggregate_repositories`, indented for a `node` selection
+REPOSITORY_FIELDS = """                        name
+                        stargazerCount
+                        forkCount
+                        primaryLanguage {
+                            name
+                            color
+                        }"""
+
+REPOSITORY_PAGE_SIZE = 100
+
+
+def dashboard_query(username: str) -> str:
+    """
+    Builds one query returning everything the Overview page needs: profile, contribution
+    calendar and totals, and the first page of owned repositories with their languages.
+
+    Args:
+        username (str): GitHub username.
+
+    Returns:
+        str: GraphQL query document.
+    """
+    return f"""
+    {{
+        user(login: "{username}") {{
+            name
+            bio
+            location
+            createdAt
+            avatarUrl
+            followers {{
+                totalCount
+            }}
+            following {{
+                totalCount
+            }}
+            repositoryPage: repositories(first: {REPOSITORY_PAGE_SIZE}, privacy: PUBLIC, ownerAffiliations: OWNER, isFork: false) {{
+                totalCount
+                pageInfo {{
+                    hasNextPage
+                    endCursor
+                }}
+                edges {{
+                    node {{
+{REPOSITORY_FIELDS}
+                    }}
+                }}
+            }}
+            contributions: contributionsCollection {{
+                totalCommitContributions
+                totalPullRequestContributions
+                totalIssueContributions
+                contributionCalendar {{
+                    totalContributions
+                    weeks {{
+                        contributionDays {{
+                            contributionCount
+                            date
+                        }}
+                    }}
+                }}
+            }}
+        }}
+        rateLimit {{
+            cost
+            remaining
+            resetAt
+        }}
+    }}
+    """
+
+
+def restricted_contributions_query(username: str, windows: list = None) -> str:
+    """
+    Builds the token-sensitive half of a contribution query: the private contribution
+    count, which depends on whose token is asking, and the login of the token's owner.
+
+    Kept apart from the calendar queries so a token whose day series is already stored
+    only needs this small query.
+
+    Args:
+        username (str): GitHub username.
+        windows (list, optional): `(from_date, to_date)` tuples from `history_windows`.
+            Defaults to the last year, aliased as `contributions`.
+
+    Returns:
+        str: GraphQL query document.
+    """
+    if windows is None:
+        collections = """
+            contributions: contributionsCollection {
+                restrictedContributionsCount
+            }"""
+    else:
+        collections = "".join(
+            f"""
+            {_window_alias(from_date)}: contributionsCollection(from: "{from_date}T00:00:00Z", to: "{to_date}T23:59:59Z") {{
+                restrictedContributionsCount
+            }}"""
+            for from_date, to_date in windows
+        )
+    return f"""
+    {{
+        user(login: "{username}") {{{collections}
+        }}
+        viewer {{
+            login
+        }}
+    }}
+    """
+
+
+def viewer_query() -> str:
+    """
+    Builds the query for the login of the token's owner.
+
+    Returns:
+        str: GraphQL query document.
+    """
+    return """
+    {
+        viewer {
+            login
+        }
+    }
+    """
+
+
+def _restricted_counts(restricted_data: dict) -> dict:
+    """
+    Maps each alias of a `restricted_contributions_query` response to its count.
+    """
+    user = restricted_data["data"]["user"]
+    return {alias: value.get("restrictedContributionsCount", 0) for alias, value in user.items()}
+
+
+def restricted_total(restricted_data: dict) -> int:
+    """
+    Sums the private contribution counts of every window in a `restricted_contributions_query`
+    response.
+    """
+    return sum(_restricted_counts(restricted_data).values())
+
+
+def viewer_login(restricted_data: dict):
+    """
+    Returns the login of the token's owner from a `restricted_contributions_query` or
+    `viewer_query` response, or None.
+    """
+    viewer = (restricted_data.get("data") or {}).get("viewer") or {}
+    return viewer.get("login")
+
+
+def split_dashboard_data(data: dict, restricted_data: dict):
+    """
+    Splits a `dashboard_query` response into the contribution, user and repository
+    payloads returned by `fetch_contribution_data`, `fetch_user_data` and `fetch_repo_data`.
+
+    Args:
+        data (dict): JSON response for `dashboard_query`.
+        restricted_data (dict): JSON response for `restricted_contributions_query`.
+
+    Returns:
+        tuple: `(cont_data, user_data, repo_data)`. On errors the response is returned
+        unchanged in all three positions so callers can keep checking `"errors" in ...`.
+    """
+    for response in (data, restricted_data):
+        if "errors" in response:
+            return response, response, response
+    try:
+        user = data["data"]["user"]
+        contributions = user["contributions"]
+        repository_page = user["repositoryPage"]
+        restricted = _restricted_counts(restricted_data)["contributions"]
+    except (KeyError, TypeError) as e:
+        error = {"errors": f"Unexpected dashboard response: {e}"}
+        return error, error, error
+
+    # The oldest half decides how old the combined data is
+    fetched_at = min(response.get("fetchedAt", 0) for response in (data, restricted_data)) or None
+    cont_data = {
+        "data": {
+            "user": {
+                "contributionsCollection": {"restrictedContributionsCount": restricted, **contributions}
+            }
+        },
+        "fetchedAt": fetched_at,
+    }
+    user_data = {
+        "data": {
+            "user": {
+                "name": user.get("name"),
+                "bio": user.get("bio"),
+                "location": user.get("location"),
+                "createdAt": user.get("createdAt"),
+                "avatarUrl": user.get("avatarUrl"),
+                "followers": user.get("followers"),
+                "following": user.get("following"),
+                "repositories": {"totalCount": repository_page.get("totalCount", 0)},
+                "contributionsCollection": {
+                    "totalCommitContributions": contributions.get("totalCommitContributions", 0),
+                    "totalPullRequestContributions": contributions.get("totalPullRequestContributions", 0),
+                    "totalIssueContributions": contributions.get("totalIssueContributions", 0),
+                },
+            }
+        },
+        "fetchedAt": fetched_at,
+    }
+    repo_data = {"data": {"user": {"repositories": repository_page}}, "fetchedAt": fetched_at}
+    return cont_data, user_data, repo_data
+
+
+# Yearly windows per request for full-history queries. Each window is a full calendar,
+# so this keeps a query well under GitHub's node and complexity limits.
+YEARS_PER_QUERY = 7
+
+# Past years never change, so history responses can be cached longer than the dashboard
+HISTORY_TTL = 900
+
+# A token never changes owner, so its login is looked up once an hour at most
+VIEWER_TTL = 3600
+
+CONTRIBUTION_TOTAL_FIELDS = (
+    "totalCommitContributions",
+    "totalPullRequestContributions",
+    "totalIssueContributions",
+)
+
+
+def history_windows(created_at: str, today: str = None) -> list:
+    """
+    Splits the time since `created_at` into calendar-year windows, the longest span a
+    single `contributionsCollection` accepts.
+
+    Args:
+        created_at (str): Account creation date, 'YYYY-MM-DD' or ISO datetime.
+        today (str, optional): Last day to include, in 'YYYY-MM-DD' format. Defaults to today.
+
+    Returns:
+        list: `(from_date, to_date)` tuples in 'YYYY-MM-DD' format, oldest first.
+    """
+    start = created_at[:10]
+    end = today or datetime.now().strftime("%Y-%m-%d")
+    windows = []
+    for year in range(int(start[:4]), int(end[:4]) + 1):
+        from_date = max(start, f"{year}-01-01")
+        to_date = min(end, f"{year}-12-31")
+        windows.append((from_date, to_date))
+    return windows
+
+
+def repository_page_query(username: str, after: str = None) -> str:
+    """
+    Builds the query for one page of owned, non-fork repositories.
+
+    Args:
+        username (str): GitHub username.
+        after (str, optional): `pageInfo.endCursor` of the previous page.
+
+    Returns:
+        str: GraphQL query document.
+    """
+    cursor = f'"{after}"' if after else "null"
+    return f"""
+    {{
+        user(login: "{username}") {{
+            repositories(first: {REPOSITORY_PAGE_SIZE}, after: {cursor}, privacy: PUBLIC, ownerAffiliations: OWNER, isFork: false) {{
+                totalCount
+                pageInfo {{
+                    hasNextPage
+                    endCursor
+                }}
+                edges {{
+                    node {{
+{REPOSITORY_FIELDS}
+                    }}
+                }}
+            }}
+        }}
+    }}
+    """
+
+
+def _window_alias(from_date: str) -> str:
+    return "y" + from_date.replace("-", "_")
+
+
+def contribution_history_query(username: str, windows: list) -> str:
+    """
+    Builds one query with an aliased `contributionsCollection` per window. Private
+    contribution counts come from `restricted_contributions_query` instead.
+
+    Args:
+        username (str): GitHub username.
+        windows (list): `(from_date, to_date)` tuples from `history_windows`.
+
+    Returns:
+        str: GraphQL query document with one `y<from_date>` alias per window.
+    """
+    totals = "\n                ".join(CONTRIBUTION_TOTAL_FIELDS)
+    collections = "".join(
+        f"""
+            {_window_alias(from_date)}: contributionsCollection(from: "{from_date}T00:00:00Z", to: "{to_date}T23:59:59Z") {{
+                {totals}
+                contributionCalendar {{
+                    totalContributions
+                    weeks {{
+                        contributionDays {{
+                            contributionCount
+                            date
+                        }}
+                    }}
+                }}
+            }}"""
+        for from_date, to_date in windows
+    )
+    return f"""
+    {{
+        user(login: "{username}") {{
+            createdAt{collections}
+        }}
+        rateLimit {{
+            cost
+            remaining
+            resetAt
+        }}
+    }}
+    """
+
+
+def merge_history_data(responses: list, restricted_data: dict) -> dict:
+    """
+    Merges the responses of `contribution_history_query` chunks into one continuous
+    contribution response, shaped like the output of `fetch_data_for_duration`.
+
+    Args:
+        responses (list): JSON responses, oldest chunk first.
+        restricted_data (dict): JSON response for `restricted_contributions_query` over
+            the same windows.
+
+    Returns:
+        dict: Contribution response covering every window, or the first error response.
+    """
+    for response in [*responses, restricted_data]:
+        if "errors" in response:
+            return response
+
+    totals = dict.fromkeys(CONTRIBUTION_TOTAL_FIELDS, 0)
+    total_contributions = 0
+    weeks = CalendarDays()
+    created_at = None
+    try:
+        for response in responses:
+            user = response["data"]["user"]
+            created_at = user.get("createdAt", created_at)
+            collections = sorted((alias, value) for alias, value in user.items() if alias.startswith("y"))
+            for _, collection in collections:
+                for field in CONTRIBUTION_TOTAL_FIELDS:
+                    totals[field] += collection.get(field, 0)
+                calendar = collection["contributionCalendar"]
+                total_contributions += calendar.get("totalContributions", 0)
+                # Windows meet at year boundaries, so days already merged are dropped
+                weeks = weeks.merge(CalendarDays.from_weeks(calendar["weeks"]))
+        restricted = restricted_total(restricted_data)
+    except (KeyError, TypeError) as e:
+        return {"errors": f"Unexpected contribution history response: {e}"}
+
+    fetched_at = min(response.get("fetchedAt", 0) for response in [*responses, restricted_data]) or None
+    return {
+        "fetchedAt": fetched_at,
+        "data": {
+            "user": {
+                "createdAt": created_at,
+                "contributionsCollection": {
+                    "restrictedContributionsCount": restricted,
+                    **totals,
+                    "contributionCalendar": {
+                        "totalContributions": total_contributions,
+                        "weeks": weeks,
+                    },
+                },
+            }
+        }
+    }
+
+
+def batch_user_query(logins: list) -> str:
+    """
+    Builds one query fetching the profile and contribution calendar of several users, each
+    under a `u<index>` alias.
+
+    Args:
+        logins (list): GitHub usernames.
+
+    Returns:
+        str: GraphQL query document.
+    """
+    users = "".join(
+        f"""
+        u{index}: user(login: "{login}") {{
+            login
+            name
+            bio
+            location
+            createdAt
+            avatarUrl
+            followers {{
+                totalCount
+            }}
+            following {{
+                totalCount
+            }}
+            repositories(privacy: PUBLIC, ownerAffiliations: OWNER, isFork: false) {{
+                totalCount
+            }}
+            contributionsCollection {{
+                restrictedContributionsCount
+                totalCommitContributions
+                totalPullRequestContributions
+                totalIssueContributions
+                contributionCalendar {{
+                    totalContributions
+                    weeks {{
+                        contributionDays {{
+                            contributionCount
+                            date
+                        }}
+                    }}
+                }}
+            }}
+        }}"""
+        for index, login in enumerate(logins)
+    )
+    return f"""
+    {{{users}
+        rateLimit {{
+            cost
+            remaining
+            resetAt
+        }}
+    }}
+    """
+
+
+def split_batch_data(data: dict, logins: list) -> dict:
+    """
+    Demultiplexes a `batch_user_query` response into one payload per user. Each payload is
+    accepted by both `process_user_data` and `process_contribution_data`.
+
+    Args:
+        data (dict): JSON response for `batch_user_query`.
+        logins (list): Usernames in the order they were passed to `batch_user_query`.
+
+    Returns:
+        dict: Mapping of username to `{"data": {"user": ...}}`, or to `{"errors": message}`
+        for users GitHub could not resolve.
+    """
+    users = data.get("data") or {}
+    # GraphQL reports per-alias failures (e.g. an unknown login) with the alias as the path
+    alias_errors = {}
+    errors = data.get("errors")
+    if isinstance(errors, list):
+        for error in errors:
+            path = error.get("path") or [None]
+            alias_errors[path[0]] = error.get("message", "Unknown error")
+
+    payloads = {}
+    for index, login in enumerate(logins):
+        alias = f"u{index}"
+        user = users.get(alias)
+        if user is None:
+            message = alias_errors.get(alias) or (errors if isinstance(errors, str) else f"User {login} not found")
+            payloads[login] = {"errors": message}
+        else:
+            payloads[login] = {"data": {"user": user}, "fetchedAt": data.get("fetchedAt")}
+    return payloads
@@ -0,0 +1,231 @@
+import hashlib
+import os
+import re
+import threading
+import time
+
+from utils.response_cache import normalize_query, token_fingerprint
+from utils.retry import parse_retry_after
+
+DEFAULT_LIMIT = 5000    # GraphQL points per hour for a personal access token
+BURST = 50              # points a token may spend at once before throttling kicks in
+
+# Parts of a query that change between users without changing its cost
+_QUERY_VALUES = re.compile(r'"[^"]*"|\d+')
+
+
+class Throttled(Exception):
+    """
+    Raised when a request would wait in line for its token longer than the caller allows,
+    although the token still has budget left.
+    """
+
+    def __init__(self, wait: float):
+        super().__init__(f"Request throttled locally for {wait:.1f}s")
+        self.wait = wait
+
+
+class TokenBudget:
+    """
+    Remaining GitHub API budget of one token, with a token bucket that spreads the budget
+    evenly over the time left until it resets.
+    """
+
+    def __init__(self, token: str):
+        self.token = token
+        self.limit = DEFAULT_LIMIT
+        self.remaining = DEFAULT_LIMIT
+        self.reset_at = time.time() + 3600
+        self.bucket = float(BURST)
+        self.last_refill = time.time()
+        self.last_cost = None
+
+    def refill(self, now: float):
+        if now >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = now + 3600
+        rate = self.remaining / max(1.0, self.reset_at - now)
+        self.bucket = min(float(BURST), self.bucket + (now - self.last_refill) * rate, float(self.remaining))
+        self.last_refill = now
+
+    def wait_time(self, cost: float) -> float:
+        """Seconds until the bucket holds `cost` points, or infinity if the budget is spent."""
+        if self.bucket >= cost:
+            return 0.0
+        if self.remaining < cost:
+            return float("inf")
+        rate = self.remaining / max(1.0, self.reset_at - self.last_refill)
+        return (cost - self.bucket) / rate
+
+
+class RateLimitScheduler:
+    """
+    Tracks the remaining budget of every token seen and schedules requests against it.
+
+    Requests made with a token from the shared pool (the app's default token and its
+    fallbacks) may be sent with whichever pool token has the most budget left. A visitor's
+    own token is never swapped, and neither is the token of a query whose answer depends on
+    who asks. Requests are throttled by each token's bucket before the budget runs out,
+    instead of failing once GitHub starts rejecting them: each one reserves its points and
+    waits in line for them. A query is charged the cost GitHub last reported for queries of
+    the same shape, so multi-year history chunks are throttled against what they spend.
+    """
+
+    def __init__(self, pool: list = ()):
+        self._lock = threading.Lock()
+        self._budgets = {}
+        self._costs = {}
+        self.pool = []
+        self.throttled = 0
+        self.deferred = 0
+        self.rejected = 0
+        self.set_pool(pool)
+
+    def set_pool(self, tokens: list):
+        """
+        Sets the shared tokens that anonymous requests may be spread across.
+        """
+        with self._lock:
+            self.pool = [token for token in dict.fromkeys(tokens) if token]
+            for token in self.pool:
+                self._budget(token)
+
+    def _budget(self, token: str) -> TokenBudget:
+        if token not in self._budgets:
+            self._budgets[token] = TokenBudget(token)
+        return self._budgets[token]
+
+    def acquire(self, token: str, cost: float = 1, max_wait: float = None, shared: bool = True):
+        """
+        Picks the token to send a request with and reserves `cost` points from it, sleeping
+        until they are available if every candidate is being throttled. Reserved points are
+        taken from the bucket right away, so later callers queue behind earlier ones.
+
+        Args:
+            token (str): Token the caller asked to use.
+            cost (float, optional): Estimated GraphQL points the request costs.
+            max_wait (float, optional): Longest the caller may wait in line. Unbounded if None.
+            shared (bool, optional): Whether the request may be sent with another pool token.
+                False for queries whose answer depends on who asks.
+
+        Returns:
+            str: Token to send the request with, or None if no candidate has budget left.
+
+        Raises:
+            Throttled: If the wait in line would be longer than `max_wait`.
+        """
+        with self._lock:
+            now = time.time()
+            candidates = self.pool if shared and token in self.pool else [token]
+            budgets = [self._budget(candidate) for candidate in candidates]
+            for budget in budgets:
+                budget.refill(now)
+            best = min(budgets, key=lambda budget: (budget.wait_time(cost), -budget.remaining))
+            wait = best.wait_time(cost)
+            if wait == float("inf"):
+                self.rejected += 1
+                return None
+            if max_wait is not None and wait > max_wait:
+                self.deferred += 1
+                raise Throttled(wait)
+            if wait > 0:
+                self.throttled += 1
+            best.bucket -= cost
+            best.remaining -= cost
+
+        if wait > 0:
+            time.sleep(wait)
+        return best.token
+
+    def cost(self, query: str) -> float:
+        """
+        Returns the points GitHub last charged for a query of the same shape, or 1 if none
+        has been answered yet.
+        """
+        with self._lock:
+            return self._costs.get(query_shape(query), 1)
+
+    def update(self, token: str, headers=None, data: dict = None, query: str = None):
+        """
+        Records the budget GitHub reports in the `X-RateLimit-*` response headers or in a
+        `rateLimit { cost remaining resetAt }` selection of the response. The cost is also
+        remembered for `query`, if given. Header values that cannot be parsed are ignored.
+        """
+        headers = headers or {}
+        with self._lock:
+            budget = self._budget(token)
+            if "X-RateLimit-Remaining" in headers:
+                try:
+                    limit = int(headers.get("X-RateLimit-Limit", budget.limit))
+                    remaining = int(headers["X-RateLimit-Remaining"])
+                    reset_at = float(headers.get("X-RateLimit-Reset", budget.reset_at))
+                except (TypeError, ValueError):
+                    pass
+                else:
+                    budget.limit, budget.remaining, budget.reset_at = limit, remaining, reset_at
+            retry_after = parse_retry_after(headers.get("Retry-After"))
+            if retry_after is not None:
+                # Secondary rate limit: stop using the token until GitHub allows it again
+                budget.remaining = 0
+                budget.reset_at = time.time() + retry_after
+
+            rate_limit = ((data or {}).get("data") or {}).get("rateLimit")
+            if rate_limit:
+                budget.last_cost = rate_limit.get("cost")
+                budget.remaining = rate_limit.get("remaining", budget.remaining)
+                if query is not None and budget.last_cost:
+                    self._costs[query_shape(query)] = budget.last_cost
+            budget.bucket = min(budget.bucket, float(budget.remaining))
+
+    def reset_time(self, token: str, shared: bool = True) -> float:
+        """
+        Returns the epoch time at which the earliest candidate token for `token` resets.
+        """
+        with self._lock:
+            candidates = self.pool if shared and token in self.pool else [token]
+            return min(self._budget(candidate).reset_at for candidate in candidates)
+
+    def metrics(self) -> dict:
+        """
+        Reports the budget of every token, identified by fingerprint, plus scheduler counters.
+
+        Returns:
+            dict: `tokens` mapping fingerprints to `limit`, `remaining`, `reset_in`,
+            `bucket` and `last_cost`, and request counts: `throttled` (waited in line),
+            `deferred` (would have waited past their deadline) and `rejected` (no budget left).
+        """
+        now = time.time()
+        with self._lock:
+            tokens = {
+                token_fingerprint(token): {
+                    "pool": token in self.pool,
+                    "limit": budget.limit,
+                    "remaining": budget.remaining,
+                    "reset_in": max(0.0, budget.reset_at - now),
+                    "bucket": round(budget.bucket, 2),
+                    "last_cost": budget.last_cost,
+                }
+                for token, budget in self._budgets.items()
+            }
+            return {
+                "tokens": tokens,
+                "throttled": self.throttled,
+                "deferred": self.deferred,
+                "rejected": self.rejected,
+            }
+
+
+def query_shape(query: str) -> str:
+    """
+    Returns a key shared by queries that differ only in strings and numbers (logins, dates,
+    cursors, window aliases), which GitHub charges about the same number of points.
+    """
+    shape = normalize_query(_QUERY_VALUES.sub("0", query))
+    return hashlib.sha256(shape.encode("utf-8")).hexdigest()[:16]
+
+
+def pool_from_env() -> list:
+    """
+    Reads shared tokens from the comma-separated `GITHUB_TOKEN_POOL` environment variable.
+    """
+    return [token.strip() for token in os.environ.get("GITHUB_TOKEN_POOL", "").split(",") if token.strip()]
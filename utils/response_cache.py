@@ -0,0 +1,238 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+
+from utils.calendar_stream import decode_response, dumps
+
+CACHE_PATH = os.environ.get("GITHUB_ANALYTICS_CACHE", ".cache/github_responses.sqlite3")
+DEFAULT_TTL = 300                     # seconds, matches the st.cache_data TTL of the fetchers
+MAX_STALENESS = 3600                  # seconds past the TTL an entry may still be served while refreshing
+MAX_CACHE_BYTES = 64 * 1024 * 1024    # compressed payload bytes kept before evicting
+
+# Fields whose value depends on who is asking. Queries selecting any of them are cached per
+# token; every other query only reads public data and is shared by all tokens.
+TOKEN_SENSITIVE_FIELDS = ("restrictedContributionsCount", "viewer")
+
+# Fields every token sees the same way, except the viewed user's own token, which also sees
+# private days in the contribution calendar. Queries selecting them are shared by all other
+# tokens and cached per token only when sent with the user's own.
+OWNER_SENSITIVE_FIELDS = ("contributionCalendar",)
+
+# Scope of responses shared by every token
+PUBLIC_SCOPE = "public"
+
+# A `repositories` selection only reads public data when it is restricted to public ones
+_REPOSITORY_ARGUMENTS = re.compile(r"\brepositories\s*(\(([^)]*)\))?")
+
+
+def token_fingerprint(token: str) -> str:
+    """
+    Returns a short, non-reversible identifier for a token, safe to store in cache keys.
+    """
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+
+
+def is_token_sensitive(query: str) -> bool:
+    """
+    Checks whether a query selects any field in `TOKEN_SENSITIVE_FIELDS`, or repositories
+    without `privacy: PUBLIC`, which include private ones when the token can see them.
+    """
+    if any(field in query for field in TOKEN_SENSITIVE_FIELDS):
+        return True
+    return any("privacy: PUBLIC" not in (match.group(2) or "") for match in _REPOSITORY_ARGUMENTS.finditer(query))
+
+
+def is_owner_sensitive(query: str) -> bool:
+    """
+    Checks whether a query selects any field in `OWNER_SENSITIVE_FIELDS`.
+    """
+    return any(field in query for field in OWNER_SENSITIVE_FIELDS)
+
+
+def cache_scope(query: str, token: str = None, own: bool = False) -> str:
+    """
+    Returns the scope a response is cached under.
+
+    Args:
+        query (str): GraphQL query document.
+        token (str, optional): Token the request is sent with.
+        own (bool, optional): Whether the token belongs to the user the query reads.
+
+    Returns:
+        str: The token's fingerprint for token-sensitive queries, and for owner-sensitive
+        ones sent with the user's own token, else `PUBLIC_SCOPE`.
+    """
+    if token and (is_token_sensitive(query) or (own and is_owner_sensitive(query))):
+        return token_fingerprint(token)
+    return PUBLIC_SCOPE
+
+
+def response_age(data: dict):
+    """
+    Returns how many seconds ago a response was fetched from GitHub, or None if unknown.
+
+    Args:
+        data (dict): Response returned by `GitHubClient.graphql`, which carries `fetchedAt`.
+    """
+    fetched_at = data.get("fetchedAt") if isinstance(data, dict) else None
+    if fetched_at is None:
+        return None
+    return max(0.0, time.time() - fetched_at)
+
+
+def normalize_query(query: str) -> str:
+    """
+    Collapses whitespace so the same query built with different indentation shares a key.
+    """
+    return " ".join(query.split())
+
+
+class ResponseCache:
+    """
+    GraphQL response cache stored in a local SQLite file.
+
+    The file is shared by every process pointing at the same path, so Streamlit replicas,
+    restarts and `generate_static_data.py` runs reuse each other's responses, and public
+    queries are shared across tokens. Payloads are stored zlib-compressed, and calendars are
+    decoded back into compact `CalendarDays` on lookup. Entries expire
+    after a per-query TTL but are kept for another `max_stale` seconds so they can be served
+    while a refresh runs. The least recently used entries are evicted once the total size
+    exceeds `max_bytes`.
+    """
+
+    def __init__(self, path: str = CACHE_PATH, max_bytes: int = MAX_CACHE_BYTES, max_stale: float = MAX_STALENESS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_stale = max_stale
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                payload BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def key(query: str, variables: dict = None, token: str = None, own: bool = False) -> str:
+        """
+        Builds the cache key for a request.
+
+        Args:
+            query (str): GraphQL query document.
+            variables (dict, optional): GraphQL variables.
+            token (str, optional): Token the request is sent with. Only its fingerprint is
+                used, and only for queries not shared across tokens (see `cache_scope`).
+            own (bool, optional): Whether the token belongs to the user the query reads.
+
+        Returns:
+            str: Hex digest identifying the request.
+        """
+        scope = cache_scope(query, token, own)
+        raw = json.dumps([normalize_query(query), variables or {}, scope], sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        """
+        Returns the cached payload for `key`, or None if it is missing or expired.
+        """
+        entry = self.lookup(key, max_stale=0)
+        return entry[0] if entry else None
+
+    def lookup(self, key: str, max_stale: float = None):
+        """
+        Looks up `key`, accepting entries up to `max_stale` seconds past their TTL.
+
+        Args:
+            key (str): Cache key from `ResponseCache.key`.
+            max_stale (float, optional): Staleness accepted. Defaults to the cache's `max_stale`.
+
+        Returns:
+            tuple: `(payload, is_fresh)`, or None if the entry is missing or too stale.
+        """
+        max_stale = self.max_stale if max_stale is None else max_stale
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] + max_stale <= now:
+                self.misses += 1
+                return None
+            is_fresh = row[1] > now
+            if is_fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return decode_response([zlib.decompress(row[0])]), is_fresh
+
+    def set(self, key: str, payload: dict, ttl: float = DEFAULT_TTL):
+        """
+        Stores `payload` under `key` for `ttl` seconds and evicts old entries if needed.
+        """
+        blob = zlib.compress(dumps(payload).encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now, now + ttl, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float):
+        self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now - self.max_stale,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        """
+        Reports hit/miss counters for this process and the current size of the shared file.
+
+        Returns:
+            dict: `hits`, `stale_hits`, `misses`, `hit_rate`, `evictions`, `entries` and `bytes`.
+        """
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        served = self.hits + self.stale_hits
+        lookups = served + self.misses
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": served / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": size,
+        }
@@ -0,0 +1,115 @@
+import random
+import re
+import threading
+from collections import deque
+
+MAX_ATTEMPTS = 3          # tries per request, including the first
+BASE_BACKOFF = 0.25       # seconds before the first retry, doubled for each further one
+MAX_BACKOFF = 4.0         # longest wait between two tries
+REQUEST_DEADLINE = 30.0   # seconds a request may take, across all tries and hedges
+EXTRA_LOAD_RATIO = 0.1    # retries and hedges allowed per original request
+EXTRA_LOAD_RESERVE = 10   # extra requests allowed before any ratio has been earned
+HEDGE_PERCENTILE = 0.95   # hedge requests still unanswered at this latency percentile
+HEDGE_MIN_DELAY = 0.05    # never hedge sooner than this, in seconds
+LATENCY_WINDOW = 200      # recent latencies kept to estimate the percentile
+MIN_LATENCY_SAMPLES = 20  # samples needed before hedging starts
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+_MUTATION = re.compile(r"^\s*(#[^\n]*\n\s*)*mutation\b")
+
+
+def is_idempotent(query: str) -> bool:
+    """
+    Returns True for GraphQL queries, which may be retried or sent twice, and False for mutations.
+    """
+    return _MUTATION.match(query) is None
+
+
+def backoff_delay(attempt: int, retry_after: float = None) -> float:
+    """
+    Seconds to wait before retry number `attempt` (1 for the first retry).
+
+    Uses exponential backoff with full jitter, so clients that failed together do not
+    retry together. A `Retry-After` value from GitHub takes precedence.
+    """
+    if retry_after is not None:
+        return retry_after
+    return random.uniform(0, min(MAX_BACKOFF, BASE_BACKOFF * 2 ** (attempt - 1)))
+
+
+def parse_retry_after(value: str):
+    """
+    Returns the `Retry-After` header in seconds, or None if it is missing or not a number.
+    """
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class LatencyTracker:
+    """
+    Rolling window of recent request latencies.
+    """
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._lock = threading.Lock()
+        self._samples = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, fraction: float):
+        """
+        Returns the latency below which `fraction` of recent requests finished, or None
+        while fewer than `MIN_LATENCY_SAMPLES` requests have been seen.
+        """
+        with self._lock:
+            if len(self._samples) < MIN_LATENCY_SAMPLES:
+                return None
+            samples = sorted(self._samples)
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+class RetryBudget:
+    """
+    Caps the extra load retries and hedges put on GitHub.
+
+    Every original request earns `ratio` of an extra request, up to `reserve`, and every
+    retry or hedge spends one. During an outage, retries therefore add at most `ratio`
+    more traffic instead of multiplying it by `MAX_ATTEMPTS`.
+    """
+
+    def __init__(self, ratio: float = EXTRA_LOAD_RATIO, reserve: float = EXTRA_LOAD_RESERVE):
+        self._lock = threading.Lock()
+        self.ratio = ratio
+        self.reserve = reserve
+        self._balance = float(reserve)
+        self.spent = 0
+        self.denied = 0
+
+    def deposit(self):
+        with self._lock:
+            self._balance = min(float(self.reserve), self._balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        """
+        Spends one extra request, returning False if the budget is exhausted.
+        """
+        with self._lock:
+            if self._balance < 1:
+                self.denied += 1
+                return False
+            self._balance -= 1
+            self.spent += 1
+            return True
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: Extra requests `spent` and `denied`, and the `balance` left.
+        """
+        with self._lock:
+            return {"spent": self.spent, "denied": self.denied, "balance": round(self._balance, 2)}
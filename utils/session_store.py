@@ -0,0 +1,89 @@
+from streamlit import session_state as sst
+
+from utils.contribution_series import ContributionSeries
+from utils.contribution_stats import ContributionIndex
+from utils.fetch_github_data import sync_contribution_history
+from utils.process_github_data import process_contribution_data
+from utils.response_cache import token_fingerprint
+
+SESSION_STORE_KEY = "github_data"
+
+
+def session_store() -> dict:
+    """
+    Returns the store of fetched payloads and processed stats for the current username and
+    token, shared by every page of the session.
+
+    The store is replaced with an empty one when the username or token changes, and only
+    then, so reruns and page switches reuse what is already held.
+
+    Returns:
+        dict: Mutable store, keyed by entry name.
+    """
+    owner = (sst.username, token_fingerprint(sst.token))
+    store = sst.get(SESSION_STORE_KEY)
+    if store is None or store["owner"] != owner:
+        store = {"owner": owner}
+        sst[SESSION_STORE_KEY] = store
+    return store
+
+
+def cached(name: str, compute, *args):
+    """
+    Returns the entry `name` of the session store, computing it with `compute(*args)` the
+    first time.
+
+    Results that hold an error, or a tuple or list with an error response in it, are
+    returned but not stored, so the next rerun tries again.
+
+    Args:
+        name (str): Entry name.
+        compute (callable): Function computing the entry.
+        *args: Arguments for `compute`.
+
+    Returns:
+        The stored or newly computed entry.
+    """
+    store = session_store()
+    if name in store:
+        return store[name]
+
+    value = compute(*args)
+    items = value if isinstance(value, (tuple, list)) else (value,)
+    if not any(isinstance(item, dict) and "errors" in item for item in items):
+        store[name] = value
+    return value
+
+
+def contribution_history(created_at: str, fallback: dict = None) -> dict:
+    """
+    Returns the full contribution history, processed once per session.
+
+    Args:
+        created_at (str): Account creation date, as returned in `createdAt`.
+        fallback (dict, optional): Contribution response to use if the history cannot be
+            fetched, e.g. the last 12 months from the dashboard query.
+
+    Returns:
+        dict: `data`, the history response or `fallback`; `complete`, False when the history
+        could not be fetched; `stats` from `process_contribution_data`; and `index`, a
+        `ContributionIndex` over its days. Incomplete results are not stored.
+    """
+    store = session_store()
+    if "history" in store:
+        return store["history"]
+
+    data = sync_contribution_history(sst.username, sst.token, created_at)
+    complete = "errors" not in data
+    if not complete and fallback is not None:
+        data = fallback
+    stats = process_contribution_data(data)
+    history = {
+        "data": data,
+        "complete": complete,
+        "stats": stats,
+        "index": ContributionIndex(stats.get("days", ContributionSeries())),
+    }
+    if complete:
+        store["history"] = history
+    return history
@@ -0,0 +1,71 @@
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical requests into one call.
+
+    Streamlit serves every session from a thread of the same process, so when many
+    sessions ask for the same login at once only the first caller hits GitHub. The others
+    wait for it and receive the same result.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn, *args):
+        """
+        Calls `fn(*args)`, unless a call for `key` is already in flight, in which case its
+        result (or exception) is shared.
+
+        Args:
+            key (str): Identity of the request, e.g. a response cache key.
+            fn (callable): Function performing the request.
+
+        Returns:
+            The value returned by the in-flight or new call.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: `executed` calls, `coalesced` callers and `in_flight` keys.
+        """
+        with self._lock:
+            in_flight = len(self._calls)
+        return {"executed": self.executed, "coalesced": self.coalesced, "in_flight": in_flight}
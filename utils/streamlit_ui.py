@@ -1,9 +1,14 @@
 import streamlit as st
+from functools import lru_cache
 from streamlit import session_state as sst
 from utils.fetch_github_data import fetch_star_count
+from utils.http_client import client
 
 TOKEN = st.secrets["token"]
 
+# Anonymous visitors share the default token; spread their requests over any fallbacks too
+client.scheduler.set_pool([TOKEN, *st.secrets.get("fallback_tokens", [])])
+
 def base_ui():
     """
     ### Sets up the base user interface for the Streamlit application.
@@ -181,9 +186,15 @@ def nav_ui():
             )
 
 def promo():
+    st.html(load_sidebar_html())
+
+@lru_cache(maxsize=None)
+def load_sidebar_html() -> str:
+    """
+    ### Reads the sidebar promo markup once per process.
+    """
     with open("static/sidebar.html", "r", encoding="UTF-8") as sidebar_file:
-        sidebar_html = sidebar_file.read()
-    st.html(sidebar_html)
+        return sidebar_file.read()
 
 def growth_stats(total_contributions:int, contribution_rate:int, active_days:int, total_days:int, percent_active_days:float, since:str):
     col1, col2 = st.columns(2)
@@ -1,37 +1,29 @@
 from datetime import datetime, timedelta
+from functools import lru_cache
 from dateutil.relativedelta import relativedelta
+from utils.contribution_series import ContributionSeries
+from utils.contribution_stats import find_milestones, find_streaks
+from utils.dates import parse_date, parse_datetime
 
-def get_streaks(days:list):
-    current_streak = 0
-    longest_streak = 0
-    last_contribution_date = None
+def get_streaks(days):
     try:
-        for day in days:
-            date = datetime.strptime(day["date"], "%Y-%m-%d")
-            count = day.get('contributionCount', 0)
-            if count > 0:
-                if last_contribution_date and (date - last_contribution_date).days > 1:
-                    current_streak =0
-                current_streak += 1
-                longest_streak = max(longest_streak, current_streak)
-                last_contribution_date = date
-        
-        today = datetime.today().date()
-        if last_contribution_date and (today - last_contribution_date.date()).days > 1:
-            current_streak = 0
-
+        streaks = find_streaks(days)
+        current_streak, longest_streak = streaks["current"], streaks["longest"]
     except Exception as e:
         print(e)
         current_streak = 0
         longest_streak = 0
     return current_streak, longest_streak
 
-def get_highest_contribution(days:list):
+def get_highest_contribution(days):
     
     try:
-        highest_day = max(days, key=lambda day: day['contributionCount'])
-        highest_contribution = highest_day['contributionCount']
-        highest_contribution_date = format_date_ddmmyyyy(highest_day['date'])
+        series = ContributionSeries.coerce(days)
+        if not series:
+            raise ValueError("No contribution days")
+        offset = max(range(len(series)), key=series.counts.__getitem__)
+        highest_contribution = int(series.counts[offset])
+        highest_contribution_date = format_date_ddmmyyyy(series.date_at(offset).isoformat())
         
     except (ValueError, KeyError):
         highest_contribution = 0
@@ -39,29 +31,19 @@ def get_highest_contribution(days:list):
     
     return highest_contribution, highest_contribution_date
 
-def get_active_days(weeks:list):
-    # Extract contribution days
+def get_active_days(weeks):
+    # Days with at least one contribution
     try:
-        contribution_days = [day["date"] for week in weeks for day in week["contributionDays"] if day["contributionCount"] > 0]
-        active_days = len(set(contribution_days))  # Unique active contribution days
+        active_days = ContributionSeries.coerce(weeks).active_days()
     except Exception as e:
         print(e)
         active_days = 0
 
     return active_days
 
-def get_todays_commits(weeks:list):
+def get_todays_commits(weeks):
     try:
-        # Today's Date in format of how it's fetched from GraohQL
-        today = datetime.now().strftime("%Y-%m-%d") 
-
-        # Find today's contributions
-        today_commits = sum(
-            day["contributionCount"]
-            for week in weeks
-            for day in week["contributionDays"]
-            if day["date"] == today
-        )
+        today_commits = ContributionSeries.coerce(weeks).count_on(datetime.now().date())
     except Exception as e:
         print(e)
         today_commits = 0
@@ -79,7 +61,7 @@ def format_duration(iso_date:str) -> str:
     Returns:
         str: The formatted duration string (e.g., "2 years 3 months 5 days").
     """
-    created_at = datetime.strptime(iso_date, "%Y-%m-%dT%H:%M:%SZ")
+    created_at = parse_datetime(iso_date)
     now = datetime.now()
     delta = now - created_at
 
@@ -97,6 +79,24 @@ def format_duration(iso_date:str) -> str:
 
     return " ".join(parts) if parts else "0 days"
 
+def format_data_age(seconds: float) -> str:
+    """
+    Formats the age of fetched data for display.
+
+    Args:
+        seconds (float): Seconds since the data was fetched, or None if unknown.
+
+    Returns:
+        str: Human readable age (e.g., "just now", "5 minutes ago", "2 hours ago").
+    """
+    if seconds is None or seconds < 60:
+        return "just now"
+    minutes = int(seconds // 60)
+    if minutes < 60:
+        return f"{minutes} minute{'s' if minutes > 1 else ''} ago"
+    hours = minutes // 60
+    return f"{hours} hour{'s' if hours > 1 else ''} ago"
+
 def format_date_ddmmyyyy(date:str) -> str:
     """
     Formats a date string from 'YYYY-MM-DD' to 'DDth MMM, YYYY'.
@@ -107,7 +107,7 @@ def format_date_ddmmyyyy(date:str) -> str:
     Returns:
         str: The formatted date string (e.g., "7th Feb, 2025").
     """
-    date_obj = datetime.strptime(date, '%Y-%m-%d')
+    date_obj = parse_date(date)
     formated_date = date_obj.strftime("{day} %b, %Y").replace("{day}", str(date_obj.day) + ("st" if date_obj.day in [1, 21, 31] else "nd" if date_obj.day in [2, 22] else "rd" if date_obj.day in [3, 23] else "th"))
     return formated_date
 
@@ -121,7 +121,7 @@ def format_iso_date(iso_date:str) -> str:
     Returns:
         str: The formatted date string (e.g., "7th Feb, 202
     """
-    dt = datetime.strptime(iso_date, "%Y-%m-%dT%H:%M:%SZ")
+    dt = parse_datetime(iso_date)
     return dt.strftime("{day} %b, %Y").replace("{day}", str(dt.day) + ("st" if dt.day in [1, 21, 31] else "nd" if dt.day  in [2, 22] else "rd" if dt.day in [3, 23] else "th"))
 
 def is_less_than_2_months_old(iso_date:str) -> bool:
@@ -134,13 +134,14 @@ def is_less_than_2_months_old(iso_date:str) -> bool:
     Returns:
         bool: True if the date is less than 2 months old, False otherwise.
     """
-    created_date = datetime.strptime(iso_date, "%Y-%m-%dT%H:%M:%SZ")
+    created_date = parse_datetime(iso_date)
     two_months_ago = datetime.now() - relativedelta(months=2)
     return created_date > two_months_ago
 
+@lru_cache(maxsize=None)
 def load_css() -> str:
     """
-    Loads CSS stylesheet from local files.
+    Loads CSS stylesheet from local files. The file is read once per process.
 
     Returns:
         str: The content of the CSS file.
@@ -175,29 +176,18 @@ def get_milestone_dates(milestones, contributions, total_contributions, contribu
 
     Args:
     - milestones (list): List of milestone commit targets.
-    - contributions (list): Contribution data from GraphQL (weeks > contributionDays).
+    - contributions (ContributionSeries | list): Contribution series, or GraphQL weeks > contributionDays.
     - total_contributions (int): Current total contributions.
     - contribution_rate (float): Daily contribution rate.
 
     Returns:
     - dict: Milestone predictions with exact dates (if achieved) and estimated dates (if not achieved).
     """
-    milestone_dates = {}
-    cumulative_contributions = 0
-
-    # --- Traverse through contributions to find exact dates ---
-    for week in contributions:
-        for day in week["contributionDays"]:
-            contribution_count = day["contributionCount"]
-            date = day["date"]
-
-            if contribution_count > 0:
-                cumulative_contributions += contribution_count
-
-                # If a milestone is reached, store its exact date
-                for milestone in milestones:
-                    if milestone not in milestone_dates and cumulative_contributions >= milestone:
-                        milestone_dates[milestone] = date
+    # --- Binary search the cumulative contributions for exact dates ---
+    milestone_dates = {
+        milestone: day.isoformat()
+        for milestone, day in find_milestones(contributions, milestones).items()
+    }
 
     # --- Predict future milestone dates ---
     today = datetime.now()